@@ -0,0 +1,332 @@
+'''benchmarks of the memory and time costs of the grg_pssedata data
+structures and of the parse and write round trip of pss/e data files'''
+
+from __future__ import print_function
+
+import argparse
+import collections
+import io
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from grg_pssedata.io import parse_line
+from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import parse_psse_case_str
+from grg_pssedata.io import write_psse
+from grg_pssedata.io import psse_terminuses
+from grg_pssedata.io import psse_record_terminus
+from grg_pssedata.struct import Bus
+from grg_pssedata.struct import Load
+from grg_pssedata.struct import Generator
+from grg_pssedata.struct import Branch
+from grg_pssedata.tables import BUS_NUMBER_COLUMNS
+from grg_pssedata.tables import table_lines
+
+# the data sections of a pss/e file in the order the parser reads them,
+# with the tables that each one is decoded into
+PARSE_SECTIONS = collections.OrderedDict([
+    ('bus', ['bus']), ('load', ['load']), ('fixed shunt', ['fixshunt']),
+    ('generator', ['generator']), ('branch', ['acline']),
+    ('transformer', ['transformer3w', 'transformer2w']), ('area', ['area']),
+    ('two terminal dc line', ['twotermdc']), ('vsc dc line', ['vscdc']),
+    ('transformer correction', []), ('multi-terminal dc line', []),
+    ('multi-section line', []), ('zone', ['zone']), ('inter-area transfer', []),
+    ('owner', ['owner']), ('facts device', ['facts']),
+    ('switched shunt', ['swshunt']), ('generic network element', []),
+    ('induction machine', []),
+])
+
+# the stages of the round trip of each section, decode is the part of the
+# section's parse time that is not spent tokenizing its lines or building
+# its data frame, that is building the components
+ROUNDTRIP_STAGES = ['tokenize', 'decode', 'frame', 'parse', 'write']
+
+ROUNDTRIP_COLUMNS = ['case', 'section', 'stage', 'lines', 'bytes', 'seconds', 'lines_per_second', 'mb_per_second']
+
+# the tables of a case that are copied by scale_case, the others hold
+# areas, zones and owners, which the copies share
+SCALED_TABLES = ['bus', 'load', 'generator', 'acline', 'transformer3w', 'transformer2w',
+    'twotermdc', 'vscdc', 'facts', 'fixshunt', 'swshunt']
+
+# one record of each component, as it appears in a pss/e data file
+SAMPLE_LINES = [
+    (Bus, False, "    1,'Bus 1     HV', 138.0000,3,   1,   1,   1,1.05999994,   0.000000, 1.06000, 0.94000, 1.10000, 0.90000"),
+    (Load, True, "   13,'1 ',1,   1,   1,    13.500,     5.800,     0.000,     0.000,     0.000,     0.000,   1,1"),
+    (Generator, True, "    1,'1 ',   232.400,   -16.900,    10.000,     0.000,1.06000,    0,   100.000,   0.00000,   1.00000,   0.00000,   0.00000,1.00000,1,  100.0,   332.400,     0.000,   1,1.0000,   0,1.0000,   0,1.0000,   0,1.0000,0, 1.0000"),
+    (Branch, True, "     1,     2,'1 ',1.93800E-2,5.91700E-2,5.28000E-2,   0.00,   0.00,   0.00,  0.00000,  0.00000,  0.00000,  0.00000,1,1,   0.0,   1,1.0000,   0,1.0000,   0,1.0000,   0,1.0000"),
+]
+
+
+def dict_based(component_class):
+    '''builds a copy of a slotted component class that keeps its fields in a
+    per-instance __dict__, as a baseline for comparisons
+
+    Args:
+        component_class: a class of grg_pssedata.struct
+    Returns:
+        a class with the same methods and no __slots__
+    '''
+
+    slots = set(component_class.__slots__)
+    namespace = {name: value for name, value in component_class.__dict__.items()
+        if name not in slots and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(component_class.__name__+'Dict', (object,), namespace)
+
+
+def measure(component_class, arguments, count):
+    '''builds many instances of a component and measures their cost
+
+    Args:
+        component_class: the class to instantiate
+        arguments (list): the constructor arguments of each instance
+        count (int): the number of instances
+    Returns (tuple):
+        the bytes held by the instances and the seconds it took to build them
+    '''
+
+    start_time = time.perf_counter()
+    components = [component_class(*arguments) for _ in range(count)]
+    seconds = time.perf_counter() - start_time
+    del components
+
+    # tracing slows allocations down, so the memory is measured on a second
+    # run, a trace that was already running is left running
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    components = [component_class(*arguments) for _ in range(count)]
+    memory = tracemalloc.get_traced_memory()[0] - start_memory
+    if started:
+        tracemalloc.stop()
+    del components
+    return memory, seconds
+
+
+def slots_benchmark(count=100000):
+    '''compares the slotted component classes with dict-based copies of them
+
+    Args:
+        count (int): the number of instances of each component
+    Returns (list):
+        one tuple per component, of its name, the bytes and seconds of the
+        slotted class, and the bytes and seconds of the dict-based class
+    '''
+
+    results = []
+    for component_class, indexed, line in SAMPLE_LINES:
+        arguments, comment = parse_line(line)
+        if indexed:
+            arguments = [0] + arguments
+        slotted = measure(component_class, arguments, count)
+        dict_results = measure(dict_based(component_class), arguments, count)
+        results.append((component_class.__name__,) + slotted + dict_results)
+    return results
+
+
+def print_slots_benchmark(results, count):
+    print('%d instances of each component' % count)
+    print('%-12s %14s %10s %14s %10s %8s' % ('component', 'slots bytes', 'seconds', 'dict bytes', 'seconds', 'saved'))
+    for name, slot_bytes, slot_seconds, dict_bytes, dict_seconds in results:
+        print('%-12s %14d %10.3f %14d %10.3f %7.0f%%' % (name, slot_bytes, slot_seconds,
+            dict_bytes, dict_seconds, 100.0*(dict_bytes - slot_bytes)/dict_bytes))
+
+
+def section_ranges(lines):
+    '''finds the lines of each data section of a pss/e file
+
+    Args:
+        lines (list): the lines of the file
+    Returns (OrderedDict):
+        the (start, stop) line range of each section of PARSE_SECTIONS,
+        including the line that ends it
+    '''
+
+    ranges = collections.OrderedDict()
+    start = 3
+    for section in PARSE_SECTIONS:
+        stop = start
+        while stop < len(lines) and parse_line(lines[stop])[0][0].strip() not in psse_terminuses:
+            stop += 1
+        if stop < len(lines) and parse_line(lines[stop])[0][0].strip() != psse_record_terminus:
+            stop += 1
+        ranges[section] = (start, stop)
+        start = stop
+    return ranges
+
+
+def _timed(function, *args):
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def _tokenize(lines):
+    for line in lines:
+        parse_line(line)
+
+
+def _frames(tables):
+    # builds the data frames of the tables from rows of values, as the parser does
+    for table in tables:
+        pd.DataFrame(data=table.to_numpy(dtype=object).tolist(), columns=list(table.columns))
+
+
+def _write_tables(case, names):
+    for name in names:
+        table_lines(getattr(case, name), name)
+
+
+def roundtrip_times(text):
+    '''times one parse and write round trip of the text of a pss/e file
+
+    Args:
+        text (str): the text of the file
+    Returns (list):
+        one (section, stage, lines, bytes, seconds) tuple for each stage of
+        ROUNDTRIP_STAGES of each data section, and for the parse and write
+        of the whole case, section 'case'
+    '''
+
+    lines = text.split('\n')
+    timings = []
+    case, parse_seconds = _timed(parse_psse_case_str, text, None, None, None, timings)
+    section_seconds = {timing.section: timing.seconds for timing in timings}
+    _, write_seconds = _timed(write_psse, case, io.StringIO())
+
+    times = []
+    for section, (start, stop) in section_ranges(lines).items():
+        section_lines = lines[start:stop]
+        size = sum(len(line.encode()) + 1 for line in section_lines)
+        tables = [getattr(case, name) for name in PARSE_SECTIONS[section]]
+        _, tokenize_seconds = _timed(_tokenize, section_lines)
+        _, frame_seconds = _timed(_frames, tables)
+        _, section_write_seconds = _timed(_write_tables, case, PARSE_SECTIONS[section])
+        seconds = section_seconds.get(section, 0.0)
+        stage_seconds = [tokenize_seconds, max(seconds - tokenize_seconds - frame_seconds, 0.0),
+            frame_seconds, seconds, section_write_seconds]
+        for stage, stage_time in zip(ROUNDTRIP_STAGES, stage_seconds):
+            times.append((section, stage, len(section_lines), size, stage_time))
+
+    size = len(text.encode())
+    times.append(('case', 'parse', len(lines), size, parse_seconds))
+    times.append(('case', 'write', len(lines), size, write_seconds))
+    return times
+
+
+def scale_case(case, copies):
+    '''builds a synthetic case from copies of the components of a case, the
+    bus numbers of each copy are offset by the largest bus number of the case,
+    and the copies share the areas, zones and owners of the case
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        copies (int): the number of copies
+    Returns:
+        CaseTables: the scaled case
+    '''
+
+    stride = int(case.bus['ibus'].max()) if len(case.bus) > 0 else 0
+    if stride*copies > 999997:
+        raise ValueError('{} copies of the case need bus numbers above the pss/e limit of 999997'.format(copies))
+
+    tables = {}
+    for name in SCALED_TABLES:
+        table = getattr(case, name)
+        columns = [column for column in table.columns if column in BUS_NUMBER_COLUMNS and table[column].dtype.kind in 'iu']
+        parts = []
+        for copy in range(copies):
+            part = table.copy()
+            for column in columns:
+                values = part[column].to_numpy()
+                part[column] = np.where(values != 0, values + np.sign(values)*stride*copy, 0)
+            parts.append(part)
+        tables[name] = pd.concat(parts, ignore_index=True)
+    return case._replace(**tables)
+
+
+def roundtrip_benchmark(file_names, scales=(1,), repeat=3):
+    '''measures the throughput of each stage of parsing and writing pss/e
+    data files, and of synthetic cases scaled from them with
+    :func:`scale_case`
+
+    Args:
+        file_names (list): pss/e data files
+        scales (list): the number of copies of each case to benchmark, 1 is the file itself
+        repeat (int): the number of round trips, the fastest time of each stage is kept
+    Returns:
+        DataFrame: one row per case, section and stage, with the number of
+        lines and bytes of the section, the seconds and the throughput
+    '''
+
+    rows = []
+    for file_name in file_names:
+        case = parse_psse_case_file(file_name)
+        name = os.path.basename(file_name)
+        for copies in scales:
+            if copies == 1:
+                with open(file_name, 'r') as psse_file:
+                    text = psse_file.read()
+            else:
+                output = io.StringIO()
+                write_psse(scale_case(case, copies), output)
+                text = output.getvalue()
+            case_name = name if copies == 1 else '{}x{}'.format(name, copies)
+            for _ in range(repeat):
+                rows += [(case_name,) + times for times in roundtrip_times(text)]
+
+    results = pd.DataFrame(rows, columns=ROUNDTRIP_COLUMNS[:6])
+    results = results.groupby(ROUNDTRIP_COLUMNS[:5], sort=False, as_index=False)['seconds'].min()
+    seconds = results['seconds'].where(results['seconds'] > 0)
+    results['lines_per_second'] = results['lines']/seconds
+    results['mb_per_second'] = results['bytes']/seconds/1e6
+    return results
+
+
+def print_roundtrip_benchmark(results):
+    print('%-28s %-24s %-9s %9s %10s %10s %12s %8s' % ('case', 'section', 'stage', 'lines', 'bytes', 'seconds', 'lines/s', 'MB/s'))
+    for row in results[results['lines'] > 1].itertuples(index=False):
+        print('%-28s %-24s %-9s %9d %10d %10.4f %12.0f %8.2f' % tuple(row))
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser(
+        description='''grg_pssedata.benchmark measures the memory and time
+            costs of the grg_pssedata data structures.''',
+    )
+
+    parser.add_argument('files', nargs='*', help='pss/e data files (.raw) to benchmark the parse and write round trip of, '
+        'the slots benchmark is run when none are given')
+    parser.add_argument('--count', type=int, default=100000, help='the number of instances of each component')
+    parser.add_argument('--scale', type=int, nargs='+', default=[1], help='the number of copies of each case to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of round trips, the fastest is reported')
+    parser.add_argument('--output', help='a json file for the round trip results')
+
+    return parser
+
+
+def main(args):
+    '''runs the benchmarks and prints their results to stdout
+
+    Args:
+        args: an argparse data structure
+    '''
+
+    if len(args.files) == 0:
+        print_slots_benchmark(slots_benchmark(args.count), args.count)
+        return
+
+    results = roundtrip_benchmark(args.files, args.scale, args.repeat)
+    print_roundtrip_benchmark(results)
+    if args.output is not None:
+        results.to_json(args.output, orient='records', indent=1)
+    return results
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
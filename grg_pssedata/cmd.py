@@ -2,7 +2,17 @@
 
 import argparse
 
+import numpy as np
+
+from grg_pssedata.io import CASE_LISTS
+from grg_pssedata.io import CaseTables
 from grg_pssedata.io import parse_psse_case_file
+from grg_pssedata.io import write_psse
+from grg_pssedata.server import build_server
+from grg_pssedata.subcase import extract_subcase
+from grg_pssedata.tables import case_memory_report
+from grg_pssedata.tables import row_hashes
+from grg_pssedata.watch import CaseWatcher
 
 def compare_component_lists(list_1, list_2, comp_name, index_name = 'index'):
     '''compares two lists and prints the differences to stdout.  Objects in the
@@ -35,9 +45,64 @@ def compare_component_lists(list_1, list_2, comp_name, index_name = 'index'):
         return diff_count
 
 
+def compare_tables(table_1, table_2, table_name):
+    '''compares two tables row by row and prints the differences to stdout.
+    Rows are compared through their hashes, so only the differing rows are
+    printed in full.
+
+    Args:
+        table_1 (DataFrame): the first table
+        table_2 (DataFrame): the second table
+        table_name (string): the name of the table being compared
+    Returns (int):
+        returns the number of rows that differed in the two tables
+    '''
+
+    if not len(table_1) == len(table_2):
+        print('%s counts: %s %s' % (table_name, len(table_1), len(table_2)))
+        return abs(len(table_1) - len(table_2))
+
+    rows = np.flatnonzero(row_hashes(table_1) != row_hashes(table_2))
+    if len(rows) == 0:
+        # same values, the columns or their dtypes differ
+        print('%s columns: %s %s' % (table_name,
+            list(table_1.dtypes.astype(str).items()), list(table_2.dtypes.astype(str).items())))
+        return 1
+
+    for row in rows:
+        print('different %s (%d)' % (table_name, row))
+        print('case 1: %s' % list(table_1.iloc[row]))
+        print('case 2: %s' % list(table_2.iloc[row]))
+        print('')
+    return len(rows)
+
+
+def compare_headers(header_1, header_2):
+    '''Compares the case data of two cases, or two case headers, and
+    prints the values that differ to stdout.
+
+    Args:
+        header_1: the first case or CaseHeader
+        header_2: the second case or CaseHeader
+    Returns (int):
+        returns the number of values that differed
+    '''
+
+    diff_count = 0
+    for field, value_format in (('ic', '%d'), ('sbase', '%s'), ('rev', '%s'), ('xfrrat', '%s'),
+            ('nxfrat', '%s'), ('basfrq', '%s'), ('record1', '%s'), ('record2', '%s')):
+        value_1, value_2 = getattr(header_1, field), getattr(header_2, field)
+        if not value_1 == value_2:
+            print(('%s: ' + value_format + ' ' + value_format) % (field, value_1, value_2))
+            diff_count += 1
+    return diff_count
+
+
 def diff(case_1, case_2):
-    '''Compares two :class:`grg_pssedata.struct.Case` objects and prints the 
-    differences to stdout.
+    '''Compares two :class:`grg_pssedata.struct.Case` objects, or the tables
+    of two parsed cases, and prints the differences to stdout.  The tables
+    of parsed cases are compared by fingerprint first and only the tables
+    whose fingerprints differ are compared row by row.
 
     Args:
         case_1: the first psse case
@@ -47,31 +112,31 @@ def diff(case_1, case_2):
     '''
 
     diff_count = 0
+    if isinstance(case_1, CaseTables):
+        diff_count += compare_headers(case_1.header, case_2.header)
+        changed = case_1.changed_tables(case_2)
+        # tables that share a component list of a Case, the transformers,
+        # are counted as that list is
+        lists = []
+        for name in changed:
+            if CASE_LISTS[name] not in lists:
+                lists.append(CASE_LISTS[name])
+        for list_name in lists:
+            names = [name for name in CASE_LISTS if CASE_LISTS[name] == list_name]
+            counts = [sum(len(getattr(case, name)) for name in names) for case in (case_1, case_2)]
+            if len(names) > 1 and counts[0] != counts[1]:
+                print('%s counts: %s %s' % ('/'.join(names), counts[0], counts[1]))
+                diff_count += abs(counts[0] - counts[1])
+                continue
+            for name in names:
+                if name in changed:
+                    diff_count += compare_tables(getattr(case_1, name), getattr(case_2, name), name)
+        if diff_count == 0 and len(changed) == 0:
+            print('the files are identical')
+        return diff_count
+
     if not case_1 == case_2:
-        if not case_1.ic == case_2.ic:
-            print('ic: %d %d' % (case_1.ic, case_2.ic))
-            diff_count += 1
-        if not case_1.sbase == case_2.sbase:
-            print('sbase: %s %s' % (case_1.sbase, case_2.sbase))
-            diff_count += 1
-        if not case_1.rev == case_2.rev:
-            print('rev: %s %s' % (case_1.rev, case_2.rev))
-            diff_count += 1
-        if not case_1.xfrrat == case_2.xfrrat:
-            print('xfrrat: %s %s' % (case_1.xfrrat, case_2.xfrrat))
-            diff_count += 1
-        if not case_1.nxfrat == case_2.nxfrat:
-            print('nxfrat: %s %s' % (case_1.nxfrat, case_2.nxfrat))
-            diff_count += 1
-        if not case_1.basfrq == case_2.basfrq:
-            print('basfrq: %s %s' % (case_1.basfrq, case_2.basfrq))
-            diff_count += 1
-        if not case_1.record1 == case_2.record1:
-            print('record1: %s %s' % (case_1.record1, case_2.record1))
-            diff_count += 1
-        if not case_1.record2 == case_2.record2:
-            print('record2: %s %s' % (case_1.record2, case_2.record2))
-            diff_count += 1
+        diff_count += compare_headers(case_1, case_2)
 
         if not case_1.buses == case_2.buses:
             diff_count += compare_component_lists(
@@ -158,6 +223,9 @@ def diff(case_1, case_2):
 def eq(case_1, case_2):
     if case_1 == case_2:
         print('the case file data structures are identical')
+        if isinstance(case_1, CaseTables):
+            # equal fingerprints cover every value of every table
+            return True
         case_1_str = case_1.to_psse()
         case_2_str = case_2.to_psse()
         if case_1_str == case_2_str:
@@ -171,6 +239,129 @@ def eq(case_1, case_2):
     return False
 
 
+def parse(file_name, mem=False, dtypes=None):
+    '''Parses a psse data file and prints the rows of each table to stdout,
+    optionally with a report of the memory the parse used.
+
+    Args:
+        file_name (str): a psse data file
+        mem (bool): report the peak allocation of each section and the
+            bytes held by each table and column
+        dtypes (str): the dtype policy of the parsed tables, None or 'compact'
+    Returns (CaseTables):
+        returns the tables of the parsed case
+    '''
+
+    allocations = [] if mem else None
+    case = parse_psse_case_file(file_name, dtypes=dtypes, memory=allocations)
+    for name, table in zip(case._fields, case):
+        print('%-14s %8d rows' % (name, len(table)))
+
+    if mem:
+        print('')
+        print('%-26s %14s %14s' % ('section', 'peak bytes', 'kept bytes'))
+        for allocation in allocations:
+            print('%-26s %14d %14d' % allocation)
+
+        report = case_memory_report(case)
+        print('')
+        print('%-14s %-10s %-10s %12s' % ('table', 'column', 'dtype', 'bytes'))
+        for table, column, dtype, size in report.itertuples(index=False):
+            print('%-14s %-10s %-10s %12d' % (table, column, dtype, size))
+        print('%-14s %-10s %-10s %12d' % ('total', '', '', report['bytes'].sum()))
+
+    return case
+
+
+def validate(file_name, dtypes=None):
+    '''Parses a psse data file and prints the values that break the pss/e
+    data specification to stdout.
+
+    Args:
+        file_name (str): a psse data file
+        dtypes (str): the dtype policy of the parsed tables, None or 'compact'
+    Returns (int):
+        returns the number of violations
+    '''
+
+    violations = parse_psse_case_file(file_name, dtypes=dtypes).validate()
+    for section, row, field, value, rule in violations.itertuples(index=False):
+        print('%s %s: %s = %s (%s)' % (section, row, field, value, rule))
+    print('%d violations' % len(violations))
+    return len(violations)
+
+
+def extract(file_name, out_file_name, areas=None, zones=None, buses=None):
+    '''Parses a psse data file and writes the part of it on the buses of
+    some areas, zones or bus numbers to a new psse data file.
+
+    Args:
+        file_name (str): a psse data file
+        out_file_name (str): the psse data file to write
+        areas (list): area numbers
+        zones (list): zone numbers
+        buses (list): bus numbers
+    Returns (CaseTables):
+        returns the tables of the extracted case
+    '''
+
+    subcase = extract_subcase(parse_psse_case_file(file_name), areas, zones, buses)
+    with open(out_file_name, 'w') as out_file:
+        write_psse(subcase, out_file)
+    print('%d of the buses written to %s' % (len(subcase.bus), out_file_name))
+    return subcase
+
+
+def watch(directory, interval=1.0, snapshot_dir=None, polls=None, dtypes=None):
+    '''Keeps the psse data files of a directory parsed and prints a line to
+    stdout each time one is added, modified or removed.
+
+    Args:
+        directory (str): the directory to watch
+        interval (float): seconds between two polls of the directory
+        snapshot_dir (str): directory for snapshots of the parsed cases
+        polls (int): the number of polls to make, forever if None
+        dtypes (str): the dtype policy of the parsed tables, None or 'compact'
+    Returns (int):
+        returns the number of change events
+    '''
+
+    watcher = CaseWatcher(directory, snapshot_dir=snapshot_dir, dtypes=dtypes)
+    event_count = 0
+    for event in watcher.watch(interval, polls):
+        if event.error is not None:
+            print('%s: %s (%s)' % (event.kind, event.path, event.error))
+        else:
+            print('%s: %s (%s)' % (event.kind, event.path, ', '.join(event.tables)))
+        event_count += 1
+    return event_count
+
+
+def serve(address, snapshot_dir=None, files=()):
+    '''Keeps psse data files parsed in memory and answers queries about
+    them until interrupted.
+
+    Args:
+        address: the path of a unix socket, or a localhost port
+        snapshot_dir (str): directory for snapshots of the parsed cases
+        files (list): psse data files to parse before serving
+    Returns (int):
+        returns the number of cases held when the server stopped
+    '''
+
+    server = build_server(address, snapshot_dir)
+    for file_name in files:
+        server.case(file_name)
+    print('serving %d cases on %s' % (len(server.cache), server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return len(server.cache)
+
+
 def build_cmd_parser():
     parser = argparse.ArgumentParser(
         description='''grg_pssedata.cmd provides tools for analyzing and
@@ -191,6 +382,41 @@ def build_cmd_parser():
     parser_diff.add_argument('file_1', help='a psse data file (.raw)')
     parser_diff.add_argument('file_2', help='a psse data file (.raw)')
 
+    parser_parse = subparsers.add_parser('parse', help = 'parses a case file '
+        'and reports its tables')
+    parser_parse.add_argument('file', help='a psse data file (.raw)')
+    parser_parse.add_argument('--mem', action='store_true', help='report the memory of each section, table and column')
+    parser_parse.add_argument('--dtypes', choices=['compact'], help='the dtype policy of the parsed tables')
+
+    parser_validate = subparsers.add_parser('validate', help = 'checks a case '
+        'file against the pss/e data specification')
+    parser_validate.add_argument('file', help='a psse data file (.raw)')
+    parser_validate.add_argument('--dtypes', choices=['compact'], help='the dtype policy of the parsed tables')
+
+    parser_extract = subparsers.add_parser('extract', help = 'writes the '
+        'part of a case on some areas, zones or buses to a new case file')
+    parser_extract.add_argument('file', help='a psse data file (.raw)')
+    parser_extract.add_argument('out_file', help='the psse data file to write (.raw)')
+    parser_extract.add_argument('--areas', type=int, nargs='+', help='the area numbers of the buses to keep')
+    parser_extract.add_argument('--zones', type=int, nargs='+', help='the zone numbers of the buses to keep')
+    parser_extract.add_argument('--buses', type=int, nargs='+', help='the numbers of the buses to keep')
+
+    parser_watch = subparsers.add_parser('watch', help = 'keeps a directory '
+        'of case files parsed')
+    parser_watch.add_argument('directory', help='a directory of psse data files (.raw)')
+    parser_watch.add_argument('--interval', type=float, default=1.0, help='seconds between two polls of the directory')
+    parser_watch.add_argument('--snapshots', help='a directory for snapshots of the parsed cases')
+    parser_watch.add_argument('--polls', type=int, help='stop after this many polls')
+    parser_watch.add_argument('--dtypes', choices=['compact'], help='the dtype policy of the parsed tables')
+
+    parser_serve = subparsers.add_parser('serve', help = 'keeps case files '
+        'parsed and answers queries about them')
+    parser_serve.add_argument('files', nargs='*', help='psse data files (.raw) to parse on start up')
+    parser_serve_address = parser_serve.add_mutually_exclusive_group(required=True)
+    parser_serve_address.add_argument('--socket', help='the path of a unix socket to listen on')
+    parser_serve_address.add_argument('--port', type=int, help='a localhost port to listen on')
+    parser_serve.add_argument('--snapshots', help='a directory for snapshots of the parsed cases')
+
     #parser.add_argument('--foo', help='foo help')
     version = __import__('grg_pssedata').__version__
     parser.add_argument('-v', '--version', action='version', \
@@ -219,6 +445,22 @@ def main(args):
 
          return diff(case_1, case_2)
 
+    if args.cmd == 'parse':
+        return parse(args.file, args.mem, args.dtypes)
+
+    if args.cmd == 'validate':
+        return validate(args.file, args.dtypes)
+
+    if args.cmd == 'extract':
+        return extract(args.file, args.out_file, args.areas, args.zones, args.buses)
+
+    if args.cmd == 'watch':
+        return watch(args.directory, args.interval, args.snapshots, args.polls, args.dtypes)
+
+    if args.cmd == 'serve':
+        address = args.socket if args.socket is not None else args.port
+        return serve(address, args.snapshots, args.files)
+
 
 if __name__ == '__main__':
     import sys
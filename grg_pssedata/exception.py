@@ -18,6 +18,11 @@ class PSSEDataValidationError(PSSEDataException):
     pass
 
 
+class PSSEDataServerError(PSSEDataException):
+    '''for requests that a case server could not answer'''
+    pass
+
+
 class PSSEDataWarning(Warning):
     '''root class for all PSSEData Warnings'''
     pass
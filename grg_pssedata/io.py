@@ -2,15 +2,16 @@ from __future__ import print_function
 
 import argparse
 import functools
+import hashlib
 import re
 import warnings
 import sys
+import time
 import collections
+import concurrent.futures
+import tracemalloc
 import pandas as pd
-from IPython import embed
 import yaml
-import ipdb
-import numpy as np
 
 from grg_pssedata.struct import Bus
 from grg_pssedata.struct import Load
@@ -29,6 +30,9 @@ from grg_pssedata.struct import Zone
 from grg_pssedata.struct import Owner
 from grg_pssedata.struct import SwitchedShunt
 from grg_pssedata.struct import Case
+from grg_pssedata.struct import CASE_DEFAULTS
+from grg_pssedata.struct import CASE_SECTIONS
+from grg_pssedata.struct import _set_defaults
 from grg_pssedata.struct import TwoTerminalDCLine
 from grg_pssedata.struct import TwoTerminalDCLineParameters
 from grg_pssedata.struct import TwoTerminalDCLineRectifier
@@ -47,6 +51,24 @@ from grg_pssedata.struct import InterareaTransfer
 from grg_pssedata.struct import FACTSDevice
 from grg_pssedata.struct import InductionMachine
 
+from grg_pssedata.tables import apply_dtypes
+from grg_pssedata.tables import encode_strings
+from grg_pssedata.tables import table_fingerprint
+from grg_pssedata.tables import BusNumbering
+from grg_pssedata.tables import KeyIndex
+from grg_pssedata.tables import PRIMARY_KEYS
+from grg_pssedata.tables import TABLE_COMPONENTS
+from grg_pssedata.tables import ComponentTable
+from grg_pssedata.tables import TableSequence
+from grg_pssedata.tables import component_tables
+from grg_pssedata.tables import table_lines
+
+from grg_pssedata.scenario import ScenarioOverlay
+
+from grg_pssedata.topology import BusAdjacency
+
+from grg_pssedata.validation import validate_case
+
 from grg_pssedata.exception import PSSEDataParsingError
 from grg_pssedata.exception import PSSEDataWarning
 
@@ -56,25 +78,417 @@ with open('headers.yaml', 'r') as f:
     except yaml.YAMLError as exc:
         print(exc)
 
-with open('areas.yaml', 'r') as f:
-    try:
-        AREAS = yaml.safe_load(f)
-        INTERNALS = AREAS['ISONE'] + AREAS['NYISO'] + AREAS['PJM'] + AREAS['DUKE'] + AREAS['SC']
-        EXTERNALS = list(set(AREAS['ALLAREAS']) - set(INTERNALS))
-        # INTERNALS = list(set(AREAS['ALLAREAS']) - set(EXTERNALS))
-        # EXTERNALS = AREAS['ISONE'] + AREAS['NYISO'] + AREAS['PJM'] + AREAS['DUKE'] + AREAS['SC']
-    except yaml.YAMLError as exc:
-        print(exc)
+LineRequirements = collections.namedtuple('LineRequirements',['line_index','min_values','max_values','section'])
+
+# the tables of a parsed case, named after their HEADERS entries
+TABLE_NAMES = ['bus', 'load', 'generator', 'acline', 'transformer3w', 'transformer2w', 'twotermdc', 'vscdc', 'facts', 'fixshunt', 'swshunt', 'area', 'zone', 'owner']
+_CaseTables = collections.namedtuple('_CaseTables', TABLE_NAMES)
+
+# the case identification data of the first three lines of a data file
+CaseHeader = collections.namedtuple('CaseHeader', ['ic', 'sbase', 'rev', 'xfrrat', 'nxfrat', 'basfrq', 'record1', 'record2'])
+DEFAULT_HEADER = CaseHeader(*(CASE_DEFAULTS + ['', '']))
+
+# the component list of struct.Case that holds each table, the transformer
+# tables share one list
+CASE_LISTS = collections.OrderedDict([
+    ('bus', 'buses'),
+    ('load', 'loads'),
+    ('generator', 'generators'),
+    ('acline', 'branches'),
+    ('transformer3w', 'transformers'),
+    ('transformer2w', 'transformers'),
+    ('twotermdc', 'tt_dc_lines'),
+    ('vscdc', 'vsc_dc_lines'),
+    ('facts', 'facts'),
+    ('fixshunt', 'fixed_shunts'),
+    ('swshunt', 'switched_shunts'),
+    ('area', 'areas'),
+    ('zone', 'zones'),
+    ('owner', 'owners'),
+])
+
+
+# the tables of each section of a pss/e file, in file order, with the line
+# that ends the section, two winding transformers are written first
+SECTION_TABLES = [
+    ([name for name in ('transformer2w', 'transformer3w') if section == 'transformers'] or
+        [name for name, case_list in CASE_LISTS.items() if case_list == section], end)
+    for section, end in CASE_SECTIONS
+]
 
 
-CAPLIM = 500 # 50 MW limit of substations
-KVLIM = 345 # 345 kV lines and above
-CONLIM = 3 # number of connections to a bus
+class CaseTables(_CaseTables):
+    '''The tables of a parsed case, one data frame per component type.  Each
+    table has a content fingerprint that is computed when it is first
+    requested and kept with the case, so the tables are treated as read
+    only once they are fingerprinted; use `_replace` to derive a changed
+    case.  Two cases are equal when their headers and all of their
+    fingerprints are.  Hash indexes on the primary keys of the tables, the
+    dense bus numbering and the bus adjacency are likewise built on first
+    use, they are not pickled with the case.
+    '''
+
+    def fingerprint(self, section):
+        '''Returns: the content digest of one table, see :func:`grg_pssedata.tables.table_fingerprint`, or of the case header for section "header"'''
+        if section == 'header':
+            return hashlib.sha1(repr(tuple(self.header)).encode()).hexdigest()
+        fingerprints = self.__dict__.setdefault('_fingerprints', {})
+        if section not in fingerprints:
+            fingerprints[section] = table_fingerprint(getattr(self, section))
+        return fingerprints[section]
+
+    @property
+    def header(self):
+        '''Returns: the CaseHeader of the case, the pss/e defaults when it was not parsed'''
+        return self.__dict__.get('_header', DEFAULT_HEADER)
+
+    def _replace(self, **tables):
+        case = _CaseTables._replace(self, **tables)
+        if '_header' in self.__dict__:
+            case.__dict__['_header'] = self.__dict__['_header']
+        return case
+
+    def index(self, section):
+        '''Returns: the KeyIndex of one table on its PRIMARY_KEYS columns'''
+        indexes = self.__dict__.setdefault('_indexes', {})
+        if section not in indexes:
+            indexes[section] = KeyIndex(getattr(self, section), PRIMARY_KEYS[section])
+        return indexes[section]
+
+    def lookup(self, section, keys):
+        '''Returns: the row positions of keys in one table, -1 for keys that are not in it'''
+        return self.index(section).lookup(keys)
+
+    def numbering(self):
+        '''Returns: the BusNumbering of the case, which maps bus numbers to dense indexes'''
+        if '_numbering' not in self.__dict__:
+            self.__dict__['_numbering'] = BusNumbering(self.bus['ibus'])
+        return self.__dict__['_numbering']
+
+    def adjacency(self):
+        '''Returns: the BusAdjacency of the ac lines, transformers and dc links of the case, see :class:`grg_pssedata.topology.BusAdjacency`'''
+        if '_adjacency' not in self.__dict__:
+            self.__dict__['_adjacency'] = BusAdjacency.from_case(self)
+        return self.__dict__['_adjacency']
+
+    def validate(self):
+        '''Returns: a data frame of the violations of the pss/e data specification, see :func:`grg_pssedata.validation.validate_case`'''
+        return validate_case(self)
+
+    def fingerprints(self):
+        '''Returns: an ordered dictionary of the digest of the header and of each table'''
+        return collections.OrderedDict((name, self.fingerprint(name)) for name in ('header',) + self._fields)
+
+    def changed_tables(self, other):
+        '''Returns: the names of the tables whose digests differ in the two cases'''
+        return [name for name in self._fields if self.fingerprint(name) != other.fingerprint(name)]
+
+    def __eq__(self, other):
+        if isinstance(other, CaseTables):
+            return self.header == other.header and len(self.changed_tables(other)) == 0
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, CaseTables):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        # the indexes, numbering and adjacency are quick to rebuild
+        state = {'_fingerprints': self.__dict__.get('_fingerprints', {})}
+        if '_header' in self.__dict__:
+            state['_header'] = self.__dict__['_header']
+        return state
+
+
+def case_header(ic, sbase, rev, xfrrat, nxfrat, basfrq, record1, record2):
+    '''Returns: a CaseHeader of the given values, with the defaults and types of :class:`grg_pssedata.struct.Case`'''
+    values = [ic, sbase, rev, xfrrat, nxfrat, basfrq]
+    _set_defaults(values, CASE_DEFAULTS)
+    ic, sbase, rev, xfrrat, nxfrat, basfrq = values
+    return CaseHeader(int(ic), float(sbase), int(rev), int(xfrrat), int(nxfrat), float(basfrq), str(record1), str(record2))
+
+
+def frames_to_case(case):
+    '''builds a :class:`grg_pssedata.struct.Case` on the tables of a parsed
+    case.  The component lists are ComponentTables, whose rows are views of
+    column arrays, so no component data structure is built up front.  Two
+    and three winding transformers are listed in that order, and the
+    sections that are not parsed into tables are empty.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns:
+        Case: the case data structure
+    '''
+
+    tables = component_tables(case)
+    transformers = TableSequence([tables['transformer2w'], tables['transformer3w']])
+    header = case.header
+    return Case(header.ic, header.sbase, header.rev, header.xfrrat, header.nxfrat, header.basfrq,
+        header.record1, header.record2,
+        tables['bus'], tables['load'], tables['fixshunt'], tables['generator'], tables['acline'],
+        transformers, tables['area'], tables['twotermdc'], tables['vscdc'], [], [], [],
+        tables['zone'], [], tables['owner'], tables['facts'], tables['swshunt'], [], [])
+
+
+def _component_table(components, component_class):
+    if isinstance(components, ComponentTable):
+        return components
+    if isinstance(components, TableSequence):
+        for table in components.tables:
+            if table.component_class == component_class:
+                return table
+        return ComponentTable.from_components(component_class, [])
+    if component_class in (TwoWindingTransformer, ThreeWindingTransformer):
+        # row views of a ComponentTable name their class through the table
+        components = [component for component in components if isinstance(component, component_class)
+            or getattr(getattr(component, '_table', None), 'component_class', None) == component_class]
+    return ComponentTable.from_components(component_class, components)
+
+
+def case_to_frames(case):
+    '''builds the tables of a :class:`grg_pssedata.struct.Case`, with the
+    columns of a parsed case.  Component lists that are ComponentTables
+    are converted column by column, other lists are gathered into columns
+    once.
+
+    Args:
+        case (Case): the case data structure
+    Returns:
+        CaseTables: the tables of the case
+    '''
+
+    frames = []
+    for name in TABLE_NAMES:
+        component_class = TABLE_COMPONENTS[name]
+        table = _component_table(getattr(case, CASE_LISTS[name]), component_class)
+        frames.append(table.to_frame(HEADERS[name]).infer_objects())
+    tables = CaseTables(*frames)
+    tables.__dict__['_header'] = case_header(case.ic, case.sbase, case.rev, case.xfrrat, case.nxfrat,
+        case.basfrq, case.record1, case.record2)
+    return tables
+
+
+def _header_lines(header):
+    return [', '.join([str(header.ic), str(header.sbase), str(header.rev),
+        str(header.xfrrat), str(header.nxfrat), str(header.basfrq)]), header.record1, header.record2]
+
+
+def tables_psse_chunks(case, chunk_rows=None, precision=None):
+    '''encodes the tables of a parsed case in pss/e format, formatting
+    each table column by column rather than component by component.  The
+    lines are those of :meth:`grg_pssedata.struct.Case.psse_chunks` on
+    :func:`frames_to_case` of the tables, except that switched shunt blocks
+    are also left out when their values are missing numbers.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        chunk_rows (int): the most components encoded per chunk
+            (default = a whole section per chunk)
+        precision (str): the precision policy of float columns, see
+            :data:`grg_pssedata.tables.PRECISION_POLICIES`
+    Returns:
+        a generator of lists of lines, in file order
+    '''
+
+    yield _header_lines(case.header)
+
+    for names, end in SECTION_TABLES:
+        for name in names:
+            lines = table_lines(getattr(case, name), name, precision)
+            step = chunk_rows if chunk_rows else max(len(lines), 1)
+            for start in range(0, len(lines), step):
+                yield ('  ' + lines[start:start + step]).tolist()
+        yield [end]
+
+    yield ['Q']
+
+
+def write_psse(case, fileobj, chunk_rows=10000, precision=None):
+    '''writes a pss/e encoding of a case to an open file, a chunk of
+    components at a time, so that memory stays bounded by the chunk size
+    instead of the case size.  The text written is the same as
+    :meth:`grg_pssedata.struct.Case.to_psse`.
+
+    Args:
+        case (Case or CaseTables): the case, tables are formatted with
+            :func:`tables_psse_chunks`
+        fileobj: a file opened for writing text
+        chunk_rows (int): the most components formatted per write
+        precision (str): the precision policy of float columns, see
+            :data:`grg_pssedata.tables.PRECISION_POLICIES`, only parsed
+            tables take a policy
+    '''
+
+    if isinstance(case, CaseTables):
+        chunks = tables_psse_chunks(case, chunk_rows, precision)
+    elif precision is not None:
+        raise ValueError('precision policies apply to parsed tables, convert the case with case_to_frames')
+    else:
+        chunks = case.psse_chunks(chunk_rows)
+
+    separator = ''
+    for lines in chunks:
+        if len(lines) > 0:
+            fileobj.write(separator + '\n'.join(lines))
+            separator = '\n'
+
+
+# the text of the tables that are shared by the cases of write_many, keyed
+# by table name and fingerprint
+_section_text = {}
+
+
+def _share_sections(texts):
+    _section_text.clear()
+    _section_text.update(texts)
+
+
+def _format_section(name, table, precision):
+    return '\n'.join(('  ' + table_lines(table, name, precision)).tolist())
+
+
+def _write_variant(path, header, sections, precision):
+    # sections lists the (name, key, table) of each table in file order,
+    # the table is None when its text was shared by the parent process
+    parts = [_header_lines(header)]
+    texts = iter(sections)
+    for names, end in SECTION_TABLES:
+        for _ in names:
+            name, key, table = next(texts)
+            text = _section_text[key] if table is None else _format_section(name, table, precision)
+            if len(text) > 0:
+                parts.append([text])
+        parts.append([end])
+    parts.append(['Q'])
+    with open(path, 'w') as fileobj:
+        fileobj.write('\n'.join(line for lines in parts for line in lines))
+    return path
+
+
+def _variant_keys(variant):
+    # the tables of a scenario or case, with a key that is equal for tables
+    # of equal content, tables a scenario did not change take the key of the
+    # base case, so they are not fingerprinted again
+    if isinstance(variant, ScenarioOverlay):
+        changed = set(variant.changed_tables())
+        case = variant.case()
+        return case, [(name, (name, case.fingerprint(name) if name in changed else variant.base.fingerprint(name)))
+            for names, end in SECTION_TABLES for name in names]
+    return variant, [(name, (name, variant.fingerprint(name))) for names, end in SECTION_TABLES for name in names]
+
+
+def write_many(cases, paths, workers=None, precision=None):
+    '''writes the pss/e encodings of many variants of a case, such as the
+    scenarios of a base case.  Each distinct table is formatted once: the
+    text of tables that several variants share is formatted up front and
+    handed to every worker, the others are formatted by the worker that
+    writes them.  The files are the same as those of :func:`write_psse`.
+
+    Args:
+        cases (list): CaseTables or ScenarioOverlays
+        paths (list): the file to write each case to
+        workers (int): the number of worker processes, None or 1 writes the
+            files in this process
+        precision (str): the precision policy of float columns, see
+            :data:`grg_pssedata.tables.PRECISION_POLICIES`
+    Returns:
+        list: the paths that were written
+    '''
+
+    if len(cases) != len(paths):
+        raise ValueError('{} cases were given for {} paths'.format(len(cases), len(paths)))
+
+    variants = [_variant_keys(case) for case in cases]
+    uses = collections.Counter(key for case, keys in variants for name, key in keys)
+
+    shared = {}
+    tasks = []
+    for path, (case, keys) in zip(paths, variants):
+        sections = []
+        for name, key in keys:
+            if uses[key] > 1 and key not in shared:
+                shared[key] = _format_section(name, getattr(case, name), precision)
+            sections.append((name, key, None if key in shared else getattr(case, name)))
+        tasks.append((path, case.header, sections, precision))
+
+    if workers is None or workers <= 1:
+        _share_sections(shared)
+        try:
+            return [_write_variant(*task) for task in tasks]
+        finally:
+            _section_text.clear()
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=_share_sections, initargs=(shared,)) as pool:
+        futures = [pool.submit(_write_variant, *task) for task in tasks]
+        return [future.result() for future in futures]
 
-LineRequirements = collections.namedtuple('LineRequirements',['line_index','min_values','max_values','section'])
 
 print_err = functools.partial(print, file=sys.stderr)
 
+# the allocations of one section of a parse, in bytes, peak is the highest
+# allocation while the section was decoded and current is what it kept
+SectionAllocation = collections.namedtuple('SectionAllocation', ['section', 'peak', 'current'])
+
+# the wall clock seconds one section of a parse took, tokenizing its lines,
+# building its components and their data frame
+SectionTime = collections.namedtuple('SectionTime', ['section', 'seconds'])
+
+
+def _reset_peak():
+    # tracemalloc.reset_peak is new in python 3.9, before that the peak of a
+    # section is the peak of the parse so far
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+class SectionMemory(object):
+    def __init__(self, allocations=None, timings=None):
+        '''This data structure records the allocations of each section of a
+        parse with tracemalloc, and optionally the time each section took.
+        Tracing is started when it is not already running and stopped again
+        when the parse is done.  Without a list to record into it does
+        nothing, so untraced parses pay no cost.
+
+        Args:
+            allocations (list): receives one SectionAllocation per section (optional)
+            timings (list): receives one SectionTime per section (optional)
+        '''
+
+        self.allocations = allocations
+        self.timings = timings
+        self.started = False
+        if self.timings is not None:
+            self.start_time = time.perf_counter()
+        if self.allocations is None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started = True
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        _reset_peak()
+
+    def end(self, section):
+        '''records the allocations and time of a section that was just
+        decoded and starts measuring the next one'''
+        if self.timings is not None:
+            end_time = time.perf_counter()
+            self.timings.append(SectionTime(section, end_time - self.start_time))
+            self.start_time = end_time
+        if self.allocations is None:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        self.allocations.append(SectionAllocation(section, peak - self.baseline, current - self.baseline))
+        _reset_peak()
+
+    def stop(self):
+        if self.started:
+            tracemalloc.stop()
+            self.started = False
+
 psse_table_terminus = '0'
 psse_record_terminus = 'Q'
 psse_terminuses = [psse_table_terminus, psse_record_terminus]
@@ -90,39 +504,53 @@ def expand_commas(list):
     return expanded_list
 
 
-def parse_psse_case_file(psse_file_name):
+def parse_psse_case_file(psse_file_name, dtypes=None, strings=None, memory=None, timings=None):
     '''opens the given path and parses it as pss/e data
 
     Args:
         psse_file_name(str): path to the a psse data file
+        dtypes(str): the dtype policy of the tables, None or 'compact'
+        strings(StringDictionary): a dictionary that replaces string
+            columns with integer codes (optional)
+        memory(list): receives the tracemalloc allocations of each section
+            of the file (optional)
+        timings(list): receives the seconds each section of the file took
+            to parse (optional)
     Returns:
-        Case: a grg_pssedata case
+        CaseTables: the tables of the parsed case
     '''
 
     with open(psse_file_name, 'r') as psse_file:
         lines = psse_file.readlines()
 
     #try:
-    psse_data = parse_psse_case_lines(lines)
+    psse_data = parse_psse_case_lines(lines, dtypes, strings, memory, timings)
     #except BaseException as e:
     #    raise PSSEDataParsingError('{}'.format(str(e)))
 
     return psse_data
 
 
-def parse_psse_case_str(psse_string):
+def parse_psse_case_str(psse_string, dtypes=None, strings=None, memory=None, timings=None):
     '''parses a given string as matpower data
 
     Args:
         mpString(str): a matpower data file as a string
+        dtypes(str): the dtype policy of the tables, None or 'compact'
+        strings(StringDictionary): a dictionary that replaces string
+            columns with integer codes (optional)
+        memory(list): receives the tracemalloc allocations of each section
+            of the file (optional)
+        timings(list): receives the seconds each section of the file took
+            to parse (optional)
     Returns:
-        Case: a grg_pssedata case
+        CaseTables: the tables of the parsed case
     '''
 
     lines = psse_string.split('\n')
 
     #try:
-    psse_data = parse_psse_case_lines(lines)
+    psse_data = parse_psse_case_lines(lines, dtypes, strings, memory, timings)
     #except BaseException as e:
     #    raise PSSEDataParsingError('{}'.format(str(e)))
 
@@ -152,10 +580,19 @@ def parse_line(line, line_reqs=None):
     return line_parts, comment
 
 
-def parse_psse_case_lines(lines):
+def parse_psse_case_lines(lines, dtypes=None, strings=None, memory=None, timings=None):
     if len(lines) < 3: # need at base values and record
         raise PSSEDataParsingError('psse case has {} lines and at least 3 are required'.format(len(lines)))
 
+    sections = SectionMemory(memory, timings)
+    try:
+        return _parse_case_sections(lines, dtypes, strings, sections)
+    finally:
+        # a failed parse must not leave tracemalloc running
+        sections.stop()
+
+
+def _parse_case_sections(lines, dtypes, strings, sections):
     (ic, sbase, rev, xfrrat, nxfrat, basefrq), comment = parse_line(lines[0], LineRequirements(0, 6, 6, "header"))
     print_err('case data: {} {} {} {} {} {}'.format(ic, sbase, rev, xfrrat, nxfrat, basefrq))
 
@@ -201,6 +638,7 @@ def parse_psse_case_lines(lines):
 
 
     line_index = 3
+    sections.end('case data')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 9, 13, "bus"))
         buses.append(Bus(*line_parts).__df__())
@@ -212,6 +650,7 @@ def parse_psse_case_lines(lines):
     Busdf = pd.DataFrame(data=buses, columns=HEADERS['bus'])
 
     load_index_offset = line_index
+    sections.end('bus')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 13, 14, "load"))
         loads.append(Load(line_index - load_index_offset, *line_parts).__df__())
@@ -224,6 +663,7 @@ def parse_psse_case_lines(lines):
     Loaddf = pd.DataFrame(data=loads, columns=HEADERS['load'])
 
     fixed_shunt_index_offset = line_index
+    sections.end('load')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 5, 5, "fixed shunt"))
         fixed_shunts.append(FixedShunt(line_index - fixed_shunt_index_offset, *line_parts).__df__())
@@ -236,6 +676,7 @@ def parse_psse_case_lines(lines):
     fixshuntdf = pd.DataFrame(data=fixed_shunts, columns=HEADERS['fixshunt'])
 
     gen_index_offset = line_index
+    sections.end('fixed shunt')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 20, 28, "generator"))
         generators.append(Generator(line_index - gen_index_offset, *line_parts).__df__())
@@ -248,6 +689,7 @@ def parse_psse_case_lines(lines):
     gensdf = pd.DataFrame(data=generators, columns=HEADERS['generator'])
 
     branch_index_offset = line_index
+    sections.end('generator')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         #line = shlex.split(lines[line_index].strip())
         #line = expand_commas(line)
@@ -263,6 +705,7 @@ def parse_psse_case_lines(lines):
     branchesdf = pd.DataFrame(data=branches, columns=HEADERS['acline'])
 
     transformer_index = 0
+    sections.end('branch')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 20, 21, "transformer"))
         parameters_1 = TransformerParametersFirstLine(*line_parts_1)
@@ -308,6 +751,7 @@ def parse_psse_case_lines(lines):
     trans3wdf = pd.DataFrame(data=transformers3w, columns=HEADERS['transformer3w'])
     trans2wdf = pd.DataFrame(data=transformers2w, columns=HEADERS['transformer2w'])
 
+    sections.end('transformer')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 1, 5, "areas"))
         areas.append(Area(*line_parts).__df__())
@@ -321,6 +765,7 @@ def parse_psse_case_lines(lines):
 
     #two terminal dc line data
     ttdc_index = 0
+    sections.end('area')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 12, 12, "two terminal dc line"))
         line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 17, 17, "two terminal dc line"))
@@ -343,6 +788,7 @@ def parse_psse_case_lines(lines):
 
     #vsc dc line data
     vscdc_index = 0
+    sections.end('two terminal dc line')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts_1, comment_1 = parse_line(lines[line_index], LineRequirements(line_index, 3, 11, "vsc dc line"))
         line_parts_2, comment_2 = parse_line(lines[line_index+1], LineRequirements(line_index+1, 13, 15, "vsc dc line"))
@@ -365,6 +811,7 @@ def parse_psse_case_lines(lines):
 
     #transformer impedence correction tables data
     trans_offset_index = line_index
+    sections.end('vsc dc line')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 1, 23, "transformer correction"))
         transformer_corrections.append(TransformerImpedanceCorrection(line_index - trans_offset_index, *line_parts).__df__())
@@ -379,6 +826,7 @@ def parse_psse_case_lines(lines):
 
     #multi-terminal dc line data
     mtdc_count = 0
+    sections.end('transformer correction')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 8, 8, "multi-terminal dc line"))
         parameters = MultiTerminalDCLineParameters(*line_parts)
@@ -407,6 +855,7 @@ def parse_psse_case_lines(lines):
     #multi-section line grouping data
     print('parsing multisection lines')
     msline_index_offset = line_index
+    sections.end('multi-terminal dc line')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 5, 5, "multi-section line"))
         line_groupings.append(MultiSectionLineGrouping(line_index - msline_index_offset, *line_parts).__df__())
@@ -417,6 +866,7 @@ def parse_psse_case_lines(lines):
         line_index += 1
 
 
+    sections.end('multi-section line')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 2, 2, "zone"))
         zones.append(Zone(*line_parts).__df__())
@@ -430,6 +880,7 @@ def parse_psse_case_lines(lines):
 
     # inter area transfer data
     intarea_index_offset = line_index
+    sections.end('zone')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 4, 4, "inter-area transfer"))
         transfers.append(InterareaTransfer(line_index - intarea_index_offset, *line_parts).__df__())
@@ -439,6 +890,7 @@ def parse_psse_case_lines(lines):
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
 
+    sections.end('inter-area transfer')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 2, 2, "owner"))
         owners.append(Owner(*line_parts).__df__())
@@ -452,6 +904,7 @@ def parse_psse_case_lines(lines):
 
     # facts device data block
     facts_index = 0
+    sections.end('owner')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 19, 21, "facts device"))
         facts.append(FACTSDevice(facts_index, *line_parts).__df__())
@@ -466,6 +919,7 @@ def parse_psse_case_lines(lines):
 
     # switched shunt data block
     swithced_shunt_index_offset = line_index
+    sections.end('facts device')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 12, 26, "swticthed shunt"))
         switched_shunts.append(SwitchedShunt(line_index - swithced_shunt_index_offset, *line_parts).__df__())
@@ -479,6 +933,7 @@ def parse_psse_case_lines(lines):
 
     # GNE device data
     gne_count = 0
+    sections.end('switched shunt')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         gne_count += 1
         line_index += 1
@@ -491,6 +946,7 @@ def parse_psse_case_lines(lines):
 
     # induction machine data
     indm_index_offset = line_index
+    sections.end('generic network element')
     while parse_line(lines[line_index])[0][0].strip() not in psse_terminuses:
         line_parts, comment = parse_line(lines[line_index], LineRequirements(line_index, 34, 34, "induction machine"))
         induction_machines.append(InductionMachine(line_index - indm_index_offset, *line_parts).__df__())
@@ -500,13 +956,23 @@ def parse_psse_case_lines(lines):
     if parse_line(lines[line_index])[0][0].strip() != psse_record_terminus:
         line_index += 1
 
+    sections.end('induction machine')
+
     print_err('un-parsed lines:')
     while line_index < len(lines):
         #print(parse_line(lines[line_index]))
         print_err('  '+lines[line_index])
         line_index += 1
 
-    return Busdf, Loaddf, gensdf, branchesdf, trans3wdf, trans2wdf, tt_dc_linesdf, vsc_dc_linesdf, factsdf, fixshuntdf, swshuntdf, areasdf, zonesdf, ownersdf
+    case = CaseTables(Busdf, Loaddf, gensdf, branchesdf, trans3wdf, trans2wdf, tt_dc_linesdf, vsc_dc_linesdf, factsdf, fixshuntdf, swshuntdf, areasdf, zonesdf, ownersdf)
+    case.__dict__['_header'] = case_header(ic, sbase, rev, xfrrat, nxfrat, basefrq, record1, record2)
+
+    if strings is not None:
+        case = encode_strings(case, strings)
+    case = apply_dtypes(case, dtypes)
+    sections.end('encoding')
+
+    return case
 
 
 def read_psse(args):
@@ -521,529 +987,8 @@ def build_cli_parser():
     return parser
 
 
-# if __name__ == '__main__':
-#     parser = build_cli_parser()
-#     Busdf, Loaddf, gensdf, branchesdf, trans3wdf, trans2wdf, tt_dc_linesdf, vsc_dc_linesdf, factsdf, fixshuntdf, swshuntdf, areasdf, zonesdf, ownersdf = read_psse(parser.parse_args())
-
-def fix_trans3w(trans3wpre):
-    trans3wpre.loc[trans3wpre['stat']==1,'nl']=3
-    trans3wpre.loc[trans3wpre['stat']==0,'nl']=0
-    trans3wpre.loc[trans3wpre['stat'].isin([2,3,4]),'nl']=2
-    print(f"total number of lines {trans3wpre['nl'].sum()}")
-    trans3wpre = trans3wpre.drop(columns='nl')
-    t3w=[]
-    for ibus, jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, r2_3, x2_3, sbase2_3, r3_1, x3_1, sbase3_1, wdg1rate1, wdg1rate2, wdg1rate3, wdg2rate1, wdg2rate2, wdg2rate3, wdg3rate1, wdg3rate2, wdg3rate3 in trans3wpre.values:
-        if stat ==1:
-            t3w.append([ibus, jbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, wdg1rate1, wdg1rate2, wdg1rate3])
-            t3w.append([jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r2_3, x2_3, sbase2_3, wdg2rate1, wdg2rate2, wdg2rate3])
-            t3w.append([ibus, kbus, ckt, cw, cz, name, stat,  vecgrp, r3_1, x3_1, sbase3_1, wdg3rate1, wdg3rate2, wdg3rate3])
-        elif stat==2: # only winding 2 is out
-            t3w.append([ibus, jbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, wdg1rate1, wdg1rate2, wdg1rate3])
-            t3w.append([ibus, kbus, ckt, cw, cz, name, stat,  vecgrp, r3_1, x3_1, sbase3_1, wdg3rate1, wdg3rate2, wdg3rate3])
-        elif stat==3: # only winding 3 is out: add 1 and 2
-            t3w.append([ibus, jbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, wdg1rate1, wdg1rate2, wdg1rate3])
-            t3w.append([jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r2_3, x2_3, sbase2_3, wdg2rate1, wdg2rate2, wdg2rate3])
-        elif stat==1: # only winding 1 is out: add 2 and 3
-            t3w.append([jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r2_3, x2_3, sbase2_3, wdg2rate1, wdg2rate2, wdg2rate3])
-            t3w.append([ibus, kbus, ckt, cw, cz, name, stat,  vecgrp, r3_1, x3_1, sbase3_1, wdg3rate1, wdg3rate2, wdg3rate3])
-    return pd.DataFrame(data=t3w, columns=['ibus', 'jbus', 'ckt', 'cw', 'cz', 'name', 'stat', 'vecgrp', 'r', 'x', 'sbase', 'rate1', 'rate2', 'rate3'])
-
-def fix_tt_dc(df):
-    '''calculate p, qmin, and qmin for rectifier and inverter
-    '''
-    # XXX the Qmin becomes larger than Qmax. This is the same as matpower; WHY? XXX
-
-    df.loc[df['mdc']==1,'pmw']=df.loc[df['mdc']==1,'setvl'] # SETVL is the desired real power demand
-    df.loc[df['mdc']==2,'pmw']=df.loc[df['mdc']==2,'setvl'] * df.loc[df['mdc']==2,'vschd'] / 1000  # SETVL is the current in amps (need devide 1000 to convert to MW)
-    df.loc[~(df['mdc'].isin([1,2])),'pmw']=0
-    df.loc[df['pmw']<0, 'pmw'] = -1 * df.loc[df['pmw']<0, 'pmw']
-
-    # Q min and max for rectifires and inverters
-    df.loc[:, 'qminr'] = df['pmw'] * df['anmnr']
-    df.loc[:, 'qmini'] = df['pmw'] * df['anmni']
-
-    df.loc[:, 'qmaxr'] = df['pmw'] * np.tan(np.arccos(0.5 * (np.cos(np.deg2rad(df['anmxr'])) + np.cos(np.pi/3))))
-    df.loc[:, 'qmaxi'] = df['pmw'] * np.tan(np.arccos(0.5 * (np.cos(np.deg2rad(df['anmxi'])) + np.cos(np.pi/3))))
-    df.loc[(df['qminr']<0), 'qminr'] = -1 * df.loc[(df['qminr']<0), 'qminr']
-    df.loc[(df['qmini']<0), 'qmini'] = -1 * df.loc[(df['qmini']<0), 'qmini']
-    df.loc[(df['qmaxr']<0), 'qmaxr'] = -1 * df.loc[(df['qmaxr']<0), 'qmaxr']
-    df.loc[(df['qmaxi']<0), 'qmaxi'] = -1 * df.loc[(df['qmaxi']<0), 'qmaxi']
-    df.loc[df['mdc']==0, 'stat'] = 0
-    df.loc[df['mdc']!=0, 'stat'] = 1
-
-    return df
-
-
-def calc_buscap(allbranches, buson):
-
-    # ########################################################################################### #
-    # calculate capacity of each substation
-    # ########################################################################################### #
-
-    # for ibus
-    subcap = pd.DataFrame()
-    ic = allbranches.groupby(['ibus'])['jbus'].count().reindex(buson['ibus']).fillna(value=0)
-    jc = allbranches.groupby(['jbus'])['ibus'].count().reindex(buson['ibus']).fillna(value=0)
-    ijc = ic + jc
-    ijc.name = 'count'
-    ijc = ijc.reset_index()
-
-    ibus = allbranches.groupby(['ibus'])[['rate2']].agg({'rate2':['sum', 'max']}).reindex(buson['ibus']).fillna(value=0)['rate2']
-    jbus = allbranches.groupby(['jbus'])[['rate2']].agg({'rate2':['sum', 'max']}).reindex(buson['ibus']).fillna(value=0)['rate2']
-
-    subcap['sum'] = ibus['sum'] + jbus['sum']
-    subcap['max'] = np.maximum(ibus['max'], jbus['max'])
-    subcap['cap'] = subcap['sum'] - subcap['max']
-    subcap = subcap.sort_values(by=['cap'], ascending=False)
-    buscap = pd.merge(buson, subcap[['cap']].reset_index(), on='ibus')
-    buscapc = pd.merge(buscap, ijc, on='ibus')
-
-    return buscapc
-
-# call the functions
-parser = build_cli_parser()
-(
-    busdf,
-    loaddf,
-    gensdf,
-    branchesdf,
-    trans3wdf,
-    trans2wdf,
-    tt_dc_linesdf,
-    vsc_dc_linesdf,
-    factsdf,
-    fixshuntdf,
-    swshuntdf,
-    areasdf,
-    zonesdf,
-    ownersdf,
-) = read_psse(parser.parse_args())
-
-# take in-service elements only
-# for 3-winding transformers: 0: all out 1: all in 2: only 2 is out 3: only 3 is out 4: only 1 is out
-# dfs = [busdf, loaddf, gensdf, branchesdf, trans3wdf, trans2wdf, tt_dc_linesdf, vsc_dc_linesdf, factsdf, fixshuntdf, swshuntdf, areasdf, zonesdf, ownersdf]
-# for inx, df in enumerate(dfs):
-#     if 'stat' in df.columns:
-#         df = df.loc[df['stat']!=0]
-#         dfs[inx] = df
-#     elif 'ide' in df.columns:
-#         df = df.loc[df['ide']!=0]
-#         dfs[inx] = df
-
-# busdf, loaddf, gensdf, branchesdf, trans3wdf, trans2wdf, tt_dc_linesdf, vsc_dc_linesdf, factsdf, fixshuntdf, swshuntdf, areasdf, zonesdf, ownersdf = dfs
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-# ######################Selection of Retained Buses############################################## #
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-
-# Post Processings:
-busdf.loc[busdf["area"].isin(INTERNALS), "isin"] = 1
-busdf.loc[~busdf["area"].isin(INTERNALS), "isin"] = 0
-buson = busdf.loc[
-    busdf["ide"] != 4, ["ibus", "name", "baskv", "ide", "area", "zone", "isin"]
-]
-bus = busdf.loc[:, ["ibus", "name", "baskv", "ide", "area", "zone", "isin"]]
-
-load = loaddf.loc[
-    loaddf["stat"] != 0, ["ibus", "loadid", "stat", "area", "zone", "pl", "ql"]
-]
-gens = gensdf.loc[
-    gensdf["stat"] != 0,
-    ["ibus", "machid", "pg", "qg", "qt", "qb", "vs", "ireg", "mbase"],
-]
-acbrnch = branchesdf.loc[
-    branchesdf["stat"] != 0,
-    ["ibus", "jbus", "ckt", "rpu", "xpu", "rate1", "rate2", "rate3"],
-].rename(columns={"rpu": "r", "xpu": "x"})
-acbrnch["isac"] = 1
-
-# tt_dc_lines = tt_dc_linesdf.loc[tt_dc_linesdf[''], ['ipr', 'ipi']]
-tt_dc_linesdf = fix_tt_dc(tt_dc_linesdf)
-tt_dc_lines = tt_dc_linesdf.loc[
-    tt_dc_linesdf["stat"] != 0, ["ipi", "ipr", "pmw"]
-].rename(columns={"ipi": "ibus", "ipr": "jbus", "pmw": "rate1"})
-tt_dc_lines["rate2"] = tt_dc_lines["rate1"]
-tt_dc_lines["rate3"] = tt_dc_lines["rate1"]
-tt_dc_lines["ckt"] = tt_dc_lines.index
-tt_dc_lines["isdc"] = 1
-
-trans2w = trans2wdf.loc[
-    trans2wdf["stat"] != 0,
-    ["ibus", "jbus", "ckt", "r1_2", "x1_2", "wdg1rate1", "wdg1rate2", "wdg1rate3"],
-].rename(
-    columns={
-        "r1_2": "r",
-        "x1_2": "x",
-        "wdg1rate1": "rate1",
-        "wdg1rate2": "rate2",
-        "wdg1rate3": "rate3",
-    }
-)
-trans2w["is2w"] = 1
-trans3wpre = trans3wdf.loc[
-    trans3wdf["stat"] != 0,
-    [
-        "ibus",
-        "jbus",
-        "kbus",
-        "ckt",
-        "cw",
-        "cz",
-        "name",
-        "stat",
-        "vecgrp",
-        "r1_2",
-        "x1_2",
-        "sbase1_2",
-        "r2_3",
-        "x2_3",
-        "sbase2_3",
-        "r3_1",
-        "x3_1",
-        "sbase3_1",
-        "wdg1rate1",
-        "wdg1rate2",
-        "wdg1rate3",
-        "wdg2rate1",
-        "wdg2rate2",
-        "wdg2rate3",
-        "wdg3rate1",
-        "wdg3rate2",
-        "wdg3rate3",
-    ],
-]
-trans3w = fix_trans3w(trans3wpre)[
-    ["ibus", "jbus", "ckt", "r", "x", "rate1", "rate2", "rate3"]
-]
-trans3w["is3w"] = 1
-
-# XXX fix the impedances of 3 winding transformers
-# XXX fix the impedances of 3 winding transformers
-# XXX fix the impedances of 3 winding transformers
-
-# all connections
-# creating the lines using branches and transformers and DC lines (what else?)
-abrnch = pd.concat([acbrnch, trans2w, trans3w, tt_dc_lines])
-
-# adding voltage and area to the branches
-allbranches = pd.merge(
-    pd.merge(abrnch, bus, on="ibus", how="left"),
-    bus.rename(columns={"ibus": "jbus"}),
-    on="jbus",
-    suffixes=("_i", "_j"),
-    how="left",
-)
-
-
-# fixing the ratings that are unreasonably large
-allbranches.loc[
-    (allbranches["rate1"] >= 8888)
-    | (allbranches["rate2"] >= 8888)
-    | (allbranches["rate3"] >= 8888),
-    ["rate1", "rate2", "rate3"],
-] = 0
-
-# sorting branches, the from is always the smaller bus number; XXX messes up the areas
-# allbranches["fromto"] = tuple(zip(allbranches["ibus"], allbranches["jbus"]))
-# allbranches = allbranches.drop(columns=["ibus", "jbus"])
-# allbranches["fromto"] = allbranches["fromto"].apply(lambda x: sorted(x))
-# allbranches[["ibus", "jbus"]] = pd.DataFrame(allbranches["fromto"].tolist(), index=allbranches.index)
-# allbranches = allbranches.drop(columns=["fromto"])
-
-allbrancheson = allbranches.loc[
-    (allbranches["ide_i"] != 4) & (allbranches["ide_j"] != 4), :
-]
-
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ####################################Calculate substation capacties############################# #
-# ############################################################################################### #
-# ############################################################################################### #
-buscapc = calc_buscap(allbranches, buson)
-
-# ############################################################################################### #
-# #####################################tie-lines################################################# #
-# ############################################################################################### #
-ties = allbrancheson.loc[
-    (
-        (allbrancheson["area_i"].isin(INTERNALS))
-        & ~(allbrancheson["area_j"].isin(INTERNALS))
-    )
-    | (
-        ~(allbrancheson["area_i"].isin(INTERNALS))
-        & (allbrancheson["area_j"].isin(INTERNALS))
-    )
-]
-border_buses_i = ties.loc[ties["area_i"].isin(INTERNALS), "ibus"]
-border_buses_j = ties.loc[ties["area_j"].isin(INTERNALS), "jbus"]
-
-border_buses_tot = border_buses_i.tolist() + border_buses_j.tolist()
-
-# here we are filtering the border buses, should we?
-border_buses_f = buscapc.loc[buscapc["ibus"].isin(border_buses_tot)]
-border_buses_final = border_buses_f.loc[
-    (border_buses_f["count"] > CONLIM)
-    & (border_buses_f["baskv"] >= KVLIM)
-    & (border_buses_f["cap"] > CAPLIM)
-]
-border_buses = (
-    border_buses_final["ibus"].tolist()
-    # + ties.loc[(ties["area_i"].isin(INTERNALS)) & (ties["isdc"] == 1), "ibus"].tolist()
-    # + ties.loc[(ties["area_j"].isin(INTERNALS)) & (ties["isdc"] == 1), "jbus"].tolist()
-)
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-# XXX this gives a lot of lines and buses; we may need to filter them
-# border and adjacent dataframe Note that this is for the internal areas only
-badf = allbrancheson.loc[
-    (allbrancheson["area_i"] != allbrancheson["area_j"])
-    & (allbrancheson["area_i"].isin(INTERNALS))
-    & (allbrancheson["area_j"].isin(INTERNALS))
-    & (allbrancheson["baskv_i"] > 115)
-    & (allbrancheson["baskv_j"] > 115)
-    & (allbrancheson["isdc"] == 0),
-    :,
-]
-badf_i = badf.loc[:, "ibus"].tolist()
-badf_j = badf.loc[:, "jbus"].tolist()
-
-border_buses_adjacent = badf_i + badf_j
-
-badf.to_csv("internaltielines.csv", index=False)
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-# #######################################Identifying retained buses############################## #
-# ############################################################################################### #
-# retained buses are the followings:
-# 1- based on their capacities, connected lines, voltage kV, etc
-# 2- internal tie-lines (disabled for now)
-# 3- POIs
-# 4- Some lines I have manually selected (bothe ends and all buses connected to one end)
-# 5- some lines I am automatically selecting based on kv etc and I keep their buses at one terminal
-# 6- generator buses (high side of the transformer)
-# 7- PAR buses - I am going to add this, both PAR terminals and all connected buses to one terminal
-# ############################################################################################### #
-# ############################################################################################### #
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ##############Identifying PARs################################################################# #
-# ############################################################################################### #
-# ############################################################################################### #
-
-PARs = trans2wdf.loc[(trans2wdf["cod1"].isin([-3, 3])) & (trans2wdf["stat"]) == 1]
-
-# adding voltage and area to the branches
-PARskV = pd.merge(
-    pd.merge(PARs, bus[["ibus", "area", "baskv"]], on="ibus", how="left"),
-    bus[["ibus", "area", "baskv"]].rename(columns={"ibus": "jbus"}),
-    on="jbus",
-    suffixes=("_i", "_j"),
-    how="left",
-)
-# fileter PARs
-PARsSel = PARskV.loc[
-    (PARskV["area_i"] == PARskV["area_j"])
-    & (PARskV["area_i"].isin(INTERNALS))
-    & (PARskV["baskv_i"] > 137)
-]
-
-# we need to remove the PARs from the branches at the end
-PARsSel.drop(columns=['area_i', 'area_j', 'baskv_i', 'baskv_j']).to_excel('PARsRetained.xlsx', index=False)
-
-buses2keep = PARsSel["ibus"]
-
-PARsOneEnd = allbrancheson.loc[
-    (allbrancheson["ibus"].isin(buses2keep)) | (allbrancheson["jbus"].isin(buses2keep)),
-    ["ibus", "jbus"],
-]
-
-PARbuses2ret = list(
-    set(
-        PARsSel["ibus"].tolist()
-        + PARsSel["jbus"].tolist()
-        + PARsOneEnd["ibus"].tolist()
-        + PARsOneEnd["jbus"].tolist()
-    )
-)
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ##############Identifying PARs################################################################# #
-# ############################################################################################### #
-# ############################################################################################### #
-
-
-res = {}
-# for nc in [2,3,4,5]:
-# for nc in [7]:
-for nc in [CONLIM]:
-    # for bc in [500, 1000, 1500, 2000, 2500]:
-    # for bc in [7500]:
-    for bc in [CAPLIM]:
-        select_area = buscapc["area"].isin(INTERNALS)
-        select_basekv = buscapc["baskv"] >= KVLIM
-        select_con = buscapc["count"] > nc
-        select_cap = buscapc["cap"] > bc
-        retbus = buscapc.loc[
-            select_area & select_basekv & select_con & select_cap, "ibus"
-        ].tolist()
-        res[(nc, bc)] = (len(retbus), len(set(retbus).intersection(border_buses)))
-        print(len(retbus), len(set(retbus).intersection(border_buses)))
-
-
-POIs = []
-POIs = [ 110759, 119194, 119209, 114734, 111134, 110783, 111809, 119077, 113951, 111217, 117314, 117001, 117301,
-    113952, 114417, 117496, 119709, 119480, 104127, 111202, 111204, 104079, 100002, 100086, 100087, 100088, 100098, 107000, 119064,
-    119389, 123630, 111193, 111133, 110786, 110756, 128284, 126297, 126294, 125001, 126291, 126281, 126298, 126266, 126287, 126644, 126645, 126304,
-    126641, 126353, 126847, 126642, 126643, 126283, 129868, 129421, 129202, 129692,
-    129341, 129310, 128835, 129355, 128822, 232012, 206294, 206302, 200017, 200006, 200014, 227900,
-    232268, 232006, 232124, 227040, 304463, 304453, 304039, 370635, 371605, 312807, 312719, 314909, 314481,
-]
-myRETBUSES = [
-    [147827, 147828, 147833],  # 765 kV NYISO 5115 MW
-    [114063, 104135, 104128],  # 345 kV ISO NE 2550 MW
-    [243209, 247133, 243239],  # 765 kV PJM  6330 MW Area 205
-    [304183, 314935, 314940, 314936, 314945],  # 500 kV SC
-    [270730, 270928, 270716, 272794], # this is the problematic line in area 222
-]
-
-specretlines = sum(myRETBUSES, []) # specific retained lines
-
-retlines = pd.DataFrame([(k[0], k[1]) for k in myRETBUSES], columns=["ibus", "jbus"])
-
-intretlines = allbrancheson.loc[
-    (allbrancheson["baskv_i"] == allbrancheson["baskv_j"])  # no transformers
-    & (allbrancheson["area_i"] == allbrancheson["area_j"])  # in one area
-    & (allbrancheson["baskv_i"] > 300)  # above 200 kv
-    & (allbrancheson["rate1"] > 2000)  # rate > 200 MW
-    & (allbrancheson["rate1"] < 3000)  # remove inaccurate data
-    & (allbrancheson["isac"] == 1)  # only ac lines
-    & (allbrancheson["isin_i"] == 1)  # not outside study area
-]
-allintretlines = pd.concat([intretlines[['ibus','jbus']],retlines])
-allintretlines.to_csv("intretlines.csv")
-
-# take one end of the linse
-buses2keep = intretlines["ibus"].tolist()
-
-# find connecting buses
-intretlinesoneend = allbrancheson.loc[
-    (allbrancheson["ibus"].isin(buses2keep)) | (allbrancheson["jbus"].isin(buses2keep)),
-    ["ibus", "jbus"],
-]
-intretlinebuses2ret = list(
-    set(
-        intretlinesoneend["ibus"].tolist()
-        + intretlinesoneend["jbus"].tolist()
-        + intretlines["ibus"].tolist()
-        + intretlines["jbus"].tolist()
-    )
-)
-
-# ############################################################################################### #
-# ############################################################################################### #
-# #####################################Generation Buses########################################## #
-# ############################################################################################### #
-# ############################################################################################### #
-# note that some generators are directly connectedto buses without a transformer
-gensarea = pd.merge(
-    gens[["ibus", "mbase"]], buscapc[["ibus", "area"]], on="ibus", how="left"
-)
-# all gen buses (this will be low-side of the transformers)
-GENCAPTHD = 500
-gens100mw = gensarea.loc[
-    (gensarea["area"].isin(INTERNALS)) & (gensarea["mbase"] > GENCAPTHD), :
-]
-gensbuses = gens100mw.loc[:, "ibus"].tolist()
-
-# adding voltage base to buses
-t2w = trans2wdf[["ibus", "jbus"]]
-t2w = pd.merge(
-    pd.merge(t2w, buscapc[["ibus", "baskv"]], on="ibus").rename(
-        columns={"baskv": "kvi"}
-    ),
-    buscapc[["ibus", "baskv"]].rename(columns={"ibus": "jbus"}),
-    on="jbus",
-).rename(columns={"baskv": "kvj"})
-
-t2w.loc[:, ["geni", "genj", "igj"]] = 0
-t2w.loc[t2w["ibus"].isin(gensbuses), "geni"] = 1
-t2w.loc[t2w["jbus"].isin(gensbuses), "genj"] = 1
-t2w.loc[t2w["kvi"] >= t2w["kvj"], "igj"] = 1
-highside = t2w.loc[(t2w["genj"] == 1) & (t2w["igj"] == 1), "ibus"].tolist()
-lowside = t2w.loc[(t2w["genj"] == 1) & (t2w["igj"] == 1), "jbus"].tolist()
-
-gensbusesfinal = list(set(gensbuses) - set(lowside)) + highside
-
-# ############################################################################################### #
-# ############################################################################################### #
-# ###################################All Retained Buses########################################## #
-# ############################################################################################### #
-# ############################################################################################### #
-
-retainedbuses = list(
-    set(
-        gensbusesfinal  # all generator buses
-        + retbus  # based on the capacity and voltage
-        + POIs  # the POIs
-        # + specretlines  # specific lines I am retaining; really don't need though
-        # + intretlinebuses2ret  # internal lines to retain
-        # + border_buses # this is before filtering; all boundry buses
-        # + border_buses_adjacent
-        # + PARbuses2ret  # PAR buses and attached lines
-    )
-)
-print(f'generator buses {len(gensbusesfinal)}')
-print(f'retained buses based on capacity {len(retbus)}')
-print(f'POIs {len(POIs)}')
-print(f'specific retained lines {len(specretlines)}')
-print(f'internal retained lines {len(intretlinebuses2ret)}')
-print(f'boundry buses {len(border_buses_tot)}')
-print(f'buses for PARs {len(PARbuses2ret)}')
-
-# retainedbuses = list(set(retbus))
-# print(len(list(set(retbus))))
-
-print(f"total of retained buses is {len(retainedbuses)}")
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-# ####################################Writing files############################################## #
-# ############################################################################################### #
-# ############################################################################################### #
-# ############################################################################################### #
-
-pd.DataFrame(retainedbuses).to_csv(
-    "../matpower7.1/retainedbuses.csv", index=False, header=False
-)
-buscapc.to_csv("allbuses.csv", index=False)
-
-# eliminated buses
-
-
-# go to MATLAB and run the code there
-# The results are written two files:
-# 1) Y_eq.csv which gives us the lines 2) LF.csv which is the load fraction matrix
-
-import ipdb
-
-ipdb.set_trace()
+if __name__ == '__main__':
+    from grg_pssedata.reduction import build_cli_parser as build_reduction_cli_parser
+    from grg_pssedata.reduction import main
+    parser = build_reduction_cli_parser()
+    main(parser.parse_args())
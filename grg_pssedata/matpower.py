@@ -0,0 +1,285 @@
+'''export of a parsed psse case to the MATPOWER case format, with the
+MATPOWER matrices built and written column by column'''
+
+import collections
+
+import numpy as np
+import pandas as pd
+
+from grg_pssedata.reduction import fix_tt_dc
+from grg_pssedata.tables import BusNumbering
+from grg_pssedata.tables import format_floats
+
+# the columns of each MATPOWER matrix, in the names of the MATPOWER manual
+BUS_COLUMNS = ['bus_i', 'type', 'Pd', 'Qd', 'Gs', 'Bs', 'area', 'Vm', 'Va', 'baseKV', 'zone', 'Vmax', 'Vmin']
+GEN_COLUMNS = ['bus', 'Pg', 'Qg', 'Qmax', 'Qmin', 'Vg', 'mBase', 'status', 'Pmax', 'Pmin']
+BRANCH_COLUMNS = ['fbus', 'tbus', 'r', 'x', 'b', 'rateA', 'rateB', 'rateC', 'ratio', 'angle', 'status', 'angmin', 'angmax']
+DCLINE_COLUMNS = ['fbus', 'tbus', 'status', 'Pf', 'Pt', 'Qf', 'Qt', 'Vf', 'Vt', 'Pmin', 'Pmax',
+    'QminF', 'QmaxF', 'QminT', 'QmaxT', 'loss0', 'loss1']
+
+# the three winding transformer status values (see ThreeWindingTransformer)
+# that leave each winding in service
+TRANSFORMER3W_WINDINGS = [(1, [1, 2, 3]), (2, [1, 3, 4]), (3, [1, 2, 4])]
+
+MatpowerCase = collections.namedtuple('MatpowerCase', ['base_mva', 'bus', 'gen', 'branch', 'dcline'])
+
+
+def _values(table, column, default=0.0):
+    if column not in table.columns:
+        return np.full(len(table), default, dtype=np.float64)
+    return pd.to_numeric(table[column], errors='coerce').fillna(default).to_numpy(dtype=np.float64)
+
+
+def _bus_indexes(numbering, table, name, column):
+    # the dense indexes of a bus column, whose buses must be in the case
+    bus_numbers = np.asarray(table[column], dtype=np.int64)
+    dense = numbering.to_dense(bus_numbers)
+    if (dense < 0).any():
+        raise ValueError('{} {} refers to bus {}, which is not in the bus table'.format(
+            name, column, bus_numbers[dense < 0][0]))
+    return dense
+
+
+def _winding_tap(windv, nomv, cw, basekv):
+    # the ratio of a winding in pu of its bus base voltage, nomv of 0 is
+    # the bus base voltage
+    nomv = np.where(nomv == 0, basekv, nomv)
+    return np.select([cw == 2, cw == 3], [windv/basekv, windv*nomv/basekv], windv)
+
+
+def _impedance(r, x, cz, winding_mva, sbase):
+    # the impedance of a winding pair in pu on the system base, for each
+    # impedance code
+    winding_mva = np.where(winding_mva > 0, winding_mva, sbase)
+    r_loss = r/1e6/winding_mva
+    x_loss = np.sqrt(np.maximum(x*x - r_loss*r_loss, 0.0))
+    r = np.select([cz == 2, cz == 3], [r, r_loss], r)
+    x = np.select([cz == 2, cz == 3], [x, x_loss], x)
+    scale = np.where(cz == 1, 1.0, sbase/winding_mva)
+    return r*scale, x*scale
+
+
+def _magnetizing(table, sbase):
+    # the magnetizing admittance of transformers in MW and Mvar at 1 pu
+    mag1, mag2 = _values(table, 'mag1'), _values(table, 'mag2')
+    cm = _values(table, 'cm', 1)
+    winding_mva = _values(table, 'sbase1_2', sbase)
+    winding_mva = np.where(winding_mva > 0, winding_mva, sbase)
+    g = np.where(cm == 2, mag1/1e6, mag1*sbase)
+    y = mag2*winding_mva
+    b = np.where(cm == 2, -np.sqrt(np.maximum(y*y - g*g, 0.0)), mag2*sbase)
+    return g, b
+
+
+def _branches(fbus, tbus, r, x, b, rates, tap, shift, status):
+    rows = len(fbus)
+    return np.column_stack([fbus, tbus, r, x, b, rates[0], rates[1], rates[2], tap, shift,
+        status, np.full(rows, -360.0), np.full(rows, 360.0)])
+
+
+def case_matpower(case):
+    '''builds the MATPOWER matrices of a parsed case.  Loads, fixed shunts,
+    the initial admittance of switched shunts, the bus ends of line shunts
+    and the magnetizing admittance of transformers are summed into the bus
+    demand and shunt columns.  Transformers keep their off-nominal ratio
+    and phase shift on the from side.  Each three winding transformer gets
+    a star bus, numbered after the highest bus, and one branch per winding.
+    Two terminal and voltage source converter dc lines become dc lines.
+    FACTS devices are not exported.  A ValueError is raised when a
+    transformer or a dc line refers to a bus that is not in the bus table.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns:
+        MatpowerCase: the system base and the bus, gen, branch and dcline
+        matrices, with the columns of BUS_COLUMNS, GEN_COLUMNS,
+        BRANCH_COLUMNS and DCLINE_COLUMNS
+    '''
+
+    sbase = float(case.header.sbase)
+    bus = case.bus
+    trans3w = case.transformer3w
+    ibus = bus['ibus'].to_numpy(dtype=np.int64)
+    star = (ibus.max() if len(ibus) > 0 else 0) + 1 + np.arange(len(trans3w))
+    numbering = BusNumbering(np.concatenate([ibus, star]))
+    basekv = np.concatenate([_values(bus, 'baskv'), np.ones(len(star))])
+    vm = np.concatenate([_values(bus, 'vm', 1.0), _values(trans3w, 'vmstar', 1.0)])
+    va = np.concatenate([_values(bus, 'va'), _values(trans3w, 'anstar')])
+
+    buses = len(numbering)
+    demand = np.zeros((4, buses))
+
+    def add(row, bus_numbers, values):
+        dense = numbering.to_dense(bus_numbers)
+        known = dense >= 0
+        demand[row] += np.bincount(dense[known], weights=np.asarray(values, dtype=np.float64)[known], minlength=buses)
+
+    # loads at nominal voltage
+    load = case.load.loc[_values(case.load, 'stat', 1) != 0]
+    add(0, load['ibus'], _values(load, 'pl') + _values(load, 'ip') + _values(load, 'yp'))
+    add(1, load['ibus'], _values(load, 'ql') + _values(load, 'iq') - _values(load, 'yq'))
+
+    fixshunt = case.fixshunt.loc[_values(case.fixshunt, 'stat', 1) != 0]
+    add(2, fixshunt['ibus'], _values(fixshunt, 'gl'))
+    add(3, fixshunt['ibus'], _values(fixshunt, 'bl'))
+
+    swshunt = case.swshunt.loc[_values(case.swshunt, 'stat', 1) != 0]
+    add(3, swshunt['ibus'], _values(swshunt, 'binit'))
+
+    acline = case.acline
+    on = _values(acline, 'stat', 1) != 0
+    for end, g, b in (('ibus', 'gi', 'bi'), ('jbus', 'gj', 'bj')):
+        add(2, acline[end][on], _values(acline, g)[on]*sbase)
+        add(3, acline[end][on], _values(acline, b)[on]*sbase)
+
+    gen = case.generator
+    gen_matrix = np.column_stack([_values(gen, 'ibus'), _values(gen, 'pg'), _values(gen, 'qg'),
+        _values(gen, 'qt'), _values(gen, 'qb'), _values(gen, 'vs', 1.0), _values(gen, 'mbase', sbase),
+        (_values(gen, 'stat', 1) != 0).astype(np.float64), _values(gen, 'pt'), _values(gen, 'pb')])
+
+    branches = [_branches(_values(acline, 'ibus'), _values(acline, 'jbus'), _values(acline, 'rpu'),
+        _values(acline, 'xpu'), _values(acline, 'bpu'), [_values(acline, 'rate%d' % i) for i in (1, 2, 3)],
+        np.zeros(len(acline)), np.zeros(len(acline)), on.astype(np.float64))]
+
+    # two winding transformers, with the ratio of winding 2 moved to the from side
+    trans2w = case.transformer2w
+    kv_i = basekv[_bus_indexes(numbering, trans2w, 'transformer2w', 'ibus')]
+    kv_j = basekv[_bus_indexes(numbering, trans2w, 'transformer2w', 'jbus')]
+    cw = _values(trans2w, 'cw', 1)
+    tap1 = _winding_tap(_values(trans2w, 'windv1', 1.0), _values(trans2w, 'nomv1'), cw, kv_i)
+    tap2 = _winding_tap(_values(trans2w, 'windv2', 1.0), _values(trans2w, 'nomv2'), cw, kv_j)
+    r, x = _impedance(_values(trans2w, 'r1_2'), _values(trans2w, 'x1_2'), _values(trans2w, 'cz', 1),
+        _values(trans2w, 'sbase1_2', sbase), sbase)
+    on = _values(trans2w, 'stat', 1) != 0
+    branches.append(_branches(_values(trans2w, 'ibus'), _values(trans2w, 'jbus'), r*tap2*tap2, x*tap2*tap2,
+        np.zeros(len(trans2w)), [_values(trans2w, 'wdg1rate%d' % i) for i in (1, 2, 3)],
+        tap1/tap2, _values(trans2w, 'ang1'), on.astype(np.float64)))
+    g, b = _magnetizing(trans2w, sbase)
+    add(2, trans2w['ibus'][on], g[on])
+    add(3, trans2w['ibus'][on], b[on])
+
+    # three winding transformers, as a star of one branch per winding
+    cz = _values(trans3w, 'cz', 1)
+    pairs = [_impedance(_values(trans3w, 'r%s' % pair), _values(trans3w, 'x%s' % pair), cz,
+        _values(trans3w, 'sbase%s' % pair, sbase), sbase) for pair in ('1_2', '2_3', '3_1')]
+    (r12, x12), (r23, x23), (r31, x31) = pairs
+    star_r = [(r12 + r31 - r23)/2, (r12 + r23 - r31)/2, (r23 + r31 - r12)/2]
+    star_x = [(x12 + x31 - x23)/2, (x12 + x23 - x31)/2, (x23 + x31 - x12)/2]
+    stat = _values(trans3w, 'stat', 1)
+    cw = _values(trans3w, 'cw', 1)
+    for (winding, in_service), end in zip(TRANSFORMER3W_WINDINGS, ('ibus', 'jbus', 'kbus')):
+        kv = basekv[_bus_indexes(numbering, trans3w, 'transformer3w', end)]
+        tap = _winding_tap(_values(trans3w, 'windv%d' % winding, 1.0), _values(trans3w, 'nomv%d' % winding), cw, kv)
+        branches.append(_branches(_values(trans3w, end), star, star_r[winding - 1], star_x[winding - 1],
+            np.zeros(len(trans3w)), [_values(trans3w, 'wdg%drate%d' % (winding, i)) for i in (1, 2, 3)],
+            tap, _values(trans3w, 'ang%d' % winding), np.isin(stat, in_service).astype(np.float64)))
+    g, b = _magnetizing(trans3w, sbase)
+    on = stat != 0
+    add(2, trans3w['ibus'][on], g[on])
+    add(3, trans3w['ibus'][on], b[on])
+
+    # star buses take the area and zone of the winding 1 bus
+    winding1 = bus.set_index('ibus').reindex(trans3w['ibus'])
+    bus_type = np.concatenate([_values(bus, 'ide', 1), np.where(_values(trans3w, 'stat', 1) == 0, 4, 1)])
+    bus_matrix = np.column_stack([
+        numbering.to_external(np.arange(buses)), bus_type, demand[0], demand[1], demand[2], demand[3],
+        np.concatenate([_values(bus, 'area', 1), _values(winding1, 'area', 1)]), vm, va, basekv,
+        np.concatenate([_values(bus, 'zone', 1), _values(winding1, 'zone', 1)]),
+        np.concatenate([_values(bus, 'nvhi', 1.1), np.full(len(star), 1.1)]),
+        np.concatenate([_values(bus, 'nvlo', 0.9), np.full(len(star), 0.9)]),
+    ])
+
+    dclines = []
+    twotermdc = case.twotermdc
+    if len(twotermdc) > 0:
+        hvdc = fix_tt_dc(twotermdc.copy())
+        pmw = _values(hvdc, 'pmw')
+        rows = len(hvdc)
+        dclines.append(np.column_stack([_values(hvdc, 'ipr'), _values(hvdc, 'ipi'), _values(hvdc, 'stat'),
+            pmw, pmw, np.zeros(rows), np.zeros(rows),
+            vm[_bus_indexes(numbering, hvdc, 'twotermdc', 'ipr')], vm[_bus_indexes(numbering, hvdc, 'twotermdc', 'ipi')],
+            np.zeros(rows), pmw, _values(hvdc, 'qminr'), _values(hvdc, 'qmaxr'),
+            _values(hvdc, 'qmini'), _values(hvdc, 'qmaxi'), np.zeros(rows), np.zeros(rows)]))
+
+    # voltage source converter lines carry the power of the converter in
+    # power control (type 2) and regulate the ac voltage of converters in
+    # voltage control (mode 1)
+    vscdc = case.vscdc
+    if len(vscdc) > 0:
+        rows = len(vscdc)
+        power = np.where(_values(vscdc, 'type1') == 2, _values(vscdc, 'dcset1'), _values(vscdc, 'dcset2'))
+        smax = np.minimum(_values(vscdc, 'smax1'), _values(vscdc, 'smax2'))
+        voltage = [np.where(_values(vscdc, 'mode%d' % i) == 1, _values(vscdc, 'acset%d' % i, 1.0),
+            vm[_bus_indexes(numbering, vscdc, 'vscdc', 'ibus%d' % i)]) for i in (1, 2)]
+        dclines.append(np.column_stack([_values(vscdc, 'ibus1'), _values(vscdc, 'ibus2'),
+            (_values(vscdc, 'mdc') != 0).astype(np.float64), np.abs(power), np.abs(power),
+            np.zeros(rows), np.zeros(rows), voltage[0], voltage[1], np.zeros(rows), smax,
+            _values(vscdc, 'minq1'), _values(vscdc, 'maxq1'), _values(vscdc, 'minq2'), _values(vscdc, 'maxq2'),
+            np.zeros(rows), np.zeros(rows)]))
+
+    if len(dclines) > 0:
+        dcline_matrix = np.concatenate(dclines)
+    else:
+        dcline_matrix = np.zeros((0, len(DCLINE_COLUMNS)))
+
+    return MatpowerCase(sbase, bus_matrix, gen_matrix, np.concatenate(branches), dcline_matrix)
+
+
+def format_matrix(matrix, precision=None):
+    '''formats the rows of a matrix as MATPOWER text, column by column,
+    columns of whole numbers are written without a fraction
+
+    Args:
+        matrix (array): a two dimensional array of floats
+        precision (str): the precision policy of the other columns, see
+            :data:`grg_pssedata.tables.PRECISION_POLICIES`
+    Returns:
+        array: an object array with the text of each row
+    '''
+
+    lines = None
+    for column in np.asarray(matrix, dtype=np.float64).T:
+        if np.all(np.isfinite(column) & (column == np.round(column))):
+            text = column.astype(np.int64).astype(str).astype(object)
+        else:
+            text = format_floats(column, precision).astype(object)
+        lines = text if lines is None else lines + '\t' + text
+    if lines is None:
+        return np.zeros(len(matrix), dtype=object)
+    return '\t' + lines + ';'
+
+
+def write_matpower(case, path, name=None, precision=None):
+    '''writes a parsed case as a MATPOWER case file
+
+    Args:
+        case (CaseTables or MatpowerCase): the tables of a parsed case, or
+            the matrices built by :func:`case_matpower`
+        path (str): the .m file to write
+        name (str): the name of the case function (default = the file name)
+        precision (str): the precision policy of float columns, see
+            :data:`grg_pssedata.tables.PRECISION_POLICIES`
+    '''
+
+    if not isinstance(case, MatpowerCase):
+        case = case_matpower(case)
+    if name is None:
+        name = path.replace('\\', '/').split('/')[-1]
+        if name.endswith('.m'):
+            name = name[:-2]
+
+    with open(path, 'w') as fileobj:
+        fileobj.write('function mpc = {}\n'.format(name))
+        fileobj.write('mpc.version = \'2\';\n')
+        fileobj.write('mpc.baseMVA = {};\n'.format(case.base_mva))
+        for field, columns, matrix in (('bus', BUS_COLUMNS, case.bus), ('gen', GEN_COLUMNS, case.gen),
+                ('branch', BRANCH_COLUMNS, case.branch), ('dcline', DCLINE_COLUMNS, case.dcline)):
+            if field == 'dcline' and len(matrix) == 0:
+                continue
+            fileobj.write('\n%% {} data\n%\t{}\n'.format(field, '\t'.join(columns)))
+            fileobj.write('mpc.{} = [\n'.format(field))
+            lines = format_matrix(matrix, precision)
+            if len(lines) > 0:
+                fileobj.write('\n'.join(lines.tolist()))
+                fileobj.write('\n')
+            fileobj.write('];\n')
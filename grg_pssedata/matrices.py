@@ -0,0 +1,236 @@
+'''the sparse network matrices of a parsed psse case, such as the bus
+admittance matrix, in compressed sparse row (CSR) form, with writers for the
+MatrixMarket and scipy npz formats'''
+
+import collections
+import os
+
+import numpy as np
+
+from grg_pssedata.matpower import case_matpower
+from grg_pssedata.tables import BusNumbering
+from grg_pssedata.tables import format_floats
+
+NetworkMatrices = collections.namedtuple('NetworkMatrices',
+    ['bus_numbers', 'branch_buses', 'incidence', 'yf', 'yt', 'ybus'])
+
+# the value type of a MatrixMarket file for each numpy dtype kind
+MTX_FIELDS = {'b': 'integer', 'i': 'integer', 'u': 'integer', 'f': 'real', 'c': 'complex'}
+
+
+class CSRMatrix(object):
+    def __init__(self, data, indices, indptr, shape):
+        '''This data structure is a sparse matrix in compressed sparse row
+        form, with the array layout of scipy.sparse.csr_matrix.
+
+        Args:
+            data (array): the nonzero values, row by row
+            indices (array): the column of each value
+            indptr (array): the position in data of the first value of
+                each row, and the number of values at the end
+            shape (tuple): the number of rows and columns
+        '''
+
+        self.data = np.asarray(data)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int32)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @classmethod
+    def from_coo(cls, rows, columns, values, shape):
+        '''builds a matrix from coordinates, values at the same position are summed
+
+        Args:
+            rows (array): the row of each value
+            columns (array): the column of each value
+            values (array): the values
+            shape (tuple): the number of rows and columns
+        Returns:
+            CSRMatrix: the matrix
+        '''
+
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        values = np.asarray(values)
+        keys, inverse = np.unique(rows*shape[1] + columns, return_inverse=True)
+        data = np.zeros(len(keys), dtype=values.dtype)
+        np.add.at(data, inverse, values)
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // max(shape[1], 1), minlength=shape[0]), out=indptr[1:])
+        return cls(data, keys % max(shape[1], 1), indptr, shape)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __str__(self):
+        return 'sparse matrix of {}x{} with {} values'.format(self.shape[0], self.shape[1], len(self))
+
+    def rows(self):
+        '''Returns: the row of each value'''
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def toarray(self):
+        '''Returns: the matrix as a dense array'''
+        array = np.zeros(self.shape, dtype=self.data.dtype)
+        np.add.at(array, (self.rows(), self.indices), self.data)
+        return array
+
+
+def network_matrices(case):
+    '''builds the sparse network matrices of a case with the branch model of
+    MATPOWER, from the branches of :func:`grg_pssedata.matpower.case_matpower`,
+    so three winding transformers are star expanded.  Branches that are out
+    of service and dc lines are left out.  A ValueError is raised when a
+    branch refers to a bus that is not in the bus table.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns:
+        NetworkMatrices: the bus numbers of the matrix columns, the from
+        and to bus numbers of the rows of the branch matrices, the branch
+        to bus incidence matrix (1 at the from bus and -1 at the to bus),
+        the from and to end branch admittance matrices and the bus
+        admittance matrix, in per unit
+    '''
+
+    mpc = case_matpower(case)
+    numbering = BusNumbering(mpc.bus[:, 0].astype(np.int64))
+    buses = len(numbering)
+    branch = mpc.branch[mpc.branch[:, 10] != 0]
+    rows = np.arange(len(branch))
+    fbus = numbering.to_dense(branch[:, 0].astype(np.int64))
+    tbus = numbering.to_dense(branch[:, 1].astype(np.int64))
+    unknown = (fbus < 0) | (tbus < 0)
+    if unknown.any():
+        row = np.flatnonzero(unknown)[0]
+        bus = branch[row, 0] if fbus[row] < 0 else branch[row, 1]
+        raise ValueError('the branch from bus {:d} to bus {:d} refers to bus {:d}, which is not in the bus table'.format(
+            int(branch[row, 0]), int(branch[row, 1]), int(bus)))
+
+    ys = 1/(branch[:, 2] + 1j*branch[:, 3])
+    bc = branch[:, 4]
+    tap = np.where(branch[:, 8] == 0, 1.0, branch[:, 8])*np.exp(1j*np.deg2rad(branch[:, 9]))
+    ytt = ys + 1j*bc/2
+    yff = ytt/(tap*np.conj(tap))
+    yft = -ys/np.conj(tap)
+    ytf = -ys/tap
+
+    shape = (len(branch), buses)
+    incidence = CSRMatrix.from_coo(np.concatenate([rows, rows]), np.concatenate([fbus, tbus]),
+        np.concatenate([np.ones(len(rows), dtype=np.int8), -np.ones(len(rows), dtype=np.int8)]), shape)
+    yf = CSRMatrix.from_coo(np.concatenate([rows, rows]), np.concatenate([fbus, tbus]), np.concatenate([yff, yft]), shape)
+    yt = CSRMatrix.from_coo(np.concatenate([rows, rows]), np.concatenate([fbus, tbus]), np.concatenate([ytf, ytt]), shape)
+
+    # Ybus = Cf' Yf + Ct' Yt + diag(Ysh), summed from the coordinates of the
+    # four admittances of each branch
+    ysh = (mpc.bus[:, 4] + 1j*mpc.bus[:, 5])/mpc.base_mva
+    ybus = CSRMatrix.from_coo(np.concatenate([fbus, fbus, tbus, tbus, np.arange(buses)]),
+        np.concatenate([fbus, tbus, fbus, tbus, np.arange(buses)]),
+        np.concatenate([yff, yft, ytf, ytt, ysh]), (buses, buses))
+
+    return NetworkMatrices(numbering.to_external(np.arange(buses)), branch[:, :2].astype(np.int64),
+        incidence, yf, yt, ybus)
+
+
+def bus_partition(bus_numbers, retained):
+    '''splits the buses of the network matrices into retained and eliminated buses
+
+    Args:
+        bus_numbers (array): the bus numbers of the matrix columns
+        retained (list): the numbers of the retained buses, numbers that
+            are not buses of the network are ignored
+    Returns (tuple):
+        the sorted column indexes of the retained and of the eliminated buses
+    '''
+
+    kept = np.isin(bus_numbers, np.asarray(list(retained), dtype=np.int64))
+    return np.flatnonzero(kept), np.flatnonzero(~kept)
+
+
+def write_mtx(matrix, path):
+    '''writes a matrix, or a vector as a one column array, in the MatrixMarket format
+
+    Args:
+        matrix (CSRMatrix or array): the matrix or vector
+        path (str): the .mtx file to write
+    '''
+
+    with open(path, 'w') as fileobj:
+        if isinstance(matrix, CSRMatrix):
+            field = MTX_FIELDS[matrix.data.dtype.kind]
+            fileobj.write('%%MatrixMarket matrix coordinate {} general\n'.format(field))
+            fileobj.write('{} {} {}\n'.format(matrix.shape[0], matrix.shape[1], len(matrix)))
+            rows, columns, data = matrix.rows() + 1, matrix.indices + 1, matrix.data
+        else:
+            data = np.asarray(matrix)
+            field = MTX_FIELDS[data.dtype.kind]
+            fileobj.write('%%MatrixMarket matrix array {} general\n'.format(field))
+            fileobj.write('{} 1\n'.format(len(data)))
+            rows = columns = None
+
+        if field == 'complex':
+            text = _mtx_values(data.real) + ' ' + _mtx_values(data.imag)
+        else:
+            text = _mtx_values(data)
+        if rows is not None:
+            text = rows.astype(str).astype(object) + ' ' + columns.astype(str).astype(object) + ' ' + text
+        if len(text) > 0:
+            fileobj.write('\n'.join(text.tolist()))
+            fileobj.write('\n')
+
+
+def _mtx_values(values):
+    if values.dtype.kind in 'biu':
+        return values.astype(np.int64).astype(str).astype(object)
+    return format_floats(values.astype(np.float64)).astype(object)
+
+
+def save_npz(matrix, path):
+    '''writes a matrix in the npz layout of scipy.sparse.save_npz, so that
+    scipy.sparse.load_npz reads it as a csr matrix
+
+    Args:
+        matrix (CSRMatrix): the matrix
+        path (str): the .npz file to write
+    '''
+
+    np.savez(path, format=np.array(b'csr'), shape=np.array(matrix.shape),
+        data=matrix.data, indices=matrix.indices, indptr=matrix.indptr)
+
+
+def export_matrices(case, retained, directory, formats=('mtx', 'npz')):
+    '''writes the network matrices of a case and the retained and eliminated
+    bus indexes of a network reduction, one file per matrix or vector.  The
+    bus indexes are 1-based in .mtx files, for MATLAB, and 0-based in the
+    buses.npz file, for numpy.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        retained (list): the numbers of the retained buses
+        directory (str): the directory to write the files to
+        formats (tuple): the formats to write, mtx and/or npz
+    Returns:
+        NetworkMatrices: the matrices that were written
+    '''
+
+    matrices = network_matrices(case)
+    kept, eliminated = bus_partition(matrices.bus_numbers, retained)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    for name in ('incidence', 'yf', 'yt', 'ybus'):
+        matrix = getattr(matrices, name)
+        if 'mtx' in formats:
+            write_mtx(matrix, os.path.join(directory, name + '.mtx'))
+        if 'npz' in formats:
+            save_npz(matrix, os.path.join(directory, name + '.npz'))
+
+    if 'mtx' in formats:
+        write_mtx(matrices.bus_numbers, os.path.join(directory, 'buses.mtx'))
+        write_mtx(kept + 1, os.path.join(directory, 'retained.mtx'))
+        write_mtx(eliminated + 1, os.path.join(directory, 'eliminated.mtx'))
+    if 'npz' in formats:
+        np.savez(os.path.join(directory, 'buses.npz'), bus_numbers=matrices.bus_numbers,
+            branch_buses=matrices.branch_buses, retained=kept, eliminated=eliminated)
+
+    return matrices
@@ -0,0 +1,163 @@
+'''export of a parsed psse case to the network data format of PowerModels,
+encoded as json a chunk of components at a time'''
+
+import json
+
+import numpy as np
+
+from grg_pssedata.matpower import case_matpower
+from grg_pssedata.matpower import _magnetizing
+from grg_pssedata.matpower import _values
+from grg_pssedata.tables import format_floats
+
+# the bounds PowerModels corrects unbounded angle differences to
+ANGLE_LIMIT = np.pi/3
+
+
+def _json_text(values, kind):
+    # the json text of an array of values of one kind, int, float, bool or str
+    if kind == 'str':
+        return np.array([json.dumps(str(value)) for value in values], dtype=object)
+    values = np.asarray(values)
+    if kind == 'bool':
+        return np.where(values != 0, 'true', 'false').astype(object)
+    if kind == 'int':
+        return values.astype(np.int64).astype(str).astype(object)
+    values = values.astype(np.float64)
+    text = format_floats(values).astype(object)
+    text[~np.isfinite(values)] = 'null'
+    return text
+
+
+def write_components(fileobj, component, fields, chunk_rows=10000):
+    '''writes one component dictionary of a network as json, a chunk of
+    components at a time, with the components keyed by their index
+
+    Args:
+        fileobj: a file opened for writing text
+        component (str): the name of the dictionary, such as 'bus'
+        fields (list): the (name, kind, values) of each field, kind is one
+            of int, float, bool or str and values is an array with one
+            value per component
+        chunk_rows (int): the most components encoded per write
+    '''
+
+    rows = len(fields[0][2]) if len(fields) > 0 else 0
+    fileobj.write('"{}": {{'.format(component))
+    index = np.arange(1, rows + 1)
+    for start in range(0, rows, chunk_rows):
+        stop = min(start + chunk_rows, rows)
+        chunk_index = index[start:stop].astype(str).astype(object)
+        text = '\n"' + chunk_index + '": {"index": ' + chunk_index
+        for name, kind, values in fields:
+            text = text + ', "{}": '.format(name) + _json_text(values[start:stop], kind)
+        fileobj.write(('},' if start > 0 else '') + '},'.join(text.tolist()))
+    fileobj.write('}\n}' if rows > 0 else '}')
+
+
+def network_components(case):
+    '''builds the columns of the components of a PowerModels network in
+    per unit, with angles in radians.  Buses, generators, branches and dc
+    lines are those of :func:`grg_pssedata.matpower.case_matpower`, so
+    three winding transformers are star expanded.  Each load, fixed shunt
+    and switched shunt of the case is a load or shunt of the network, and
+    line and magnetizing admittances are the shunts of the branches.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns (list):
+        the (component, fields) of each component dictionary, see
+        :func:`write_components`
+    '''
+
+    mpc = case_matpower(case)
+    sbase = mpc.base_mva
+    bus, gen, branch, dcline = mpc.bus, mpc.gen, mpc.branch, mpc.dcline
+
+    names = np.full(len(bus), '', dtype=object)
+    names[:len(case.bus)] = case.bus['name'].astype(str).str.strip().to_numpy(dtype=object)
+
+    load = case.load
+    fixshunt = case.fixshunt
+    swshunt = case.swshunt
+
+    # the shunts of each branch, in the order of the branch matrix
+    acline = case.acline
+    trans2w = case.transformer2w
+    trans3w = case.transformer3w
+    g2, b2 = _magnetizing(trans2w, sbase)
+    g3, b3 = _magnetizing(trans3w, sbase)
+    star = np.zeros(2*len(trans3w))
+    g_fr = np.concatenate([_values(acline, 'gi'), g2/sbase, g3/sbase, star])
+    b_fr = np.concatenate([_values(acline, 'bi'), b2/sbase, b3/sbase, star])
+    g_to = np.concatenate([_values(acline, 'gj'), np.zeros(len(trans2w) + 3*len(trans3w))])
+    b_to = np.concatenate([_values(acline, 'bj'), np.zeros(len(trans2w) + 3*len(trans3w))])
+    half_b = branch[:, 4]/2
+    lines = len(acline)
+    transformer = np.arange(len(branch)) >= lines
+    tap = np.where(transformer, branch[:, 8], 1.0)
+
+    # the to end of a dc line takes its power with the opposite sign
+    loss0, loss1 = dcline[:, 15]/sbase, dcline[:, 16]
+    pminf, pmaxf = dcline[:, 9]/sbase, dcline[:, 10]/sbase
+
+    return [
+        ('bus', [('bus_i', 'int', bus[:, 0]), ('bus_type', 'int', bus[:, 1]), ('vm', 'float', bus[:, 7]),
+            ('va', 'float', np.deg2rad(bus[:, 8])), ('vmax', 'float', bus[:, 11]), ('vmin', 'float', bus[:, 12]),
+            ('base_kv', 'float', bus[:, 9]), ('area', 'int', bus[:, 6]), ('zone', 'int', bus[:, 10]),
+            ('name', 'str', names)]),
+        ('load', [('load_bus', 'int', _values(load, 'ibus')),
+            ('pd', 'float', (_values(load, 'pl') + _values(load, 'ip') + _values(load, 'yp'))/sbase),
+            ('qd', 'float', (_values(load, 'ql') + _values(load, 'iq') - _values(load, 'yq'))/sbase),
+            ('status', 'int', _values(load, 'stat', 1) != 0)]),
+        ('shunt', [('shunt_bus', 'int', np.concatenate([_values(fixshunt, 'ibus'), _values(swshunt, 'ibus')])),
+            ('gs', 'float', np.concatenate([_values(fixshunt, 'gl'), np.zeros(len(swshunt))])/sbase),
+            ('bs', 'float', np.concatenate([_values(fixshunt, 'bl'), _values(swshunt, 'binit')])/sbase),
+            ('status', 'int', np.concatenate([_values(fixshunt, 'stat', 1), _values(swshunt, 'stat', 1)]) != 0)]),
+        ('gen', [('gen_bus', 'int', gen[:, 0]), ('pg', 'float', gen[:, 1]/sbase), ('qg', 'float', gen[:, 2]/sbase),
+            ('qmax', 'float', gen[:, 3]/sbase), ('qmin', 'float', gen[:, 4]/sbase), ('vg', 'float', gen[:, 5]),
+            ('mbase', 'float', gen[:, 6]), ('gen_status', 'int', gen[:, 7]), ('pmax', 'float', gen[:, 8]/sbase),
+            ('pmin', 'float', gen[:, 9]/sbase)]),
+        ('branch', [('f_bus', 'int', branch[:, 0]), ('t_bus', 'int', branch[:, 1]), ('br_r', 'float', branch[:, 2]),
+            ('br_x', 'float', branch[:, 3]), ('g_fr', 'float', g_fr), ('b_fr', 'float', half_b + b_fr),
+            ('g_to', 'float', g_to), ('b_to', 'float', half_b + b_to), ('rate_a', 'float', branch[:, 5]/sbase),
+            ('rate_b', 'float', branch[:, 6]/sbase), ('rate_c', 'float', branch[:, 7]/sbase), ('tap', 'float', tap),
+            ('shift', 'float', np.deg2rad(branch[:, 9])), ('br_status', 'int', branch[:, 10]),
+            ('angmin', 'float', np.full(len(branch), -ANGLE_LIMIT)), ('angmax', 'float', np.full(len(branch), ANGLE_LIMIT)),
+            ('transformer', 'bool', transformer)]),
+        ('dcline', [('f_bus', 'int', dcline[:, 0]), ('t_bus', 'int', dcline[:, 1]), ('br_status', 'int', dcline[:, 2]),
+            ('pf', 'float', dcline[:, 3]/sbase), ('pt', 'float', -dcline[:, 4]/sbase),
+            ('qf', 'float', dcline[:, 5]/sbase), ('qt', 'float', dcline[:, 6]/sbase),
+            ('vf', 'float', dcline[:, 7]), ('vt', 'float', dcline[:, 8]),
+            ('pminf', 'float', pminf), ('pmaxf', 'float', pmaxf),
+            ('pmint', 'float', loss0 - pmaxf*(1 - loss1)), ('pmaxt', 'float', loss0 - pminf*(1 - loss1)),
+            ('qminf', 'float', dcline[:, 11]/sbase), ('qmaxf', 'float', dcline[:, 12]/sbase),
+            ('qmint', 'float', dcline[:, 13]/sbase), ('qmaxt', 'float', dcline[:, 14]/sbase),
+            ('loss0', 'float', loss0), ('loss1', 'float', loss1)]),
+    ]
+
+
+def write_powermodels(case, fileobj, name=None, chunk_rows=10000):
+    '''writes a parsed case as a PowerModels network in json, encoding the
+    components from the columns of :func:`network_components` a chunk at a
+    time, so the nested dictionary of the network is never built
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        fileobj: a file opened for writing text
+        name (str): the name of the network (default = record1 of the case)
+        chunk_rows (int): the most components encoded per write
+    '''
+
+    header = case.header
+    if name is None:
+        name = header.record1.strip()
+
+    fileobj.write('{\n')
+    for key, value in (('name', name), ('source_type', 'pti'), ('source_version', str(header.rev)),
+            ('baseMVA', header.sbase), ('per_unit', True), ('multinetwork', False)):
+        fileobj.write('{}: {},\n'.format(json.dumps(key), json.dumps(value)))
+    for component, fields in network_components(case):
+        write_components(fileobj, component, fields, chunk_rows)
+        fileobj.write(',\n')
+    fileobj.write('"storage": {},\n"switch": {}\n}\n')
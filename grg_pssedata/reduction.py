@@ -0,0 +1,768 @@
+'''the network-reduction post-processing of a parsed psse case, declared as a
+graph of memoized stages'''
+
+from __future__ import print_function
+
+import argparse
+import collections
+import functools
+import hashlib
+import os
+import pickle
+import types
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from grg_pssedata.io import CaseTables
+from grg_pssedata.tables import KeyIndex
+from grg_pssedata.tables import table_fingerprint
+from grg_pssedata.watch import CaseCache
+
+CAPLIM = 500 # 50 MW limit of substations
+KVLIM = 345 # 345 kV lines and above
+CONLIM = 3 # number of connections to a bus
+GENCAPTHD = 500 # generators above this MVA base are retained
+
+POIS = [ 110759, 119194, 119209, 114734, 111134, 110783, 111809, 119077, 113951, 111217, 117314, 117001, 117301,
+    113952, 114417, 117496, 119709, 119480, 104127, 111202, 111204, 104079, 100002, 100086, 100087, 100088, 100098, 107000, 119064,
+    119389, 123630, 111193, 111133, 110786, 110756, 128284, 126297, 126294, 125001, 126291, 126281, 126298, 126266, 126287, 126644, 126645, 126304,
+    126641, 126353, 126847, 126642, 126643, 126283, 129868, 129421, 129202, 129692,
+    129341, 129310, 128835, 129355, 128822, 232012, 206294, 206302, 200017, 200006, 200014, 227900,
+    232268, 232006, 232124, 227040, 304463, 304453, 304039, 370635, 371605, 312807, 312719, 314909, 314481,
+]
+MY_RET_BUSES = [
+    [147827, 147828, 147833],  # 765 kV NYISO 5115 MW
+    [114063, 104135, 104128],  # 345 kV ISO NE 2550 MW
+    [243209, 247133, 243239],  # 765 kV PJM  6330 MW Area 205
+    [304183, 314935, 314940, 314936, 314945],  # 500 kV SC
+    [270730, 270928, 270716, 272794], # this is the problematic line in area 222
+]
+
+# the edge kinds of the case adjacency (see grg_pssedata.topology) that are
+# branches of the reduction, voltage source converter lines are not
+BRANCH_KINDS = ['acline', 'transformer2w', 'transformer3w', 'twotermdc']
+
+Stage = collections.namedtuple('Stage', ['name', 'function', 'inputs'])
+
+
+def fingerprint(value):
+    '''computes a stable digest of the contents of a value
+
+    Args:
+        value: a data frame, series, array or plain python value
+    Returns:
+        str: the hex digest of the value
+    '''
+
+    digest = hashlib.sha1()
+    _update_digest(digest, value)
+    return digest.hexdigest()
+
+
+def function_fingerprint(function):
+    '''computes a digest of a function's name and compiled code, so that a
+    memoized output is not reused once the function that computed it has
+    changed
+
+    Args:
+        function: a function or a functools.partial of one
+    Returns:
+        str: the hex digest of the function
+    '''
+
+    digest = hashlib.sha1()
+    _update_function_digest(digest, function)
+    return digest.hexdigest()
+
+
+def _update_function_digest(digest, function):
+    if isinstance(function, functools.partial):
+        digest.update(b'partial')
+        _update_function_digest(digest, function.func)
+        _update_digest(digest, list(function.args))
+        _update_digest(digest, dict(function.keywords))
+        return
+    digest.update(repr((getattr(function, '__module__', None), getattr(function, '__qualname__', None))).encode())
+    code = getattr(function, '__code__', None)
+    if code is not None:
+        _update_code_digest(digest, code)
+        _update_digest(digest, list(function.__defaults__ or ()))
+
+
+def _update_code_digest(digest, code):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            _update_code_digest(digest, constant)
+        else:
+            digest.update(repr(constant).encode())
+
+
+def _update_digest(digest, value):
+    if isinstance(value, CaseTables):
+        digest.update(b'case')
+        for name, table_digest in value.fingerprints().items():
+            digest.update(('%s %s' % (name, table_digest)).encode())
+    elif isinstance(value, pd.DataFrame):
+        digest.update(b'frame')
+        digest.update(table_fingerprint(value).encode())
+    elif isinstance(value, pd.Series):
+        digest.update(b'series')
+        digest.update(repr((value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(b'array')
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b'sequence %d' % len(value))
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, dict):
+        digest.update(b'mapping %d' % len(value))
+        for key in sorted(value, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+class StageGraph(object):
+    def __init__(self, stages, cache_file=None):
+        '''This data structure runs a directed acyclic graph of stages.  Each
+        stage is a function of named inputs, which are either sources given to
+        :func:`run` or the outputs of other stages.  A stage's fingerprint is
+        derived from its function's code and the fingerprints of its inputs
+        and its output is memoized, so that changing a source or a stage
+        function only recomputes the stages that depend on it.
+
+        Args:
+            stages (list of Stage): the stages of the graph, in any order
+            cache_file (str): file where the memoized outputs are kept between
+                runs of the program (optional)
+        '''
+
+        self.stages = collections.OrderedDict()
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError('stage {} is declared more than once'.format(stage.name))
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+
+        self.cache_file = cache_file
+        self.computed = []
+        self._memo = {}
+        if self.cache_file is not None and os.path.isfile(self.cache_file):
+            with open(self.cache_file, 'rb') as cache:
+                self._memo = pickle.load(cache)
+
+    def _topological_order(self):
+        order = []
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError('stages {} form a cycle'.format(' -> '.join(path + [name])))
+            state[name] = 'visiting'
+            for input_name in self.stages[name].inputs:
+                if input_name in self.stages:
+                    visit(input_name, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def dependencies(self, targets):
+        '''Returns: the names of the given stages and all the stages they depend on, in run order'''
+
+        needed = set()
+        pending = list(targets)
+        while len(pending) > 0:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError('unknown stage {}'.format(name))
+            if name not in needed:
+                needed.add(name)
+                pending.extend(i for i in self.stages[name].inputs if i in self.stages)
+        return [name for name in self.order if name in needed]
+
+    def run(self, sources, targets=None):
+        '''computes the given stages, reusing memoized outputs whose inputs
+        have not changed
+
+        Args:
+            sources (dict): the values of the graph inputs, keyed by name, the
+                tables of a CaseTables source are inputs under their own
+                names, with the fingerprints the case keeps
+            targets (list): the names of the stages to compute (default = all stages)
+        Returns (dict):
+            the outputs of the target stages, keyed by stage name
+        '''
+
+        if targets is None:
+            targets = list(self.stages)
+        names = self.dependencies(targets)
+        cases = [value for value in sources.values() if isinstance(value, CaseTables)]
+
+        values = {}
+        fingerprints = {}
+        for name in names:
+            for input_name in self.stages[name].inputs:
+                if input_name in self.stages or input_name in fingerprints:
+                    continue
+                if input_name in sources:
+                    values[input_name] = sources[input_name]
+                    fingerprints[input_name] = fingerprint(sources[input_name])
+                    continue
+                case = next((case for case in cases if input_name in case._fields), None)
+                if case is None:
+                    raise ValueError('stage {} requires the input {}'.format(name, input_name))
+                values[input_name] = getattr(case, input_name)
+                fingerprints[input_name] = case.fingerprint(input_name)
+
+        self.computed = []
+        for name in names:
+            stage = self.stages[name]
+            digest = hashlib.sha1(name.encode())
+            digest.update(function_fingerprint(stage.function).encode())
+            for input_name in stage.inputs:
+                digest.update(fingerprints[input_name].encode())
+            stage_fingerprint = digest.hexdigest()
+
+            memo = self._memo.get(name)
+            if memo is None or memo[0] != stage_fingerprint:
+                output = stage.function(*[values[input_name] for input_name in stage.inputs])
+                memo = (stage_fingerprint, output)
+                self._memo[name] = memo
+                self.computed.append(name)
+
+            values[name] = memo[1]
+            fingerprints[name] = stage_fingerprint
+
+        if self.cache_file is not None and len(self.computed) > 0:
+            with open(self.cache_file, 'wb') as cache:
+                pickle.dump(self._memo, cache, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return {name: values[name] for name in targets}
+
+
+def fix_trans3w(trans3wpre):
+    t3w=[]
+    for ibus, jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, r2_3, x2_3, sbase2_3, r3_1, x3_1, sbase3_1, wdg1rate1, wdg1rate2, wdg1rate3, wdg2rate1, wdg2rate2, wdg2rate3, wdg3rate1, wdg3rate2, wdg3rate3 in trans3wpre.values:
+        if stat ==1:
+            t3w.append([ibus, jbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, wdg1rate1, wdg1rate2, wdg1rate3])
+            t3w.append([jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r2_3, x2_3, sbase2_3, wdg2rate1, wdg2rate2, wdg2rate3])
+            t3w.append([ibus, kbus, ckt, cw, cz, name, stat,  vecgrp, r3_1, x3_1, sbase3_1, wdg3rate1, wdg3rate2, wdg3rate3])
+        elif stat==2: # only winding 2 is out
+            t3w.append([ibus, jbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, wdg1rate1, wdg1rate2, wdg1rate3])
+            t3w.append([ibus, kbus, ckt, cw, cz, name, stat,  vecgrp, r3_1, x3_1, sbase3_1, wdg3rate1, wdg3rate2, wdg3rate3])
+        elif stat==3: # only winding 3 is out: add 1 and 2
+            t3w.append([ibus, jbus, ckt, cw, cz, name, stat,  vecgrp, r1_2, x1_2, sbase1_2, wdg1rate1, wdg1rate2, wdg1rate3])
+            t3w.append([jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r2_3, x2_3, sbase2_3, wdg2rate1, wdg2rate2, wdg2rate3])
+        elif stat==4: # only winding 1 is out: add 2 and 3
+            t3w.append([jbus, kbus, ckt, cw, cz, name, stat,  vecgrp, r2_3, x2_3, sbase2_3, wdg2rate1, wdg2rate2, wdg2rate3])
+            t3w.append([ibus, kbus, ckt, cw, cz, name, stat,  vecgrp, r3_1, x3_1, sbase3_1, wdg3rate1, wdg3rate2, wdg3rate3])
+    return pd.DataFrame(data=t3w, columns=['ibus', 'jbus', 'ckt', 'cw', 'cz', 'name', 'stat', 'vecgrp', 'r', 'x', 'sbase', 'rate1', 'rate2', 'rate3'])
+
+
+def fix_tt_dc(df):
+    '''calculate p, qmin, and qmin for rectifier and inverter
+    '''
+    # XXX the Qmin becomes larger than Qmax. This is the same as matpower; WHY? XXX
+
+    df.loc[df['mdc']==1,'pmw']=df.loc[df['mdc']==1,'setvl'] # SETVL is the desired real power demand
+    df.loc[df['mdc']==2,'pmw']=df.loc[df['mdc']==2,'setvl'] * df.loc[df['mdc']==2,'vschd'] / 1000  # SETVL is the current in amps (need devide 1000 to convert to MW)
+    df.loc[~(df['mdc'].isin([1,2])),'pmw']=0
+    df.loc[df['pmw']<0, 'pmw'] = -1 * df.loc[df['pmw']<0, 'pmw']
+
+    # Q min and max for rectifires and inverters
+    df.loc[:, 'qminr'] = df['pmw'] * df['anmnr']
+    df.loc[:, 'qmini'] = df['pmw'] * df['anmni']
+
+    df.loc[:, 'qmaxr'] = df['pmw'] * np.tan(np.arccos(0.5 * (np.cos(np.deg2rad(df['anmxr'])) + np.cos(np.pi/3))))
+    df.loc[:, 'qmaxi'] = df['pmw'] * np.tan(np.arccos(0.5 * (np.cos(np.deg2rad(df['anmxi'])) + np.cos(np.pi/3))))
+    df.loc[(df['qminr']<0), 'qminr'] = -1 * df.loc[(df['qminr']<0), 'qminr']
+    df.loc[(df['qmini']<0), 'qmini'] = -1 * df.loc[(df['qmini']<0), 'qmini']
+    df.loc[(df['qmaxr']<0), 'qmaxr'] = -1 * df.loc[(df['qmaxr']<0), 'qmaxr']
+    df.loc[(df['qmaxi']<0), 'qmaxi'] = -1 * df.loc[(df['qmaxi']<0), 'qmaxi']
+    df['stat'] = np.where(df['mdc']==0, 0, 1)
+
+    return df
+
+
+def calc_buscap(allbranches, buson):
+
+    # ########################################################################################### #
+    # calculate capacity of each substation
+    # ########################################################################################### #
+
+    # for ibus
+    subcap = pd.DataFrame()
+    ic = allbranches.groupby(['ibus'])['jbus'].count().reindex(buson['ibus']).fillna(value=0)
+    jc = allbranches.groupby(['jbus'])['ibus'].count().reindex(buson['ibus']).fillna(value=0)
+    ijc = ic + jc
+    ijc.name = 'count'
+    ijc = ijc.reset_index()
+
+    ibus = allbranches.groupby(['ibus'])[['rate2']].agg({'rate2':['sum', 'max']}).reindex(buson['ibus']).fillna(value=0)['rate2']
+    jbus = allbranches.groupby(['jbus'])[['rate2']].agg({'rate2':['sum', 'max']}).reindex(buson['ibus']).fillna(value=0)['rate2']
+
+    subcap['sum'] = ibus['sum'] + jbus['sum']
+    subcap['max'] = np.maximum(ibus['max'], jbus['max'])
+    subcap['cap'] = subcap['sum'] - subcap['max']
+    subcap = subcap.sort_values(by=['cap'], ascending=False)
+    buscap = pd.merge(buson, subcap[['cap']].reset_index(), on='ibus')
+    buscapc = pd.merge(buscap, ijc, on='ibus')
+
+    return buscapc
+
+
+def join_bus_ends(branches, bus, columns=None):
+    '''adds the bus columns of both ends to a table of branches, like a left
+    merge on ibus and then on jbus, through a hash index of the buses
+
+    Args:
+        branches (DataFrame): a table with ibus and jbus columns
+        bus (DataFrame): a table with one row per ibus
+        columns (list): the bus columns to add (default = all but ibus)
+    Returns:
+        DataFrame: the branches with the bus columns suffixed by _i and _j
+    '''
+
+    if columns is None:
+        columns = [column for column in bus.columns if column != "ibus"]
+    buses = KeyIndex(bus, ["ibus"])
+    return pd.concat([
+        branches.reset_index(drop=True),
+        buses.take(branches["ibus"], columns).add_suffix("_i"),
+        buses.take(branches["jbus"], columns).add_suffix("_j"),
+    ], axis=1)
+
+
+# the stages below do not modify their inputs, since these are memoized and
+# shared with later runs
+
+def select_buses(busdf, internals):
+    bus = busdf.loc[:, ["ibus", "name", "baskv", "ide", "area", "zone"]].copy()
+    bus.loc[busdf["area"].isin(internals), "isin"] = 1
+    bus.loc[~busdf["area"].isin(internals), "isin"] = 0
+    return bus
+
+
+def select_buses_on(bus):
+    return bus.loc[bus["ide"] != 4, :]
+
+
+def select_generators(gensdf):
+    return gensdf.loc[
+        gensdf["stat"] != 0,
+        ["ibus", "machid", "pg", "qg", "qt", "qb", "vs", "ireg", "mbase"],
+    ]
+
+
+def select_ac_branches(branchesdf):
+    acbrnch = branchesdf.loc[
+        branchesdf["stat"] != 0,
+        ["ibus", "jbus", "ckt", "rpu", "xpu", "rate1", "rate2", "rate3"],
+    ].rename(columns={"rpu": "r", "xpu": "x"})
+    acbrnch["isac"] = 1
+    return acbrnch
+
+
+def select_tt_dc_lines(tt_dc_linesdf):
+    tt_dc_linesdf = fix_tt_dc(tt_dc_linesdf.copy())
+    tt_dc_lines = tt_dc_linesdf.loc[
+        tt_dc_linesdf["stat"] != 0, ["ipi", "ipr", "pmw"]
+    ].rename(columns={"ipi": "ibus", "ipr": "jbus", "pmw": "rate1"})
+    tt_dc_lines["rate2"] = tt_dc_lines["rate1"]
+    tt_dc_lines["rate3"] = tt_dc_lines["rate1"]
+    tt_dc_lines["ckt"] = tt_dc_lines.index
+    tt_dc_lines["isdc"] = 1
+    return tt_dc_lines
+
+
+def select_transformers2w(trans2wdf):
+    trans2w = trans2wdf.loc[
+        trans2wdf["stat"] != 0,
+        ["ibus", "jbus", "ckt", "r1_2", "x1_2", "wdg1rate1", "wdg1rate2", "wdg1rate3"],
+    ].rename(
+        columns={
+            "r1_2": "r",
+            "x1_2": "x",
+            "wdg1rate1": "rate1",
+            "wdg1rate2": "rate2",
+            "wdg1rate3": "rate3",
+        }
+    )
+    trans2w["is2w"] = 1
+    return trans2w
+
+
+def select_transformers3w(trans3wdf):
+    # for 3-winding transformers: 0: all out 1: all in 2: only 2 is out 3: only 3 is out 4: only 1 is out
+    trans3wpre = trans3wdf.loc[
+        trans3wdf["stat"] != 0,
+        ["ibus", "jbus", "kbus", "ckt", "cw", "cz", "name", "stat", "vecgrp",
+         "r1_2", "x1_2", "sbase1_2", "r2_3", "x2_3", "sbase2_3", "r3_1", "x3_1", "sbase3_1",
+         "wdg1rate1", "wdg1rate2", "wdg1rate3", "wdg2rate1", "wdg2rate2", "wdg2rate3",
+         "wdg3rate1", "wdg3rate2", "wdg3rate3"],
+    ].copy()
+    trans3w = fix_trans3w(trans3wpre)[
+        ["ibus", "jbus", "ckt", "r", "x", "rate1", "rate2", "rate3"]
+    ]
+    trans3w["is3w"] = 1
+    # XXX fix the impedances of 3 winding transformers
+    return trans3w
+
+
+def connect_branches(acbrnch, trans2w, trans3w, tt_dc_lines, bus):
+    # all connections
+    # creating the lines using branches and transformers and DC lines (what else?)
+    abrnch = pd.concat([acbrnch, trans2w, trans3w, tt_dc_lines])
+
+    # adding voltage and area to the branches
+    allbranches = join_bus_ends(abrnch, bus)
+
+    # fixing the ratings that are unreasonably large
+    allbranches.loc[
+        (allbranches["rate1"] >= 8888)
+        | (allbranches["rate2"] >= 8888)
+        | (allbranches["rate3"] >= 8888),
+        ["rate1", "rate2", "rate3"],
+    ] = 0
+    return allbranches
+
+
+def select_branches_on(allbranches):
+    return allbranches.loc[
+        (allbranches["ide_i"] != 4) & (allbranches["ide_j"] != 4), :
+    ]
+
+
+def find_border_buses_tot(allbrancheson, internals):
+    # tie-lines
+    ties = allbrancheson.loc[
+        (
+            (allbrancheson["area_i"].isin(internals))
+            & ~(allbrancheson["area_j"].isin(internals))
+        )
+        | (
+            ~(allbrancheson["area_i"].isin(internals))
+            & (allbrancheson["area_j"].isin(internals))
+        )
+    ]
+    border_buses_i = ties.loc[ties["area_i"].isin(internals), "ibus"]
+    border_buses_j = ties.loc[ties["area_j"].isin(internals), "jbus"]
+
+    return border_buses_i.tolist() + border_buses_j.tolist()
+
+
+def find_border_buses(border_buses_tot, buscapc, conlim, kvlim, caplim):
+    # here we are filtering the border buses, should we?
+    border_buses_f = buscapc.loc[buscapc["ibus"].isin(border_buses_tot)]
+    border_buses_final = border_buses_f.loc[
+        (border_buses_f["count"] > conlim)
+        & (border_buses_f["baskv"] >= kvlim)
+        & (border_buses_f["cap"] > caplim)
+    ]
+    return border_buses_final["ibus"].tolist()
+
+
+def find_internal_tielines(allbrancheson, internals):
+    # XXX this gives a lot of lines and buses; we may need to filter them
+    # border and adjacent dataframe Note that this is for the internal areas only
+    return allbrancheson.loc[
+        (allbrancheson["area_i"] != allbrancheson["area_j"])
+        & (allbrancheson["area_i"].isin(internals))
+        & (allbrancheson["area_j"].isin(internals))
+        & (allbrancheson["baskv_i"] > 115)
+        & (allbrancheson["baskv_j"] > 115)
+        & (allbrancheson["isdc"] == 0),
+        :,
+    ]
+
+
+def find_pars(trans2wdf, bus, internals):
+    PARs = trans2wdf.loc[(trans2wdf["cod1"].isin([-3, 3])) & (trans2wdf["stat"]) == 1]
+
+    # adding voltage and area to the branches
+    PARskV = join_bus_ends(PARs, bus, ["area", "baskv"])
+    # fileter PARs
+    return PARskV.loc[
+        (PARskV["area_i"] == PARskV["area_j"])
+        & (PARskV["area_i"].isin(internals))
+        & (PARskV["baskv_i"] > 137)
+    ]
+
+
+def case_adjacency(case):
+    return case.adjacency()
+
+
+def connected_neighbors(adjacency, bus_numbers, buson):
+    # the neighbors of buses through the branches of allbrancheson: the in
+    # service ac lines, transformers and two terminal dc lines between buses
+    # that are not isolated
+    on = buson["ibus"].to_numpy()
+    bus_numbers = np.asarray(bus_numbers)
+    neighbors = adjacency.external_neighbors(bus_numbers[np.isin(bus_numbers, on)],
+        in_service=True, kinds=BRANCH_KINDS)
+    return neighbors[np.isin(neighbors, on)]
+
+
+def find_par_buses(PARsSel, adjacency, buson):
+    buses2keep = PARsSel["ibus"]
+
+    # the buses of the branches at one end of the PARs
+    PARsOneEnd = connected_neighbors(adjacency, buses2keep, buson)
+
+    return list(
+        set(
+            PARsSel["ibus"].tolist()
+            + PARsSel["jbus"].tolist()
+            + PARsOneEnd.tolist()
+        )
+    )
+
+
+def find_retbus(buscapc, internals, kvlim, conlim, caplim):
+    select_area = buscapc["area"].isin(internals)
+    select_basekv = buscapc["baskv"] >= kvlim
+    select_con = buscapc["count"] > conlim
+    select_cap = buscapc["cap"] > caplim
+    return buscapc.loc[
+        select_area & select_basekv & select_con & select_cap, "ibus"
+    ].tolist()
+
+
+def find_intretlines(allbrancheson):
+    return allbrancheson.loc[
+        (allbrancheson["baskv_i"] == allbrancheson["baskv_j"])  # no transformers
+        & (allbrancheson["area_i"] == allbrancheson["area_j"])  # in one area
+        & (allbrancheson["baskv_i"] > 300)  # above 200 kv
+        & (allbrancheson["rate1"] > 2000)  # rate > 200 MW
+        & (allbrancheson["rate1"] < 3000)  # remove inaccurate data
+        & (allbrancheson["isac"] == 1)  # only ac lines
+        & (allbrancheson["isin_i"] == 1)  # not outside study area
+    ]
+
+
+def find_intretline_buses(intretlines, adjacency, buson):
+    # take one end of the linse
+    buses2keep = intretlines["ibus"].tolist()
+
+    # find connecting buses
+    intretlinesoneend = connected_neighbors(adjacency, buses2keep, buson)
+    return list(
+        set(
+            intretlinesoneend.tolist()
+            + intretlines["ibus"].tolist()
+            + intretlines["jbus"].tolist()
+        )
+    )
+
+
+def find_generator_buses(gens, buscapc, trans2wdf, internals, gencapthd):
+    # note that some generators are directly connectedto buses without a transformer
+    gensarea = pd.concat([
+        gens[["ibus", "mbase"]].reset_index(drop=True),
+        KeyIndex(buscapc, ["ibus"]).take(gens["ibus"], ["area"]),
+    ], axis=1)
+    # all gen buses (this will be low-side of the transformers)
+    gens100mw = gensarea.loc[
+        (gensarea["area"].isin(internals)) & (gensarea["mbase"] > gencapthd), :
+    ]
+    gensbuses = gens100mw.loc[:, "ibus"].tolist()
+
+    # adding voltage base to buses
+    t2w = trans2wdf[["ibus", "jbus"]]
+    t2w = pd.merge(
+        pd.merge(t2w, buscapc[["ibus", "baskv"]], on="ibus").rename(
+            columns={"baskv": "kvi"}
+        ),
+        buscapc[["ibus", "baskv"]].rename(columns={"ibus": "jbus"}),
+        on="jbus",
+    ).rename(columns={"baskv": "kvj"})
+
+    t2w.loc[:, ["geni", "genj", "igj"]] = 0
+    t2w.loc[t2w["ibus"].isin(gensbuses), "geni"] = 1
+    t2w.loc[t2w["jbus"].isin(gensbuses), "genj"] = 1
+    t2w.loc[t2w["kvi"] >= t2w["kvj"], "igj"] = 1
+    highside = t2w.loc[(t2w["genj"] == 1) & (t2w["igj"] == 1), "ibus"].tolist()
+    lowside = t2w.loc[(t2w["genj"] == 1) & (t2w["igj"] == 1), "jbus"].tolist()
+
+    return list(set(gensbuses) - set(lowside)) + highside
+
+
+def find_retained_buses(gensbusesfinal, retbus, pois):
+    # retained buses are the followings:
+    # 1- based on their capacities, connected lines, voltage kV, etc
+    # 2- internal tie-lines (disabled for now)
+    # 3- POIs
+    # 4- Some lines I have manually selected (bothe ends and all buses connected to one end)
+    # 5- some lines I am automatically selecting based on kv etc and I keep their buses at one terminal
+    # 6- generator buses (high side of the transformer)
+    # 7- PAR buses - I am going to add this, both PAR terminals and all connected buses to one terminal
+    return list(
+        set(
+            gensbusesfinal  # all generator buses
+            + retbus  # based on the capacity and voltage
+            + pois  # the POIs
+            # + specretlines  # specific lines I am retaining; really don't need though
+            # + intretlinebuses2ret  # internal lines to retain
+            # + border_buses # this is before filtering; all boundry buses
+            # + border_buses_adjacent
+            # + PARbuses2ret  # PAR buses and attached lines
+        )
+    )
+
+
+REDUCTION_STAGES = [
+    Stage('buses', select_buses, ['bus', 'internals']),
+    Stage('buson', select_buses_on, ['buses']),
+    Stage('gens', select_generators, ['generator']),
+    Stage('acbrnch', select_ac_branches, ['acline']),
+    Stage('tt_dc_lines', select_tt_dc_lines, ['twotermdc']),
+    Stage('trans2w', select_transformers2w, ['transformer2w']),
+    Stage('trans3w', select_transformers3w, ['transformer3w']),
+    Stage('allbranches', connect_branches, ['acbrnch', 'trans2w', 'trans3w', 'tt_dc_lines', 'buses']),
+    Stage('allbrancheson', select_branches_on, ['allbranches']),
+    Stage('adjacency', case_adjacency, ['case']),
+    Stage('buscapc', calc_buscap, ['allbranches', 'buson']),
+    Stage('border_buses_tot', find_border_buses_tot, ['allbrancheson', 'internals']),
+    Stage('border_buses', find_border_buses, ['border_buses_tot', 'buscapc', 'conlim', 'kvlim', 'caplim']),
+    Stage('internal_tielines', find_internal_tielines, ['allbrancheson', 'internals']),
+    Stage('pars', find_pars, ['transformer2w', 'buses', 'internals']),
+    Stage('par_buses', find_par_buses, ['pars', 'adjacency', 'buson']),
+    Stage('retbus', find_retbus, ['buscapc', 'internals', 'kvlim', 'conlim', 'caplim']),
+    Stage('intretlines', find_intretlines, ['allbrancheson']),
+    Stage('intretline_buses', find_intretline_buses, ['intretlines', 'adjacency', 'buson']),
+    Stage('gensbuses', find_generator_buses, ['gens', 'buscapc', 'transformer2w', 'internals', 'gencapthd']),
+    Stage('retainedbuses', find_retained_buses, ['gensbuses', 'retbus', 'pois']),
+]
+
+
+def build_reduction_graph(cache_file=None):
+    '''Returns: a StageGraph of the network-reduction stages'''
+    return StageGraph(REDUCTION_STAGES, cache_file)
+
+
+def reduction_sources(case, internals, caplim=CAPLIM, kvlim=KVLIM, conlim=CONLIM, gencapthd=GENCAPTHD, pois=POIS):
+    '''collects the inputs of the network-reduction stages
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        internals (list): the areas of the study region
+        caplim (float): substation capacity limit of retained buses (MW)
+        kvlim (float): base voltage limit of retained buses (kV)
+        conlim (int): number of connections limit of retained buses
+        gencapthd (float): machine base limit of retained generator buses (MVA)
+        pois (list): points of interconnection that are always retained
+    Returns (dict):
+        the graph inputs keyed by name, the case, whose tables are inputs
+        under their own names, its header and the limits
+    '''
+
+    return dict(case=case, header=tuple(case.header), internals=list(internals), caplim=caplim,
+        kvlim=kvlim, conlim=conlim, gencapthd=gencapthd, pois=list(pois))
+
+
+def load_areas(areas_file_name):
+    '''reads the area groupings of the study
+
+    Args:
+        areas_file_name (str): path to a yaml file of area lists
+    Returns (tuple):
+        the internal and the external areas
+    '''
+
+    with open(areas_file_name, 'r') as f:
+        areas = yaml.safe_load(f)
+    internals = areas['ISONE'] + areas['NYISO'] + areas['PJM'] + areas['DUKE'] + areas['SC']
+    externals = list(set(areas['ALLAREAS']) - set(internals))
+    return internals, externals
+
+
+def build_cli_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('file', help='the pss/e data file to operate on (.raw)')
+    parser.add_argument('--areas', default='areas.yaml', help='a yaml file of the area groupings')
+    parser.add_argument('--caplim', type=float, default=CAPLIM, help='substation capacity limit of retained buses (MW)')
+    parser.add_argument('--kvlim', type=float, default=KVLIM, help='base voltage limit of retained buses (kV)')
+    parser.add_argument('--conlim', type=int, default=CONLIM, help='number of connections limit of retained buses')
+    parser.add_argument('--cache', help='a directory where the parsed case and the stage outputs are kept between runs')
+    parser.add_argument('--retained', default='retainedbuses.csv', help='the csv file the retained buses are written to')
+    parser.add_argument('--matrices', help='a directory where the network matrices and the retained bus indexes are written')
+
+    return parser
+
+
+def main(args):
+    '''selects the retained buses of a case and writes them for the
+    reduction in matpower
+
+    Args:
+        args: an argparse data structure
+    Returns (dict):
+        the outputs of all the reduction stages
+    '''
+
+    snapshot_dir = args.cache
+    cache_file = None
+    if snapshot_dir is not None:
+        cache_file = os.path.join(snapshot_dir, 'reduction_stages.pkl')
+    case = CaseCache(snapshot_dir).get(args.file)
+    internals, externals = load_areas(args.areas)
+
+    graph = build_reduction_graph(cache_file)
+    results = graph.run(reduction_sources(case, internals, args.caplim, args.kvlim, args.conlim))
+    print('computed stages: {}'.format(', '.join(graph.computed)))
+
+    retbus = results['retbus']
+    print(len(retbus), len(set(retbus).intersection(results['border_buses'])))
+
+    results['internal_tielines'].to_csv("internaltielines.csv", index=False)
+
+    # we need to remove the PARs from the branches at the end
+    results['pars'].drop(columns=['area_i', 'area_j', 'baskv_i', 'baskv_j']).to_excel('PARsRetained.xlsx', index=False)
+
+    specretlines = sum(MY_RET_BUSES, []) # specific retained lines
+    retlines = pd.DataFrame([(k[0], k[1]) for k in MY_RET_BUSES], columns=["ibus", "jbus"])
+    allintretlines = pd.concat([results['intretlines'][['ibus','jbus']],retlines])
+    allintretlines.to_csv("intretlines.csv")
+
+    retainedbuses = results['retainedbuses']
+    print(f'generator buses {len(results["gensbuses"])}')
+    print(f'retained buses based on capacity {len(retbus)}')
+    print(f'POIs {len(POIS)}')
+    print(f'specific retained lines {len(specretlines)}')
+    print(f'internal retained lines {len(results["intretline_buses"])}')
+    print(f'boundry buses {len(results["border_buses_tot"])}')
+    print(f'buses for PARs {len(results["par_buses"])}')
+    print(f"total of retained buses is {len(retainedbuses)}")
+
+    pd.DataFrame(retainedbuses).to_csv(args.retained, index=False, header=False)
+    results['buscapc'].to_csv("allbuses.csv", index=False)
+
+    if args.matrices is not None:
+        # imported here, grg_pssedata.matpower imports this module
+        from grg_pssedata.matrices import export_matrices
+        export_matrices(case, retainedbuses, args.matrices)
+
+    # go to MATLAB and run the code there
+    # The results are written two files:
+    # 1) Y_eq.csv which gives us the lines 2) LF.csv which is the load fraction matrix
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = build_cli_parser()
+    main(parser.parse_args())
@@ -0,0 +1,177 @@
+'''scenarios that record their changes to a base case cell by cell, instead
+of copying its tables'''
+
+import numpy as np
+import pandas as pd
+
+
+class ScenarioOverlay(object):
+    def __init__(self, base, name=None):
+        '''This data structure describes a scenario as a set of changed cells
+        on top of a base case.  The base case is shared by all of its
+        scenarios and is never modified, so memory grows with the number of
+        changed cells rather than with the size of the case.  Merged tables
+        are built when they are first requested.
+
+        Args:
+            base (CaseTables): the tables of the base case
+            name (str): a name for the scenario (optional)
+        '''
+
+        self.base = base
+        self.name = name
+        self.deltas = {}
+        self._tables = {}
+
+    def __str__(self):
+        return 'scenario {}: {} changed cells in {}'.format(self.name,
+            self.delta_count(), ', '.join(self.changed_tables()))
+
+    def _base_table(self, table):
+        if table not in self.base._fields:
+            raise ValueError('unknown table {}'.format(table))
+        return getattr(self.base, table)
+
+    def _positions(self, table, rows):
+        base_table = self._base_table(table)
+        positions = base_table.index.get_indexer(rows)
+        if (positions < 0).any():
+            missing = [row for row, position in zip(rows, positions) if position < 0]
+            raise ValueError('rows {} are not in the {} table'.format(missing, table))
+        return positions
+
+    def set(self, table, column, rows, values):
+        '''changes cells of a table
+
+        Args:
+            table (str): the name of the table
+            column (str): the name of the column
+            rows (list): the index labels of the rows to change
+            values: one value for all rows, or a list with one value per row
+        '''
+
+        base_table = self._base_table(table)
+        if column not in base_table.columns:
+            raise ValueError('unknown column {} in the {} table'.format(column, table))
+        rows = list(rows)
+        if np.ndim(values) == 0:
+            values = [values]*len(rows)
+        if len(values) != len(rows):
+            raise ValueError('{} values were given for {} rows'.format(len(values), len(rows)))
+
+        positions = self._positions(table, rows)
+        cells = self.deltas.setdefault(table, {}).setdefault(column, {})
+        for position, value in zip(positions, values):
+            cells[int(position)] = value
+        self._tables.pop(table, None)
+
+    def scale(self, table, column, factor, rows=None):
+        '''multiplies cells of a table, starting from their scenario values
+
+        Args:
+            table (str): the name of the table
+            column (str): the name of the column
+            factor (float): the scaling factor
+            rows (list): the index labels of the rows to change (default = all rows)
+        '''
+
+        if rows is None:
+            rows = self._base_table(table).index
+        current = self.table(table)[column]
+        self.set(table, column, rows, (current.loc[list(rows)].to_numpy()*factor).tolist())
+
+    def outage(self, table, rows):
+        '''takes components out of service, buses are set to type 4 and
+        other components to status 0
+
+        Args:
+            table (str): the name of the table
+            rows (list): the index labels of the components
+        '''
+
+        if table == 'bus':
+            self.set(table, 'ide', rows, 4)
+        elif 'stat' in self._base_table(table).columns:
+            self.set(table, 'stat', rows, 0)
+        else:
+            raise ValueError('the {} table has no status column'.format(table))
+
+    def value(self, table, column, row):
+        '''Returns: the scenario value of one cell'''
+        position = self._positions(table, [row])[0]
+        cells = self.deltas.get(table, {}).get(column, {})
+        if int(position) in cells:
+            return cells[int(position)]
+        return self._base_table(table)[column].iloc[position]
+
+    def changed_tables(self):
+        '''Returns: the names of the tables that have changed cells'''
+        return [table for table in self.base._fields if table in self.deltas]
+
+    def delta_count(self):
+        '''Returns: the number of changed cells'''
+        return sum(len(cells) for columns in self.deltas.values() for cells in columns.values())
+
+    def clear(self, table=None):
+        '''drops the changes of one table, or of all tables when none is given'''
+        if table is None:
+            self.deltas = {}
+            self._tables = {}
+        else:
+            self.deltas.pop(table, None)
+            self._tables.pop(table, None)
+
+    def release(self):
+        '''drops the merged tables that were built, keeping the changes'''
+        self._tables = {}
+
+    def derive(self, name=None):
+        '''Returns: a new scenario on the same base that starts with the changes of this one'''
+        scenario = ScenarioOverlay(self.base, name)
+        scenario.deltas = {table: {column: dict(cells) for column, cells in columns.items()}
+            for table, columns in self.deltas.items()}
+        return scenario
+
+    def table(self, table):
+        '''builds the merged table of the scenario, only the changed columns
+        are copied and the others are shared with the base case
+
+        Args:
+            table (str): the name of the table
+        Returns:
+            DataFrame: the table with the scenario's changes
+        '''
+
+        base_table = self._base_table(table)
+        if table not in self.deltas:
+            return base_table
+        if table not in self._tables:
+            merged = base_table.copy(deep=False)
+            for column, cells in self.deltas[table].items():
+                merged[column] = _merge_column(base_table[column], cells)
+            self._tables[table] = merged
+        return self._tables[table]
+
+    def case(self):
+        '''Returns: the CaseTables of the scenario'''
+        return self.base._replace(**{table: self.table(table) for table in self.changed_tables()})
+
+
+def _merge_column(column, cells):
+    positions = np.fromiter(cells.keys(), dtype=np.intp, count=len(cells))
+    values = list(cells.values())
+
+    if column.dtype.kind in 'biuf':
+        values = np.asarray(values)
+        if values.dtype.kind in 'biuf':
+            data = column.to_numpy(dtype=np.result_type(column.dtype, values.dtype), copy=True)
+            data[positions] = values
+            return pd.Series(data, index=column.index, name=column.name)
+
+    data = column.to_numpy(dtype=object, copy=True)
+    data[positions] = values
+    merged = pd.Series(data, index=column.index, name=column.name)
+    try:
+        return merged.astype(column.dtype)
+    except (TypeError, ValueError):
+        return merged
@@ -0,0 +1,234 @@
+'''a local server that keeps psse cases parsed in memory and answers queries
+about them, and a client for it'''
+
+import json
+import os
+import socket
+import socketserver
+import threading
+
+import numpy as np
+import pandas as pd
+
+from grg_pssedata.exception import PSSEDataServerError
+from grg_pssedata.tables import PRIMARY_KEYS
+from grg_pssedata.tables import key_mask
+from grg_pssedata.watch import CaseCache
+from grg_pssedata.watch import changed_tables
+
+
+def frame_to_json(frame):
+    '''Returns: a json-compatible dictionary of a data frame, in pandas' split orientation'''
+    return json.loads(frame.to_json(orient='split', index=False))
+
+
+def frame_from_json(data):
+    '''Returns: the data frame of a dictionary made by :func:`frame_to_json`'''
+    return pd.DataFrame(data['data'], columns=data['columns'])
+
+
+class CaseRequestHandler(socketserver.StreamRequestHandler):
+    '''answers the requests of one connection, one json object per line'''
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            try:
+                request = json.loads(line.decode('utf-8'))
+                response = {'ok': True, 'result': self.server.answer(request)}
+            except Exception as e:
+                response = {'ok': False, 'error': '{}: {}'.format(type(e).__name__, e)}
+            self.wfile.write(json.dumps(response).encode('utf-8')+b'\n')
+            self.wfile.flush()
+
+
+class _CaseQueries(object):
+    '''the queries shared by the unix socket and tcp servers'''
+
+    def _setup_cases(self, snapshot_dir):
+        self.cache = CaseCache(snapshot_dir)
+        self.lock = threading.Lock()
+
+    def case(self, path):
+        '''Returns: the parsed case of the given file, parsing it if it is new or changed'''
+        with self.lock:
+            return self.cache.get(os.path.abspath(path))
+
+    def table(self, case, request):
+        '''Returns: the table of a case named by a request, which must be one of its tables'''
+        if request.get('table') not in case._fields:
+            raise ValueError('unknown table {}, the tables are {}'.format(request.get('table'), ', '.join(case._fields)))
+        return getattr(case, request['table'])
+
+    def answer(self, request):
+        '''computes the result of a request
+
+        Args:
+            request (dict): a request, its 'op' entry selects the query
+        Returns:
+            a json-compatible result
+        '''
+
+        op = request.get('op')
+        if op == 'load':
+            case = self.case(request['path'])
+            return {name: len(table) for name, table in zip(case._fields, case)}
+
+        if op == 'cases':
+            with self.lock:
+                return sorted(self.cache.cases)
+
+        if op == 'unload':
+            with self.lock:
+                return self.cache.discard(os.path.abspath(request['path'])) is not None
+
+        if op == 'table':
+            table = self.table(self.case(request['path']), request)
+            if request.get('columns') is not None:
+                table = table[request['columns']]
+            return frame_to_json(table)
+
+        if op == 'lookup':
+            case = self.case(request['path'])
+            table = self.table(case, request)
+            section, key = request['table'], request['key']
+            unknown = [column for column in key if column not in table.columns]
+            if len(unknown) > 0:
+                raise ValueError('unknown columns {} of table {}'.format(', '.join(unknown), section))
+            columns = PRIMARY_KEYS[section]
+            if sorted(key) == sorted(columns) and case.index(section).duplicates == 0:
+                # a whole primary key is found through the hash index of the
+                # case, which only holds the first row of a duplicated key
+                values = [key[column] for column in columns]
+                positions = case.lookup(section, [values[0] if len(values) == 1 else tuple(values)])
+                positions = positions[positions >= 0]
+            else:
+                positions = np.flatnonzero(key_mask(table, key))
+            return frame_to_json(table.iloc[positions])
+
+        if op == 'diff':
+            case_1 = self.case(request['path_1'])
+            case_2 = self.case(request['path_2'])
+            # the row counts of the tables that differ, and the two headers
+            # when they differ
+            return {name: [list(case_1.header), list(case_2.header)] if name == 'header'
+                else [len(getattr(case_1, name)), len(getattr(case_2, name))]
+                for name in changed_tables(case_1, case_2)}
+
+        raise ValueError('unknown operation {}'.format(op))
+
+
+class UnixCaseServer(_CaseQueries, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, snapshot_dir=None):
+        '''This data structure serves parsed cases on a unix socket.
+
+        Args:
+            path (str): the path of the socket
+            snapshot_dir (str): directory for snapshots of the parsed cases (optional)
+        '''
+
+        self._setup_cases(snapshot_dir)
+        socketserver.ThreadingUnixStreamServer.__init__(self, path, CaseRequestHandler)
+
+    def server_close(self):
+        socketserver.ThreadingUnixStreamServer.server_close(self)
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class TCPCaseServer(_CaseQueries, socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port, snapshot_dir=None):
+        '''This data structure serves parsed cases on a localhost tcp port.
+
+        Args:
+            port (int): the port to listen on, 0 picks a free port
+            snapshot_dir (str): directory for snapshots of the parsed cases (optional)
+        '''
+
+        self._setup_cases(snapshot_dir)
+        socketserver.ThreadingTCPServer.__init__(self, ('127.0.0.1', port), CaseRequestHandler)
+
+
+def build_server(address, snapshot_dir=None):
+    '''Returns: a case server, on a unix socket if the address is a path and on a localhost port if it is an int'''
+    if isinstance(address, int):
+        return TCPCaseServer(address, snapshot_dir)
+    return UnixCaseServer(address, snapshot_dir)
+
+
+class CaseClient(object):
+    def __init__(self, address):
+        '''This data structure sends queries to a case server.
+
+        Args:
+            address: the path of a unix socket, or a localhost port
+        '''
+
+        if isinstance(address, int):
+            self.socket = socket.create_connection(('127.0.0.1', address))
+        else:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(address)
+        self.stream = self.socket.makefile('rwb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.stream.close()
+        self.socket.close()
+
+    def request(self, op, **arguments):
+        '''sends one request and waits for its result
+
+        Args:
+            op (str): the name of the query
+            arguments: the parameters of the query
+        Returns:
+            the result of the query
+        '''
+
+        arguments['op'] = op
+        self.stream.write(json.dumps(arguments).encode('utf-8')+b'\n')
+        self.stream.flush()
+        line = self.stream.readline()
+        if len(line) == 0:
+            raise PSSEDataServerError('the server closed the connection')
+        response = json.loads(line.decode('utf-8'))
+        if not response['ok']:
+            raise PSSEDataServerError(response['error'])
+        return response['result']
+
+    def load(self, path):
+        '''Returns: the row count of each table of the case, after the server has parsed it'''
+        return self.request('load', path=os.path.abspath(path))
+
+    def cases(self):
+        '''Returns: the paths of the cases held by the server'''
+        return self.request('cases')
+
+    def unload(self, path):
+        '''Returns: True if the server held the given case'''
+        return self.request('unload', path=os.path.abspath(path))
+
+    def table(self, path, table, columns=None):
+        '''Returns: a data frame of a table of the given case'''
+        return frame_from_json(self.request('table', path=os.path.abspath(path), table=table, columns=columns))
+
+    def lookup(self, path, table, **key):
+        '''Returns: a data frame of the rows of a table whose columns match the given values'''
+        return frame_from_json(self.request('lookup', path=os.path.abspath(path), table=table, key=key))
+
+    def diff(self, path_1, path_2):
+        '''Returns: the row counts, in both cases, of each table that differs'''
+        return self.request('diff', path_1=os.path.abspath(path_1), path_2=os.path.abspath(path_2))
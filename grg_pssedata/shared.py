@@ -0,0 +1,174 @@
+'''functions for sharing the numeric columns of a parsed case with worker
+processes, without copying them into each worker'''
+
+import collections
+
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# columns are placed on this boundary within a table's block
+ALIGNMENT = 64
+
+SharedColumn = collections.namedtuple('SharedColumn', ['name', 'dtype', 'offset'])
+SharedTable = collections.namedtuple('SharedTable', ['block', 'rows', 'columns'])
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def numeric_columns(table):
+    '''Returns: the names of the columns of a data frame that are held in shared memory'''
+    return [column for column, dtype in table.dtypes.items()
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biuf']
+
+
+class SharedCaseDescriptor(object):
+    def __init__(self, tables):
+        '''This data structure describes where the columns of a published
+        case are kept.  It is small and picklable, so it is what gets sent
+        to the worker processes.
+
+        Args:
+            tables (dict of SharedTable): the layout of each published table,
+                keyed by table name
+        '''
+
+        self.tables = tables
+
+    def __str__(self):
+        return 'shared case: {}'.format(', '.join(
+            '{} ({} rows, {} columns)'.format(name, table.rows, len(table.columns))
+            for name, table in self.tables.items()))
+
+
+class SharedCase(object):
+    def __init__(self, case):
+        '''This data structure copies the numeric columns of a case into one
+        shared memory block per table.  The publishing process owns the
+        blocks and is responsible for calling :func:`unlink` once the
+        workers are done.
+
+        Args:
+            case (CaseTables): the tables of a parsed case
+        '''
+
+        self.blocks = []
+        tables = collections.OrderedDict()
+        try:
+            for name, table in zip(case._fields, case):
+                tables[name] = self._publish_table(table)
+        except BaseException:
+            self.close()
+            self.unlink()
+            raise
+        self.descriptor = SharedCaseDescriptor(tables)
+
+    def _publish_table(self, table):
+        columns = []
+        size = 0
+        for column in numeric_columns(table):
+            dtype = table[column].dtype
+            offset = _aligned(size)
+            columns.append(SharedColumn(column, dtype.str, offset))
+            size = offset + dtype.itemsize*len(table)
+
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.blocks.append(block)
+        for column in columns:
+            view = np.ndarray((len(table),), dtype=column.dtype, buffer=block.buf, offset=column.offset)
+            view[:] = table[column.name].to_numpy()
+            del view
+
+        return SharedTable(block.name, len(table), columns)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        self.unlink()
+
+    def close(self):
+        '''releases this process's mapping of the blocks'''
+        for block in self.blocks:
+            block.close()
+
+    def unlink(self):
+        '''frees the blocks, attached workers keep their mappings until they close them'''
+        for block in self.blocks:
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks = []
+
+
+class AttachedCase(object):
+    def __init__(self, descriptor):
+        '''This data structure maps the blocks of a published case into the
+        current process.  Its columns are read-only numpy arrays that view
+        the shared memory directly.
+
+        Args:
+            descriptor (SharedCaseDescriptor): the layout of the published case
+        '''
+
+        self.descriptor = descriptor
+        self.blocks = {}
+        self.columns = {}
+        for name, table in descriptor.tables.items():
+            block = shared_memory.SharedMemory(name=table.block)
+            self.blocks[name] = block
+            arrays = collections.OrderedDict()
+            for column in table.columns:
+                array = np.ndarray((table.rows,), dtype=column.dtype, buffer=block.buf, offset=column.offset)
+                array.flags.writeable = False
+                arrays[column.name] = array
+            self.columns[name] = arrays
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def table(self, name):
+        '''Returns: a data frame of the shared columns of the given table'''
+        return pd.DataFrame(self.columns[name], copy=False)
+
+    def close(self):
+        '''releases the mappings, the arrays of this case are invalid afterwards'''
+        self.columns = {}
+        for block in self.blocks.values():
+            block.close()
+        self.blocks = {}
+
+
+def publish_case(case):
+    '''copies the numeric columns of a case into shared memory
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns:
+        SharedCase: the owner of the blocks, its descriptor is passed to workers
+    '''
+
+    return SharedCase(case)
+
+
+def attach_case(descriptor):
+    '''maps a published case into the current process
+
+    Args:
+        descriptor (SharedCaseDescriptor): the descriptor of a published case
+    Returns:
+        AttachedCase: read-only views of the case's numeric columns
+    '''
+
+    return AttachedCase(descriptor)
@@ -1,6 +1,10 @@
 '''data structures for encoding pss/e data files'''
 
 import os
+import sys
+import warnings
+
+from grg_pssedata.exception import PSSEDataWarning
 
 def _guard_none(fun, val):
     '''guards the application of a unary function for values taking None
@@ -19,6 +23,18 @@ def _guard_none(fun, val):
         return fun(val)
 
 
+def _slot_values(component):
+    '''collects the values of a slotted data structure, for comparisons
+
+    Args:
+        component: a data structure that defines __slots__
+    Returns:
+        a list of the slot values, None for slots that were never set
+    '''
+
+    return [getattr(component, name, None) for name in component.__slots__]
+
+
 def _set_defaults(args, defaults):
     assert(len(args) == len(defaults))
     for i,val in enumerate(defaults):
@@ -52,8 +68,9 @@ def _check_owners(component, component_type, component_id):
 
 
 def unquote_string(s):
-    '''strips single quotes from a PSSE string'''
-    return str(s).strip().strip('\'')
+    '''strips single quotes from a PSSE string, the result is interned since
+    names and identifiers repeat across components'''
+    return sys.intern(str(s).strip().strip('\''))
 
 def quote_string(s):
     '''adds PSSE single quotes to a string'''
@@ -73,6 +90,31 @@ def _psse_str(s):
     #    return str(s)
 
 CASE_DEFAULTS = [0, 100.0, 33, 0, 0, 60]
+# the component lists of a case in pss/e file order, with the line that ends
+# each section
+CASE_SECTIONS = [
+    ('buses', '0 / END OF BUS DATA, BEGIN LOAD DATA'),
+    ('loads', '0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA'),
+    ('fixed_shunts', '0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA'),
+    ('generators', '0 / END OF GENERATOR DATA, BEGIN BRANCH DATA'),
+    ('branches', '0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA'),
+    ('transformers', '0 / END OF TRANSFORMER DATA, BEGIN AREA DATA'),
+    ('areas', '0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA'),
+    ('tt_dc_lines', '0 / END OF TWO-TERMINAL DC DATA, BEGIN VOLTAGE SOURCE CONVERTER DATA'),
+    ('vsc_dc_lines', '0 / END OF VOLTAGE SOURCE CONVERTER DATA, BEGIN IMPEDANCE CORRECTION DATA'),
+    ('transformer_corrections', '0 / END OF IMPEDANCE CORRECTION DATA, BEGIN MULTI-TERMINAL DC DATA'),
+    ('mt_dc_lines', '0 / END OF MULTI-TERMINAL DC DATA, BEGIN MULTI-SECTION LINE DATA'),
+    ('line_groupings', '0 / END OF MULTI-SECTION LINE DATA, BEGIN ZONE DATA'),
+    ('zones', '0 / END OF ZONE DATA, BEGIN INTER-AREA TRANSFER DATA'),
+    ('transfers', '0 / END OF INTER-AREA TRANSFER DATA, BEGIN OWNER DATA'),
+    ('owners', '0 / END OF OWNER DATA, BEGIN FACTS CONTROL DEVICE DATA'),
+    ('facts', '0 / END OF FACTS CONTROL DEVICE DATA, BEGIN SWITCHED SHUNT DATA'),
+    ('switched_shunts', '0 / END OF SWITCHED SHUNT DATA, BEGIN GNE DEVICE DATA'),
+    ('gnes', '0 / END OF GNE DEVICE DATA, BEGIN INDUCTION MACHINE DATA'),
+    ('induction_machines', '0 / END INDUCTION MACHINE DATA'),
+]
+
+
 class Case(object):
     def __init__(self, ic, sbase, rev, xfrrat, nxfrat, basfrq, record1, record2,
         buses, loads, fixed_shunts, generators, branches, transformers, areas,
@@ -110,6 +152,9 @@ class Case(object):
             switched_shunts (list of SwitchedShunt): switched shunt devices
             gnes (list of TBD): general network elements
             induction_machines (list of TBD): induction machines
+
+        Each component list may also be a ComponentTable or TableSequence
+        of :mod:`grg_pssedata.tables`, whose rows are views of its columns.
         '''
 
         args = [ic, sbase, rev, xfrrat, nxfrat, basfrq]
@@ -267,100 +312,45 @@ class Case(object):
             for component in component_list:
                 component.validate()
 
-    def to_psse(self):
-        '''Returns: a pss/e encoding of this data structure as a string'''
+    def psse_chunks(self, chunk_rows=None):
+        '''encodes this data structure in pss/e format a few lines at a time,
+        so that a case can be written without holding all of its lines
+
+        Args:
+            chunk_rows (int): the most components encoded per chunk
+                (default = a whole section per chunk)
+        Returns:
+            a generator of lists of lines, in file order
+        '''
 
-        psse_lines = []
         case_datra = [str(self.ic), str(self.sbase), str(self.rev),
             str(self.xfrrat), str(self.nxfrat), str(self.basfrq)]
-        psse_lines.append(', '.join(case_datra))
-        psse_lines.append(self.record1)
-        psse_lines.append(self.record2)
-
-        for bus in self.buses:
-            psse_lines.append('  '+bus.to_psse())
-        psse_lines.append('0 / END OF BUS DATA, BEGIN LOAD DATA')
-
-        for load in self.loads:
-            psse_lines.append('  '+load.to_psse())
-        psse_lines.append('0 / END OF LOAD DATA, BEGIN FIXED SHUNT DATA')
-
-        for fixed_shunt in self.fixed_shunts:
-            psse_lines.append('  '+fixed_shunt.to_psse())
-        psse_lines.append('0 / END OF FIXED SHUNT DATA, BEGIN GENERATOR DATA')
-
-        for gen in self.generators:
-            psse_lines.append('  '+gen.to_psse())
-        psse_lines.append('0 / END OF GENERATOR DATA, BEGIN BRANCH DATA')
-
-        for branch in self.branches:
-            psse_lines.append('  '+branch.to_psse())
-        psse_lines.append('0 / END OF BRANCH DATA, BEGIN TRANSFORMER DATA')
-
-        for transformer in self.transformers:
-            psse_lines.append('  '+transformer.to_psse())
-        psse_lines.append('0 / END OF TRANSFORMER DATA, BEGIN AREA DATA')
-
-        for area in self.areas:
-            psse_lines.append('  '+area.to_psse())
-        psse_lines.append('0 / END OF AREA DATA, BEGIN TWO-TERMINAL DC DATA')
-
-        for tt_dc_line in self.tt_dc_lines:
-            psse_lines.append('  '+tt_dc_line.to_psse())
-        psse_lines.append('0 / END OF TWO-TERMINAL DC DATA, BEGIN VOLTAGE SOURCE CONVERTER DATA')
-
-        for vsc_dc_line in self.vsc_dc_lines:
-            psse_lines.append('  '+vsc_dc_line.to_psse())
-        psse_lines.append('0 / END OF VOLTAGE SOURCE CONVERTER DATA, BEGIN IMPEDANCE CORRECTION DATA')
+        yield [', '.join(case_datra), self.record1, self.record2]
 
-        for transformer_correction in self.transformer_corrections:
-            psse_lines.append('  '+transformer_correction.to_psse())
-        psse_lines.append('0 / END OF IMPEDANCE CORRECTION DATA, BEGIN MULTI-TERMINAL DC DATA')
+        for name, end in CASE_SECTIONS:
+            components = getattr(self, name)
+            step = chunk_rows if chunk_rows else max(len(components), 1)
+            for start in range(0, len(components), step):
+                yield ['  '+components[i].to_psse() for i in range(start, min(start + step, len(components)))]
+            yield [end]
 
-        for mt_dc_line in self.mt_dc_lines:
-            psse_lines.append('  '+mt_dc_line.to_psse())
-        psse_lines.append('0 / END OF MULTI-TERMINAL DC DATA, BEGIN MULTI-SECTION LINE DATA')
+        yield ['Q']
 
-        for line_grouping in self.line_groupings:
-            psse_lines.append('  '+line_grouping.to_psse())
-        psse_lines.append('0 / END OF MULTI-SECTION LINE DATA, BEGIN ZONE DATA')
-
-        for zone in self.zones:
-            psse_lines.append('  '+zone.to_psse())
-        psse_lines.append('0 / END OF ZONE DATA, BEGIN INTER-AREA TRANSFER DATA')
-
-        for transfer in self.transfers:
-            psse_lines.append('  '+transfer.to_psse())
-        psse_lines.append('0 / END OF INTER-AREA TRANSFER DATA, BEGIN OWNER DATA')
-
-        for owner in self.owners:
-            psse_lines.append('  '+owner.to_psse())
-        psse_lines.append('0 / END OF OWNER DATA, BEGIN FACTS CONTROL DEVICE DATA')
-
-        for fact in self.facts:
-            psse_lines.append('  '+fact.to_psse())
-        psse_lines.append('0 / END OF FACTS CONTROL DEVICE DATA, BEGIN SWITCHED SHUNT DATA')
-
-        for switched_shunt in self.switched_shunts:
-            psse_lines.append('  '+switched_shunt.to_psse())
-        psse_lines.append('0 / END OF SWITCHED SHUNT DATA, BEGIN GNE DEVICE DATA')
-
-        for gne in self.gnes:
-            psse_lines.append('  '+gne.to_psse())
-        psse_lines.append('0 / END OF GNE DEVICE DATA, BEGIN INDUCTION MACHINE DATA')
-
-        for induction_machine in self.induction_machines:
-            psse_lines.append('  '+induction_machine.to_psse())
-        psse_lines.append('0 / END INDUCTION MACHINE DATA')
-
-        psse_lines.append('Q')
+    def to_psse(self):
+        '''Returns: a pss/e encoding of this data structure as a string'''
 
+        psse_lines = []
+        for lines in self.psse_chunks():
+            psse_lines.extend(lines)
         return '\n'.join(psse_lines)
 
 
 
 BUS_DEFAULTS = ["            ", 0.0, 1, 1, 1, 1, 1.0, 0.0, 1.1, 0.9, 1.1, 0.9]
 class Bus(object):
+    __slots__ = ('i', 'name', 'basekv', 'ide', 'area', 'zone', 'owner', 'vm', 'va', 'nvhi', 'nvlo',
+                 'evhi', 'evlo')
+
     def __init__(self, i, name, basekv, ide, area, zone, owner, vm, va, nvhi=1.1, nvlo=0.9, evhi=1.1, evlo=0.9):
         '''This data structure contains bus parameters.
 
@@ -412,7 +402,7 @@ class Bus(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -458,6 +448,9 @@ class Bus(object):
 
 LOAD_DEFAULTS = [1, 1, 1, 1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1, 1, 0]
 class Load(object):
+    __slots__ = ('index', 'i', 'id', 'status', 'area', 'zone', 'pl', 'ql', 'ip', 'iq', 'yp', 'yq',
+                 'owner', 'scale', 'intrpt')
+
     def __init__(self, index, i, id, status, area, zone, pl, ql, ip, iq, yp, yq, owner, scale, intrpt="0"):
         '''This data structure contains load parameters.
 
@@ -516,7 +509,7 @@ class Load(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -547,6 +540,8 @@ class Load(object):
 
 FIXED_SHUNT_DEFAULTS = [1, 1, 0.0, 0.0]
 class FixedShunt(object):
+    __slots__ = ('index', 'i', 'id', 'status', 'gl', 'bl')
+
     def __init__(self, index, i, id, status, gl, bl):
         '''This data structure contains fixed shunt parameters
 
@@ -582,7 +577,7 @@ class FixedShunt(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -607,6 +602,10 @@ class FixedShunt(object):
 
 SWITCHED_SHUNT_DEFAULTS = [1, 0, 1, 1.0, 1.0, 0, 100.0, "", 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
 class SwitchedShunt(object):
+    __slots__ = ('index', 'i', 'modsw', 'adjm', 'stat', 'vswhi', 'vswlo', 'swrem', 'rmpct',
+                 'rmidnt', 'binit', 'n1', 'b1', 'n2', 'b2', 'n3', 'b3', 'n4', 'b4', 'n5', 'b5',
+                 'n6', 'b6', 'n7', 'b7', 'n8', 'b8')
+
     def __init__(self, index, i, modsw, adjm, stat, vswhi, vswlo, swrem, rmpct, rmidnt, binit, n1, b1,
                     n2=None, b2=None, n3=None, b3=None, n4=None, b4=None, n5=None, b5=None,
                     n6=None, b6=None, n7=None, b7=None, n8=None, b8=None):
@@ -692,7 +691,7 @@ class SwitchedShunt(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -737,6 +736,10 @@ class SwitchedShunt(object):
 
 GENERATOR_DEFAULTS = [1, 0.0, 0.0, 9999.0, -9999.0, 1.0, 0, 100.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1, 100.0, 9999.0, -9999.0, 1, 0, 0, 0, 1.0, 1.0, 1.0, 1.0, 0, 1.0]
 class Generator(object):
+    __slots__ = ('index', 'i', 'id', 'pg', 'qg', 'qt', 'qb', 'vs', 'ireg', 'mbase', 'zr', 'zx',
+                 'rt', 'xt', 'gtap', 'stat', 'rmpct', 'pt', 'pb', 'o1', 'f1', 'o2', 'f2', 'o3',
+                 'f3', 'o4', 'f4', 'wmod', 'wpf')
+
     def __init__(self, index, i, id, pg, qg, qt, qb, vs, ireg, mbase, zr, zx,
                     rt, xt, gtap, stat, rmpct, pt, pb, o1=1, f1=0, o2=0, f2=0, o3=1.0, f3=1.0, o4=1.0, f4=1.0,
                     wmod=0, wpf=1.0):
@@ -828,7 +831,7 @@ class Generator(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -873,6 +876,9 @@ class Generator(object):
 
 BRANCH_DEFAULTS = [1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1, 1, 0.0, 1, 1.0, 0, 1.0, 0, 1.0, 0, 1.0]
 class Branch(object):
+    __slots__ = ('index', 'i', 'j', 'ckt', 'r', 'x', 'b', 'ratea', 'rateb', 'ratec', 'gi', 'bi',
+                 'gj', 'bj', 'st', 'met', 'len', 'o1', 'f1', 'o2', 'f2', 'o3', 'f3', 'o4', 'f4')
+
     def __init__(self, index, i, j, ckt, r, x, b, ratea, rateb, ratec, gi, bi, gj, bj, st, met, len, o1, f1, o2=0, f2=1.0, o3=0, f3=1.0, o4=0, f4=1.0):
         '''This data structure contains branch parameters.
 
@@ -950,7 +956,7 @@ class Branch(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -995,6 +1001,8 @@ class Branch(object):
 
 
 class TwoWindingTransformer(object):
+    __slots__ = ('index', 'p1', 'p2', 'w1', 'w2')
+
     def __init__(self, index, p1, p2, w1, w2):
         '''This data structure contains two winding transformer parameters.
 
@@ -1027,7 +1035,7 @@ class TwoWindingTransformer(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1052,6 +1060,8 @@ class TwoWindingTransformer(object):
 
 
 class ThreeWindingTransformer(object):
+    __slots__ = ('index', 'p1', 'p2', 'w1', 'w2', 'w3')
+
     def __init__(self, index, p1, p2, w1, w2, w3):
         '''This data structure contains three winding transformer parameters.
 
@@ -1083,7 +1093,7 @@ class ThreeWindingTransformer(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1113,6 +1123,9 @@ class ThreeWindingTransformer(object):
 
 TRANSFORMER_FL_DEFAULTS = [0, 1, 1, 1, 1, 0.0, 0.0, 2, "            ", 1, 1, 1.0, 0, 1.0, 0, 1.0, 0, 1.0, "            "]
 class TransformerParametersFirstLine(object):
+    __slots__ = ('i', 'j', 'k', 'ckt', 'cw', 'cz', 'cm', 'mag1', 'mag2', 'nmetr', 'name', 'stat',
+                 'o1', 'f1', 'o2', 'f2', 'o3', 'f3', 'o4', 'f4', 'vecgrp')
+
     def __init__(self, i, j, k, ckt, cw, cz, cm, mag1, mag2, nmetr, name, stat, o1, f1, o2, f2, o3, f3, o4, f4, vecgrp="            "):
         '''This data structure contains transformer parameters that are common to two and three winding transformers.
 
@@ -1182,7 +1195,7 @@ class TransformerParametersFirstLine(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1221,6 +1234,9 @@ class TransformerParametersFirstLine(object):
 
 TRANSFORMER_SL_DEFAULTS = [0.0, 100.0, 0.0, 100.0, 0.0, 100.0, 1.0, 0.0]
 class TransformerParametersSecondLine(object):
+    __slots__ = ('r12', 'x12', 'sbase12', 'r23', 'x23', 'sbase23', 'r31', 'x31', 'sbase31',
+                 'vmstar', 'anstar')
+
     def __init__(self, r12, x12, sbase12, r23, x23, sbase23, r31, x31, sbase31, vmstar, anstar):
         '''This data structure contains transformer parameters for the second line of three winding transformers.
 
@@ -1268,7 +1284,7 @@ class TransformerParametersSecondLine(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1295,6 +1311,8 @@ class TransformerParametersSecondLine(object):
 
 TRANSFORMER_SLS_DEFAULTS = [0.0, 100.0]
 class TransformerParametersSecondLineShort(object):
+    __slots__ = ('r12', 'x12', 'sbase12')
+
     def __init__(self, r12, x12, sbase12):
         '''This data structure contains transformer parameters for the second line of two winding transformers.
 
@@ -1322,7 +1340,7 @@ class TransformerParametersSecondLineShort(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1346,6 +1364,9 @@ class TransformerParametersSecondLineShort(object):
 
 TRANSFORMER_WINDING_DEFAULTS = [1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 1.1, 0.9, 1.1, 0.9, 33, 0, 0.0, 0.0, 0.0]
 class TransformerWinding(object):
+    __slots__ = ('index', 'windv', 'nomv', 'ang', 'rata', 'ratb', 'ratc', 'cod', 'cont', 'rma',
+                 'rmi', 'vma', 'vmi', 'ntp', 'tab', 'cr', 'cx', 'cnxa')
+
     def __init__(self, index, windv, nomv, ang, rata, ratb, ratc, cod, cont, rma, rmi, vma, vmi, ntp, tab, cr, cx, cnxa=0.0):
         '''This data structure contains transformer winding parameters.
 
@@ -1409,7 +1430,7 @@ class TransformerWinding(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1422,7 +1443,7 @@ class TransformerWinding(object):
         specification
         '''
         winding_id = '{} winding {}'.format(transformer_id, self.index)
-        _check_range(self.index, 'winding index', 'transformer', self.transformer_id, 1, 3)
+        _check_range(self.index, 'winding index', 'transformer', transformer_id, 1, 3)
         _check_range(self.ang, 'angle shift', 'transformer', winding_id, -180.0, 180.0)
         _check_range(self.cod, 'control mode', 'transformer', winding_id, -5, 5)
         _check_range(self.cont, 'bus identifier', 'transformer', winding_id, 1, 999997)
@@ -1441,6 +1462,8 @@ class TransformerWinding(object):
 
 TRANSFORMER_WINDING_SHORT_DEFAULTS = [1.0, 0.0]
 class TransformerWindingShort(object):
+    __slots__ = ('index', 'windv', 'nomv')
+
     def __init__(self, index, windv, nomv):
         '''This data structure contains the shortend transformer winding
         parameters for the secondary side of a two winding transformer
@@ -1471,7 +1494,7 @@ class TransformerWindingShort(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1484,7 +1507,7 @@ class TransformerWindingShort(object):
         specification
         '''
         winding_id = '{} winding {}'.format(transformer_id, self.index)
-        _check_range(self.index, 'winding index', 'transformer', self.transformer_id, 1, 3)
+        _check_range(self.index, 'winding index', 'transformer', transformer_id, 1, 3)
 
     def to_psse(self):
         '''Returns: a pss/e encoding of this data structure as a string'''
@@ -1497,6 +1520,8 @@ class TransformerWindingShort(object):
 
 AREA_DEFAULTS = [0, 0.0, 10.0, "            "]
 class Area(object):
+    __slots__ = ('i', 'isw', 'pdes', 'ptol', 'arnam')
+
     def __init__(self, i, isw="0", pdes="0.0", ptol="0.0", arnam=''):
         '''This data structure contains area interchange parameters.
 
@@ -1529,7 +1554,7 @@ class Area(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1553,6 +1578,8 @@ class Area(object):
 
 ZONE_DEFAULTS = ["            "]
 class Zone(object):
+    __slots__ = ('i', 'zoname')
+
     def __init__(self, i, zoname):
         '''This data structure contains zone parameters.
 
@@ -1579,7 +1606,7 @@ class Zone(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1604,6 +1631,8 @@ class Zone(object):
 
 OWNER_DEFAULTS = ["            "]
 class Owner(object):
+    __slots__ = ('i', 'owname')
+
     def __init__(self, i, owname):
         '''This data structure contains owner parameters.
 
@@ -1629,7 +1658,7 @@ class Owner(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1653,6 +1682,10 @@ class Owner(object):
 
 FACTS_DEFAULTS = [0, 1, 0.0, 0.0, 1.0, 9999.0, 9999.0, 0.9, 1.1, 1.0, 0.0, 0.05, 100.0, 1, 0.0, 0.0, 0, 0, ""]
 class FACTSDevice(object):
+    __slots__ = ('index', 'name', 'i', 'j', 'mode', 'pdes', 'qdes', 'vset', 'shmx', 'trmx', 'vtmn',
+                 'vtmx', 'vsmx', 'imx', 'linx', 'rmpct', 'owner', 'set1', 'set2', 'vsref', 'remot',
+                 'mname')
+
     def __init__(self, index, name, i, j, mode, pdes, qdes, vset, shmx, trmx, vtmn, vtmx, vsmx, imx, linx, rmpct, owner, set1, set2, vsref, remot="0", mname=''):
         '''This data structure contains FACTS device parameters.
 
@@ -1724,7 +1757,7 @@ class FACTSDevice(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1750,6 +1783,8 @@ class FACTSDevice(object):
 
 
 class VSCDCLine(object):
+    __slots__ = ('index', 'params', 'c1', 'c2')
+
     def __init__(self, index, params, c1, c2):
         '''This data structure contains VSC DC Line parameters.
 
@@ -1774,7 +1809,7 @@ class VSCDCLine(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1797,6 +1832,8 @@ class VSCDCLine(object):
 
 VSC_DCL_DEFAULTS = [1, 1, 1.0, 0, 1.0, 0, 1.0, 0, 1.0]
 class VSCDCLineParameters(object):
+    __slots__ = ('name', 'mdc', 'rdc', 'o1', 'f1', 'o2', 'f2', 'o3', 'f3', 'o4', 'f4')
+
     def __init__(self, name, mdc, rdc, o1="0", f1="1", o2="0", f2="1", o3="0", f3="1", o4="0", f4="1"):
         '''This data structure contains VSC DC line first-line parameters
 
@@ -1836,7 +1873,7 @@ class VSCDCLineParameters(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1860,6 +1897,9 @@ class VSCDCLineParameters(object):
 
 VSC_DCC_DEFAULTS = [1, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 9999.0, -9999.0, 0, 100.0]
 class VSCDCLineConverter(object):
+    __slots__ = ('ibus', 'type', 'mode', 'dcset', 'acset', 'aloss', 'bloss', 'minloss', 'smax',
+                 'imax', 'pwf', 'maxq', 'minq', 'remot', 'rmpct')
+
     def __init__(self, ibus, type, mode, dcset, acset, aloss, bloss, minloss, smax, imax, pwf, maxq, minq, remot="0", rmpct="100.0"):
         '''This data structure contains VSC DC Line Converter parameters
 
@@ -1915,7 +1955,7 @@ class VSCDCLineConverter(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1939,6 +1979,8 @@ class VSCDCLineConverter(object):
 
 
 class TwoTerminalDCLine(object):
+    __slots__ = ('index', 'params', 'rectifier', 'inverter')
+
     def __init__(self, index, params, rectifier, inverter):
         '''This data structure contains Two-Terminal DC Line parameters.
 
@@ -1963,7 +2005,7 @@ class TwoTerminalDCLine(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -1985,6 +2027,9 @@ class TwoTerminalDCLine(object):
 
 TTDCL_PARAMETER_DEFAULTS = [0, 0.0, 0.0, 0.0, "I", 0.0, 20, 1.0]
 class TwoTerminalDCLineParameters(object):
+    __slots__ = ('name', 'mdc', 'rdc', 'setvl', 'vschd', 'vcmod', 'rcomp', 'delti', 'meter',
+                 'dcvmin', 'cccitmx', 'cccacc')
+
     def __init__(self, name, mdc, rdc, setvl, vschd, vcmod, rcomp, delti, meter, dcvmin, cccitmx, cccacc):
         '''This data structure contains Two-Terminal DC Line parameters for the first line of the data entry
 
@@ -2034,7 +2079,7 @@ class TwoTerminalDCLineParameters(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2060,6 +2105,9 @@ class TwoTerminalDCLineParameters(object):
 
 TTDCL_RECTIFIER_DEFAULTS = [1.0, 1.0, 1.5, 0.51, 0.00625, 0, 0, 0, "1", 0.0]
 class TwoTerminalDCLineRectifier(object):
+    __slots__ = ('ipr', 'nbr', 'anmxr', 'anmnr', 'rcr', 'xcr', 'ebasr', 'trr', 'tapr', 'tmxr',
+                 'tmnr', 'stpr', 'icr', 'ifr', 'itr', 'idr', 'xcapr')
+
     def __init__(self, ipr, nbr, anmxr, anmnr, rcr, xcr, ebasr, trr, tapr, tmxr, tmnr, stpr, icr, ifr, itr, idr, xcapr):
         '''This data structure contains Two-Terminal DC Line parameters for the Rectifier (second line)
 
@@ -2121,7 +2169,7 @@ class TwoTerminalDCLineRectifier(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2149,6 +2197,9 @@ class TwoTerminalDCLineRectifier(object):
 
 TTDCL_INVERTER_DEFAULTS = [1.0, 1.0, 1.5, 0.51, 0.00625, 0, 0, 0, "1", 0.0]
 class TwoTerminalDCLineInverter(object):
+    __slots__ = ('ipi', 'nbi', 'anmxi', 'anmni', 'rci', 'xci', 'ebasi', 'tri', 'tapi', 'tmxi',
+                 'tmni', 'stpi', 'ici', 'ifi', 'iti', 'idi', 'xcapi')
+
     def __init__(self, ipi, nbi, anmxi, anmni, rci, xci, ebasi, tri, tapi, tmxi, tmni, stpi, ici, ifi, iti, idi, xcapi):
         '''This data structure contains Two-Terminal DC Line parameters for the Inverter (third line)
 
@@ -2210,7 +2261,7 @@ class TwoTerminalDCLineInverter(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2237,6 +2288,9 @@ class TwoTerminalDCLineInverter(object):
 
 IMPEDANCE_CORRECTION_DEFAULTS = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
 class TransformerImpedanceCorrection(object):
+    __slots__ = ('index', 'i', 't1', 'f1', 't2', 'f2', 't3', 'f3', 't4', 'f4', 't5', 'f5', 't6',
+                 'f6', 't7', 'f7', 't8', 'f8', 't9', 'f9', 't10', 'f10', 't11', 'f11')
+
     def __init__(self, index, i, t1="0.0", f1="0.0", t2="0.0", f2="0.0", t3="0.0", f3="0.0", t4="0.0", f4="0.0", t5="0.0", f5="0.0", t6="0.0", f6="0.0", t7="0.0", f7="0.0", t8="0.0", f8="0.0", t9="0.0", f9="0.0", t10="0.0", f10="0.0", t11="0.0", f11="0.0"):
         '''This data structure contains Transformer Impedence Correction Table parameters
 
@@ -2292,7 +2346,7 @@ class TransformerImpedanceCorrection(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2319,6 +2373,9 @@ class TransformerImpedanceCorrection(object):
 
 MULTISECTION_LINE_DEFAULTS = ["&1", 1]
 class MultiSectionLineGrouping(object):
+    __slots__ = ('index', 'i', 'j', 'id', 'met', 'dum1', 'dum2', 'dum3', 'dum4', 'dum5', 'dum6',
+                 'dum7', 'dum8', 'dum9')
+
     def __init__(self, index, i, j, id, met, *dumi):
         '''This data structure contains Multi-Section Line Grouping parameters
 
@@ -2372,7 +2429,7 @@ class MultiSectionLineGrouping(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2402,6 +2459,8 @@ class MultiSectionLineGrouping(object):
 
 INTERAREA_TRANSFER_DEFAULTS = [1, 0.0]
 class InterareaTransfer(object):
+    __slots__ = ('index', 'arfrom', 'arto', 'trid', 'ptran')
+
     def __init__(self, index, arfrom, arto, trid, ptran):
         '''This data structure contains Interarea Transfer parameters
 
@@ -2433,7 +2492,7 @@ class InterareaTransfer(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2457,6 +2516,11 @@ class InterareaTransfer(object):
 
 INDUCTION_MACHINE_DEFAULTS = [1, 1, 1, 2, 1, 1, 1, 1, 1, 100.0, 0.0, 1, 1.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0, 2.5, 999.0, 999.0, 999.0, 999.0, 0.0, 1.0, 0.0, 1.2, 0.0, 0.0, 0.0, 1]
 class InductionMachine(object):
+    __slots__ = ('index', 'i', 'id', 'stat', 'scode', 'dcode', 'area', 'zone', 'owner', 'tcode',
+                 'bcode', 'mbase', 'ratekv', 'pcode', 'pset', 'h', 'a', 'b', 'd', 'e', 'ra', 'xa',
+                 'xm', 'r1', 'x1', 'r2', 'x2', 'x3', 'e1', 'se1', 'e2', 'se2', 'ia1', 'ia2',
+                 'xamult')
+
     def __init__(self, index, i, id, stat, scode, dcode, area, zone, owner, tcode, bcode, mbase,
                     ratekv, pcode, pset, h, a, b, d, e, ra, xa, xm, r1, x1, r2, x2, x3, e1, se1,
                     e2, se2, ia1, ia2, xamult):
@@ -2558,7 +2622,7 @@ class InductionMachine(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2585,6 +2649,8 @@ class InductionMachine(object):
 
 
 class MultiTerminalDCLine(object):
+    __slots__ = ('index', 'params', 'converters', 'dc_buses', 'dc_links')
+
     def __init__(self, index, params, nconv, ndcbs, ndcln):
         '''This data structure contains Multi-Terminal DC Line parameters
 
@@ -2613,7 +2679,7 @@ class MultiTerminalDCLine(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2638,6 +2704,8 @@ class MultiTerminalDCLine(object):
 
 MTDCL_PARAMETER_DEFAULTS = [0, 0.0, 0]
 class MultiTerminalDCLineParameters(object):
+    __slots__ = ('name', 'nconv', 'ndcbs', 'ndcln', 'mdc', 'vconv', 'vcmod', 'vconvn')
+
     def __init__(self, name, nconv, ndcbs, ndcln, mdc, vconv, vcmod, vconvn):
         '''This data structure contains MultiTerminal DC Line first-line parameters
 
@@ -2675,7 +2743,7 @@ class MultiTerminalDCLineParameters(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2698,6 +2766,9 @@ class MultiTerminalDCLineParameters(object):
 
 MTDCL_CONVERTER_DEFAULTS = [1.0, 1.0, 1.5, 0.51, 0.00625, 1, 0.0, 1]
 class MultiTerminalDCLineConverter(object):
+    __slots__ = ('ib', 'n', 'angmx', 'angmn', 'rc', 'xc', 'ebas', 'tr', 'tap', 'tpmx', 'tpmn',
+                 'tstp', 'setvl', 'dcpf', 'marg', 'cnvcod')
+
     def __init__(self, ib, n, angmx, angmn, rc, xc, ebas, tr, tap, tpmx, tpmn, tstp, setvl, dcpf, marg, cnvcod):
         '''This data structure contains MultiTerminal DC Line Converter parameters
 
@@ -2755,7 +2826,7 @@ class MultiTerminalDCLineConverter(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2780,6 +2851,8 @@ class MultiTerminalDCLineConverter(object):
 
 MTDCL_BUS_DEFAULTS = [0.0, 1, 1, "            ", 0, 0.0, 1]
 class MultiTerminalDCLineDCBus(object):
+    __slots__ = ('idc', 'ib', 'area', 'zone', 'dcname', 'idc2', 'rgrnd', 'owner')
+
     def __init__(self, idc, ib, area, zone, dcname, idc2, rgrnd, owner):
         '''This data structure contains MultiTerminal DC Line DC Bus parameters
 
@@ -2818,7 +2891,7 @@ class MultiTerminalDCLineDCBus(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -2840,6 +2913,8 @@ class MultiTerminalDCLineDCBus(object):
 
 MTDCL_LINE_DEFAULTS = [1, 1, 0.0]
 class MultiTerminalDCLineDCLink(object):
+    __slots__ = ('idc', 'jdc', 'dcckt', 'met', 'rdc', 'ldc')
+
     def __init__(self, idc, jdc, dcckt, met, rdc, ldc):
         '''This data structure contains MultiTerminal DC Line DC Link parameters
 
@@ -2873,7 +2948,7 @@ class MultiTerminalDCLineDCLink(object):
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
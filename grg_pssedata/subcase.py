@@ -0,0 +1,126 @@
+'''extraction of a self-consistent part of a parsed psse case, selected by
+area, zone or bus number, with array masks over the tables'''
+
+import numpy as np
+
+# the columns of the components that must all be selected buses for the
+# component to be kept, a bus number of 0 means none (kbus of a two
+# winding transformer, jbus of a shunt facts device)
+COMPONENT_BUSES = {
+    'load': ['ibus'],
+    'generator': ['ibus'],
+    'acline': ['ibus', 'jbus'],
+    'transformer3w': ['ibus', 'jbus', 'kbus'],
+    'transformer2w': ['ibus', 'jbus', 'kbus'],
+    'twotermdc': ['ipr', 'ipi'],
+    'vscdc': ['ibus1', 'ibus2'],
+    'facts': ['ibus', 'jbus'],
+    'fixshunt': ['ibus'],
+    'swshunt': ['ibus'],
+}
+
+# the columns of the components that refer to a bus other than their own,
+# a reference to a bus that is not selected is set to 0, which means none
+# or the component's own bus, the sign of a transformer control bus gives
+# the side of the controlled voltage
+REMOTE_BUSES = {
+    'generator': ['ireg'],
+    'transformer3w': ['cont1', 'cont2', 'cont3'],
+    'transformer2w': ['cont1'],
+    'twotermdc': ['icr', 'ifr', 'itr', 'ici', 'ifi', 'iti'],
+    'vscdc': ['remote1', 'remote2'],
+    'facts': ['remote'],
+    'swshunt': ['swrem'],
+    'area': ['isw'],
+}
+
+# the columns of the components that refer to an owner
+OWNER_COLUMNS = {
+    'bus': ['owner'],
+    'load': ['owner'],
+    'generator': ['o1', 'o2', 'o3', 'o4'],
+    'acline': ['o1', 'o2', 'o3', 'o4'],
+    'transformer3w': ['o1', 'o2', 'o3', 'o4'],
+    'transformer2w': ['o1', 'o2', 'o3', 'o4'],
+    'vscdc': ['o1', 'o2', 'o3', 'o4'],
+    'facts': ['owner'],
+}
+
+
+def _integers(table, column):
+    # the values of a column as int64, empty values are 0
+    values = table[column].to_numpy()
+    if values.dtype.kind not in 'biu':
+        values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    return values.astype(np.int64)
+
+
+def selected_buses(case, areas=None, zones=None, buses=None):
+    '''selects the buses of a case that are in one of the areas, in one of
+    the zones or in the bus numbers, the selections that are None are not used
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        areas (list): area numbers
+        zones (list): zone numbers
+        buses (list): bus numbers
+    Returns (array):
+        a mask of the selected rows of the bus table
+    '''
+
+    bus = case.bus
+    mask = np.zeros(len(bus), dtype=bool)
+    for column, numbers in (('area', areas), ('zone', zones), ('ibus', buses)):
+        if numbers is not None:
+            mask |= np.isin(_integers(bus, column), np.asarray(list(numbers), dtype=np.int64))
+    return mask
+
+
+def extract_subcase(case, areas=None, zones=None, buses=None):
+    '''extracts the part of a case on a selection of buses, see
+    :func:`selected_buses`.  The subcase keeps the selected buses, the
+    loads, generators and shunts on them, the branches, transformers, dc
+    lines and facts devices with all of their buses selected, and the
+    areas, zones and owners that the kept components refer to.  Remote
+    regulated and controlled buses that are not selected are set to 0.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        areas (list): area numbers
+        zones (list): zone numbers
+        buses (list): bus numbers
+    Returns:
+        CaseTables: the subcase, with the header of the case, it can be
+        written with :func:`grg_pssedata.io.write_psse`
+    '''
+
+    bus = case.bus[selected_buses(case, areas, zones, buses)]
+    numbers = np.append(_integers(bus, 'ibus'), 0)
+
+    tables = {'bus': bus}
+    for name, columns in COMPONENT_BUSES.items():
+        table = getattr(case, name)
+        mask = np.ones(len(table), dtype=bool)
+        for column in columns:
+            mask &= np.isin(_integers(table, column), numbers)
+        tables[name] = table[mask]
+
+    areas = np.concatenate([_integers(tables[name], 'area') for name in ('bus', 'load')])
+    zones = np.concatenate([_integers(tables[name], 'zone') for name in ('bus', 'load')])
+    owners = np.concatenate([_integers(tables[name], column)
+        for name, columns in OWNER_COLUMNS.items() for column in columns])
+    for name, column, referenced in (('area', 'iarea', areas), ('zone', 'izone', zones), ('owner', 'iowner', owners)):
+        table = getattr(case, name)
+        tables[name] = table[np.isin(_integers(table, column), referenced)]
+
+    for name, columns in REMOTE_BUSES.items():
+        table = tables[name]
+        outside = [column for column in columns if column in table.columns
+            and not np.isin(np.abs(_integers(table, column)), numbers).all()]
+        if len(outside) > 0:
+            table = table.copy()
+            for column in outside:
+                table.loc[~np.isin(np.abs(_integers(table, column)), numbers), column] = 0
+            tables[name] = table
+
+    return case._replace(**{name: table.reset_index(drop=True) for name, table in tables.items()})
@@ -0,0 +1,998 @@
+'''column-oriented storage of pss/e components, with light-weight row views
+that present the same attributes as the data structures of
+:mod:`grg_pssedata.struct`'''
+
+import collections
+import hashlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+from grg_pssedata.struct import Area
+from grg_pssedata.struct import Branch
+from grg_pssedata.struct import Bus
+from grg_pssedata.struct import FACTSDevice
+from grg_pssedata.struct import FixedShunt
+from grg_pssedata.struct import Generator
+from grg_pssedata.struct import Load
+from grg_pssedata.struct import MultiSectionLineGrouping
+from grg_pssedata.struct import Owner
+from grg_pssedata.struct import SwitchedShunt
+from grg_pssedata.struct import ThreeWindingTransformer
+from grg_pssedata.struct import TransformerParametersFirstLine
+from grg_pssedata.struct import TransformerParametersSecondLine
+from grg_pssedata.struct import TransformerParametersSecondLineShort
+from grg_pssedata.struct import TransformerWinding
+from grg_pssedata.struct import TransformerWindingShort
+from grg_pssedata.struct import TwoTerminalDCLine
+from grg_pssedata.struct import TwoTerminalDCLineInverter
+from grg_pssedata.struct import TwoTerminalDCLineParameters
+from grg_pssedata.struct import TwoTerminalDCLineRectifier
+from grg_pssedata.struct import TwoWindingTransformer
+from grg_pssedata.struct import VSCDCLine
+from grg_pssedata.struct import VSCDCLineConverter
+from grg_pssedata.struct import VSCDCLineParameters
+from grg_pssedata.struct import Zone
+
+# the component class of each table of a parsed case
+TABLE_COMPONENTS = collections.OrderedDict([
+    ('bus', Bus), ('load', Load), ('generator', Generator), ('acline', Branch),
+    ('transformer3w', ThreeWindingTransformer), ('transformer2w', TwoWindingTransformer),
+    ('twotermdc', TwoTerminalDCLine), ('vscdc', VSCDCLine), ('facts', FACTSDevice),
+    ('fixshunt', FixedShunt), ('swshunt', SwitchedShunt), ('area', Area),
+    ('zone', Zone), ('owner', Owner),
+])
+
+# columns that hold bus numbers, these are int32 in compact tables
+BUS_NUMBER_COLUMNS = set(['ibus', 'jbus', 'kbus', 'ireg', 'cont1', 'cont2', 'cont3',
+    'swrem', 'ipr', 'ipi', 'icr', 'ici', 'ifr', 'ifi', 'itr', 'iti', 'ibus1', 'ibus2',
+    'remote', 'remote1', 'remote2', 'iarea', 'izone', 'iowner'])
+
+# columns that hold status, type and control codes, these are int8 in compact tables
+CODE_COLUMNS = set(['ide', 'stat', 'cw', 'cz', 'cm', 'nmet', 'met', 'cod1', 'cod2',
+    'cod3', 'mdc', 'modsw', 'adjm', 'isw', 'mode', 'type1', 'type2', 'mode1',
+    'mode2', 'wmod', 'scale', 'intrpt', 'nbr', 'nbi'])
+
+# columns that hold whole numbers, a float column of these is written
+# without a fraction
+INTEGER_COLUMNS = BUS_NUMBER_COLUMNS | CODE_COLUMNS | set('n%d' % block for block in range(1, 9))
+
+# columns of repeated strings, these are categoricals in compact tables
+CATEGORY_COLUMNS = set(['name', 'ckt', 'machid', 'loadid', 'shntid', 'vecgrp'])
+
+# the relative error a float column may take when it is stored as float32,
+# None only allows columns whose values keep their shortest decimal text, so
+# nothing that was written in the data file is lost
+FLOAT32_RTOL = None
+
+# the dtype policies of parsed tables, None keeps the types pandas infers
+DTYPE_POLICIES = [None, 'compact']
+
+# the precision policies of written floats, besides a printf format such as
+# '%.6g', None writes the shortest text that parses back to the same float
+# and 'psse' writes 6 significant digits as '%.6g' does, with zeros written
+# as 0.0
+PRECISION_POLICIES = [None, 'psse']
+
+# the largest bus number that is renumbered through a direct lookup array
+# rather than a binary search, pss/e bus numbers are at most 999997
+DIRECT_LOOKUP_LIMIT = 1<<20
+
+# the bus columns of the components, a kbus of 0 marks a two winding
+# transformer and is renumbered to -1
+BUS_ENDPOINT_COLUMNS = ['ibus', 'jbus', 'kbus']
+
+# the columns that identify a component in each table of a parsed case
+PRIMARY_KEYS = collections.OrderedDict([
+    ('bus', ['ibus']),
+    ('load', ['ibus', 'loadid']),
+    ('generator', ['ibus', 'machid']),
+    ('acline', ['ibus', 'jbus', 'ckt']),
+    ('transformer3w', ['ibus', 'jbus', 'kbus', 'ckt']),
+    ('transformer2w', ['ibus', 'jbus', 'kbus', 'ckt']),
+    ('twotermdc', ['name']),
+    ('vscdc', ['name']),
+    ('facts', ['name']),
+    ('fixshunt', ['ibus', 'shntid']),
+    ('swshunt', ['ibus']),
+    ('area', ['iarea']),
+    ('zone', ['izone']),
+    ('owner', ['iowner']),
+])
+
+# columns that are written as quoted strings in a pss/e file
+QUOTED_COLUMNS = set(['name', 'loadid', 'shntid', 'machid', 'ckt', 'vecgrp', 'arname',
+    'zoname', 'owname', 'mname', 'idr', 'idi', 'rmidnt'])
+
+# the first column of each record after the first, for the tables whose
+# components span several lines of a pss/e file
+RECORD_STARTS = {
+    'transformer2w': ['r1_2', 'windv1', 'windv2'],
+    'transformer3w': ['r1_2', 'windv1', 'windv2', 'windv3'],
+    'twotermdc': ['ipr', 'ipi'],
+    'vscdc': ['ibus1', 'ibus2'],
+}
+
+# trailing column pairs that are only written when both values are given
+OPTIONAL_PAIRS = {
+    'swshunt': [('n%d' % block, 'b%d' % block) for block in range(2, 9)],
+}
+
+# the parts of the components that are made of other data structures, with
+# the index each part takes in the component (None when it has no index)
+COMPONENT_PARTS = {
+    TwoWindingTransformer: [('p1', TransformerParametersFirstLine, None),
+        ('p2', TransformerParametersSecondLineShort, None),
+        ('w1', TransformerWinding, 1), ('w2', TransformerWindingShort, 2)],
+    ThreeWindingTransformer: [('p1', TransformerParametersFirstLine, None),
+        ('p2', TransformerParametersSecondLine, None),
+        ('w1', TransformerWinding, 1), ('w2', TransformerWinding, 2), ('w3', TransformerWinding, 3)],
+    TwoTerminalDCLine: [('params', TwoTerminalDCLineParameters, None),
+        ('rectifier', TwoTerminalDCLineRectifier, None), ('inverter', TwoTerminalDCLineInverter, None)],
+    VSCDCLine: [('params', VSCDCLineParameters, None),
+        ('c1', VSCDCLineConverter, None), ('c2', VSCDCLineConverter, None)],
+}
+
+# fields that a component only has when they are given, these are None in
+# a table and raise AttributeError on a row view
+OPTIONAL_FIELDS = {
+    MultiSectionLineGrouping: set('dum{}'.format(i) for i in range(1, 10)),
+}
+
+# the members of a component class that are not copied onto its row views
+_VIEW_EXCLUDED = set(['__init__', '__eq__', '__ne__', '__slots__', '__dict__',
+    '__weakref__', '__module__', '__qualname__', '__doc__'])
+
+
+def component_fields(component_class):
+    '''Returns: the names of the fields of a component, in the order of its
+    __df__ encoding, without its index'''
+    return [name for name in component_class.__slots__ if name != 'index']
+
+
+def component_columns(component_class):
+    '''Returns: the names of the columns of a component table, part fields
+    are prefixed with the name of their part'''
+
+    if component_class in COMPONENT_PARTS:
+        return ['{}.{}'.format(part, field)
+            for part, part_class, part_index in COMPONENT_PARTS[component_class]
+            for field in component_fields(part_class)]
+    return component_fields(component_class)
+
+
+def _column_array(values):
+    array = np.array(values)
+    if array.dtype.kind not in 'biuf':
+        array = np.array(values, dtype=object)
+    return array
+
+
+def _scalar(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _field_property(position, optional):
+    def get(self):
+        value = _scalar(self._table.arrays[position][self._row])
+        if optional and value is None:
+            raise AttributeError('field is not set')
+        return value
+
+    def set(self, value):
+        self._table.arrays[position][self._row] = value
+
+    return property(get, set)
+
+
+def _part_property(view_class):
+    def get(self):
+        return view_class(self._table, self._row)
+    return property(get)
+
+
+def _index_property(index):
+    def get(self):
+        if index is not None:
+            return index
+        return _scalar(self._table.index[self._row])
+    return property(get)
+
+
+def _view_eq(self, other):
+    if isinstance(other, (self.__class__, self._component_class)):
+        return all(getattr(self, field, None) == getattr(other, field, None)
+            for field in self._fields)
+    return NotImplemented
+
+
+def _view_ne(self, other):
+    equal = self.__eq__(other)
+    if equal is NotImplemented:
+        return NotImplemented
+    return not equal
+
+
+_view_classes = {}
+
+def row_view_class(component_class, offset=0, index=None):
+    '''builds the class of the row views of a component table, these keep a
+    reference to the table and a row number and no other state
+
+    Args:
+        component_class: a class of grg_pssedata.struct
+        offset (int): the position of the component's first column in the table
+        index (int): a constant index of the component, as used by
+            transformer windings (optional)
+    Returns:
+        a class with the same attributes and methods as the component class
+    '''
+
+    key = (component_class, offset, index)
+    if key in _view_classes:
+        return _view_classes[key]
+
+    namespace = {name: value for name, value in component_class.__dict__.items()
+        if name not in _VIEW_EXCLUDED and name not in component_class.__slots__}
+    namespace['__slots__'] = ('_table', '_row')
+    namespace['__eq__'] = _view_eq
+    namespace['__ne__'] = _view_ne
+    namespace['__hash__'] = None
+    namespace['_component_class'] = component_class
+    namespace['_fields'] = tuple(component_class.__slots__)
+
+    if 'index' in component_class.__slots__:
+        namespace['index'] = _index_property(index)
+
+    if component_class in COMPONENT_PARTS:
+        position = offset
+        for part, part_class, part_index in COMPONENT_PARTS[component_class]:
+            namespace[part] = _part_property(row_view_class(part_class, position, part_index))
+            position += len(component_fields(part_class))
+    else:
+        optional = OPTIONAL_FIELDS.get(component_class, set())
+        for position, field in enumerate(component_fields(component_class)):
+            namespace[field] = _field_property(offset+position, field in optional)
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+    namespace['__init__'] = __init__
+
+    view_class = type(component_class.__name__+'View', (object,), namespace)
+    _view_classes[key] = view_class
+    return view_class
+
+
+class ComponentTable(object):
+    def __init__(self, component_class, arrays, index=None):
+        '''This data structure stores the components of one type as one array
+        per field.  Indexing it returns row views, which present the
+        attributes and methods of the component class without copying its
+        fields, so memory does not depend on how many rows are visited.
+
+        Args:
+            component_class: the class of grg_pssedata.struct the rows represent
+            arrays (list): one array per column, in the order of
+                :func:`component_columns`
+            index (array): the index of each row (default = the row numbers)
+        '''
+
+        self.component_class = component_class
+        self.columns = component_columns(component_class)
+        if len(arrays) != len(self.columns):
+            raise ValueError('{} columns were given for {}, which has {}'.format(
+                len(arrays), component_class.__name__, len(self.columns)))
+        self.arrays = [np.asarray(array) for array in arrays]
+        self.length = len(self.arrays[0]) if len(self.arrays) > 0 else 0
+        for column, array in zip(self.columns, self.arrays):
+            if len(array) != self.length:
+                raise ValueError('column {} has {} rows, expected {}'.format(column, len(array), self.length))
+        if index is None:
+            index = np.arange(self.length)
+        self.index = np.asarray(index)
+        self.view_class = row_view_class(component_class)
+
+    @classmethod
+    def from_components(cls, component_class, components):
+        '''builds a table from a list of component data structures
+
+        Args:
+            component_class: the class of the components
+            components (list): the data structures
+        Returns:
+            ComponentTable: the table of the components
+        '''
+
+        if component_class in COMPONENT_PARTS:
+            getters = [(part, field)
+                for part, part_class, part_index in COMPONENT_PARTS[component_class]
+                for field in component_fields(part_class)]
+            arrays = [_column_array([getattr(getattr(c, part), field) for c in components])
+                for part, field in getters]
+        else:
+            arrays = [_column_array([getattr(c, field, None) for c in components])
+                for field in component_fields(component_class)]
+
+        index = None
+        if 'index' in component_class.__slots__:
+            index = _column_array([c.index for c in components])
+        return cls(component_class, arrays, index)
+
+    @classmethod
+    def from_frame(cls, component_class, frame):
+        '''builds a table from a data frame whose columns are in the order
+        of the component's __df__ encoding, such as a parsed case table, the
+        columns are copied so that the table can be changed through its views
+
+        Args:
+            component_class: the class of the components
+            frame (DataFrame): the table of the components
+        Returns:
+            ComponentTable: the table of the components
+        '''
+
+        arrays = []
+        for column in frame.columns[:len(component_columns(component_class))]:
+            series = frame[column]
+            if series.dtype.kind == 'f' and column in INTEGER_COLUMNS:
+                # integer columns with missing values, such as the trailing
+                # switched shunt blocks, are parsed as floats
+                arrays.append(np.array([None if np.isnan(value) else int(value)
+                    for value in series.to_numpy()], dtype=object))
+            elif series.dtype.kind in 'biuf':
+                arrays.append(series.to_numpy(copy=True))
+            else:
+                arrays.append(series.to_numpy(dtype=object))
+        while len(arrays) < len(component_columns(component_class)):
+            arrays.append(np.full(len(frame), None, dtype=object))
+        return cls(component_class, arrays, frame.index.to_numpy())
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        view_class = self.view_class
+        for row in range(self.length):
+            yield view_class(self, row)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self.view_class(self, r) for r in range(*row.indices(self.length))]
+        if row < 0:
+            row += self.length
+        if row < 0 or row >= self.length:
+            raise IndexError('row {} is out of range for a table of {} rows'.format(row, self.length))
+        return self.view_class(self, row)
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return (self.component_class == other.component_class and
+                self.length == other.length and
+                np.array_equal(self.index, other.index) and
+                all(np.array_equal(a, b) for a, b in zip(self.arrays, other.arrays)))
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def __str__(self):
+        return '{} table of {} rows'.format(self.component_class.__name__, self.length)
+
+    def column(self, name):
+        '''Returns: the array of the given column, changes to it are seen by the row views'''
+        return self.arrays[self.columns.index(name)]
+
+    def to_frame(self, columns=None):
+        '''builds a data frame of the table
+
+        Args:
+            columns (list): the names of the data frame columns (default = the table column names)
+        Returns:
+            DataFrame: a copy of the table
+        '''
+
+        if columns is None:
+            columns = self.columns
+        data = collections.OrderedDict(zip(columns, self.arrays))
+        return pd.DataFrame(data, index=self.index)
+
+
+def _fits(values, dtype):
+    if len(values) == 0:
+        return True
+    info = np.iinfo(dtype)
+    return values.min() >= info.min and values.max() <= info.max
+
+
+def compact_column(name, column, rtol=FLOAT32_RTOL):
+    '''converts a column to the compact dtype policy, columns that would
+    lose information keep their type
+
+    Args:
+        name (str): the name of the column, which selects its policy
+        column (Series): the column
+        rtol (float): the relative error allowed for float32 columns (see FLOAT32_RTOL)
+    Returns:
+        Series: the compact column
+    '''
+
+    if pd.api.types.is_bool_dtype(column.dtype):
+        return column
+
+    if pd.api.types.is_integer_dtype(column.dtype):
+        values = column.to_numpy()
+        dtype = np.int8 if name in CODE_COLUMNS else np.int32
+        for candidate in (dtype, np.int32):
+            if _fits(values, candidate):
+                return column.astype(candidate)
+        return column
+
+    if pd.api.types.is_float_dtype(column.dtype):
+        values = column.to_numpy()
+        compact = values.astype(np.float32)
+        if rtol is None:
+            preserved = np.array_equal(compact.astype(str).astype(np.float64), values, equal_nan=True)
+        else:
+            preserved = np.allclose(compact, values, rtol=rtol, atol=0.0, equal_nan=True)
+        if preserved:
+            return column.astype(np.float32)
+        return column
+
+    if name in CATEGORY_COLUMNS and pd.api.types.is_string_dtype(column.dtype):
+        return column.astype('category')
+
+    return column
+
+
+def compact_table(table, rtol=FLOAT32_RTOL):
+    '''Returns: a copy of a parsed table with the compact dtype policy applied to each column'''
+    return pd.DataFrame(collections.OrderedDict((name, compact_column(name, table[name], rtol))
+        for name in table.columns), index=table.index)
+
+
+def compact_case(case, rtol=FLOAT32_RTOL):
+    '''applies the compact dtype policy to every table of a parsed case
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        rtol (float): the relative error allowed for float32 columns
+    Returns:
+        CaseTables: the compact tables
+    '''
+
+    return case._replace(**{name: compact_table(table, rtol) for name, table in zip(case._fields, case)})
+
+
+def apply_dtypes(case, dtypes):
+    '''Returns: the tables of a parsed case under the given dtype policy, one of DTYPE_POLICIES'''
+    if dtypes not in DTYPE_POLICIES:
+        raise ValueError('unknown dtype policy {}, the options are {}'.format(dtypes, DTYPE_POLICIES))
+    if dtypes == 'compact':
+        return compact_case(case)
+    return case
+
+
+class StringDictionary(object):
+    def __init__(self, strings=()):
+        '''This data structure assigns an integer code to each distinct
+        string it sees.  One dictionary can be shared by the parses of many
+        cases, so that the same name has the same code in all of them and
+        string columns can be stored and joined as integers.
+
+        Args:
+            strings (list): strings to encode first, in code order (optional)
+        '''
+
+        self.strings = []
+        self.codes = {}
+        for string in strings:
+            self.code(string)
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __contains__(self, string):
+        return string in self.codes
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.strings == other.strings
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+    def code(self, string):
+        '''Returns: the code of a string, adding it to the dictionary if it is new'''
+        code = self.codes.get(string)
+        if code is None:
+            string = sys.intern(string)
+            code = len(self.strings)
+            self.strings.append(string)
+            self.codes[string] = code
+        return code
+
+    def encode(self, values):
+        '''encodes a sequence of strings
+
+        Args:
+            values: a list, array or series of strings, missing values are coded -1
+        Returns:
+            array: the int32 codes of the values
+        '''
+
+        positions, uniques = pd.factorize(pd.Series(values, dtype=object))
+        lookup = np.array([self.code(str(value)) for value in uniques] + [-1], dtype=np.int32)
+        return lookup[positions]
+
+    def decode(self, codes):
+        '''Returns: an object array of the strings of the given codes, None for -1'''
+        lookup = np.array(self.strings + [None], dtype=object)
+        codes = np.asarray(codes)
+        return lookup[np.where(codes < 0, len(self.strings), codes)]
+
+
+def encode_strings(case, strings):
+    '''replaces the string columns of a parsed case with integer codes
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        strings (StringDictionary): the dictionary of the codes, it is
+            extended with the new strings of the case
+    Returns:
+        CaseTables: the tables with int32 codes in place of strings
+    '''
+
+    tables = {}
+    for name, table in zip(case._fields, case):
+        columns = [column for column in table.columns if pd.api.types.is_string_dtype(table[column])]
+        if len(columns) > 0:
+            table = table.copy()
+            for column in columns:
+                table[column] = strings.encode(table[column])
+        tables[name] = table
+    return case._replace(**tables)
+
+
+def table_memory(table):
+    '''Returns: the bytes held by a data frame, including the contents of its python objects'''
+    return int(table.memory_usage(deep=True, index=True).sum())
+
+
+def memory_savings(case, compact):
+    '''compares the memory of a parsed case in two dtype policies
+
+    Args:
+        case (CaseTables): the tables under the default policy
+        compact (CaseTables): the same tables under another policy
+    Returns:
+        DataFrame: the bytes of each table in both policies and the fraction saved
+    '''
+
+    rows = []
+    for name, table, compact_frame in zip(case._fields, case, compact):
+        before = table_memory(table)
+        after = table_memory(compact_frame)
+        rows.append((name, before, after, 1.0 - after/before if before > 0 else 0.0))
+    return pd.DataFrame(rows, columns=['table', 'bytes', 'compact_bytes', 'saved'])
+
+
+def row_hashes(table):
+    '''Returns: a uint64 hash of each row of a data frame and its index label,
+    computed vectorized over the columns'''
+    return pd.util.hash_pandas_object(table, index=True).to_numpy()
+
+
+def table_fingerprint(table):
+    '''computes a stable digest of the contents of a data frame, two tables
+    with the same columns, dtypes, index and values have the same digest.
+    The dtypes of an empty table depend on how it was built rather than on
+    any value, so only its columns are digested.
+
+    Args:
+        table (DataFrame): a table of a parsed case
+    Returns:
+        str: the hex digest of the table
+    '''
+
+    digest = hashlib.sha1()
+    if len(table) == 0:
+        digest.update(repr([str(c) for c in table.columns]).encode())
+        return digest.hexdigest()
+    digest.update(repr([(str(c), str(t)) for c, t in table.dtypes.items()]).encode())
+    digest.update(row_hashes(table).tobytes())
+    return digest.hexdigest()
+
+
+def _key_part(values):
+    # identifiers are padded in the data files, so string parts are compared
+    # without their surrounding white space
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(values.cat.categories.dtype)
+    if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ('integer', 'floating', 'mixed-integer-float'):
+        values = pd.to_numeric(values)
+    if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+        return values.to_numpy()
+    return values.astype(str).str.strip().to_numpy(dtype=object)
+
+
+def _key_index(parts):
+    if len(parts) == 1:
+        return pd.Index(_key_part(parts[0]))
+    return pd.MultiIndex.from_arrays([_key_part(part) for part in parts])
+
+
+def key_mask(table, key):
+    '''selects the rows of a table that match some of its key columns, with
+    the values compared as :class:`KeyIndex` compares them, for keys that
+    are not indexed
+
+    Args:
+        table (DataFrame): the table
+        key (dict): the value of each key column
+    Returns (array):
+        a mask of the matching rows
+    '''
+
+    mask = np.ones(len(table), dtype=bool)
+    for column, value in key.items():
+        mask &= _key_part(table[column]) == _key_part([value])[0]
+    return mask
+
+
+class KeyIndex(object):
+    def __init__(self, table, columns):
+        '''This data structure is a hash index of the key columns of a table,
+        it maps keys to row positions without scanning or merging the
+        table.  When a key appears on several rows the first one is
+        indexed.
+
+        Args:
+            table (DataFrame): the indexed table
+            columns (list): the names of the key columns
+        '''
+
+        self.table = table
+        self.columns = list(columns)
+        keys = _key_index([table[column] for column in self.columns])
+        first = ~keys.duplicated()
+        self.duplicates = int(len(keys) - first.sum())
+        self.positions = np.flatnonzero(first)
+        self.keys = keys[first]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self.position(key) >= 0
+
+    def __str__(self):
+        return 'index of {} on {}'.format(len(self.keys), ', '.join(self.columns))
+
+    def lookup(self, keys):
+        '''finds the rows of many keys at once
+
+        Args:
+            keys: a list of keys, which are tuples when the index has several
+                columns, or a data frame with the key columns
+        Returns:
+            array: the row position of each key, -1 for keys that are not in the table
+        '''
+
+        if isinstance(keys, pd.DataFrame):
+            parts = [keys[column] for column in self.columns]
+        elif len(self.columns) == 1:
+            parts = [keys]
+        else:
+            keys = list(keys)
+            parts = [[key[part] for key in keys] for part in range(len(self.columns))]
+        if len(parts[0]) == 0:
+            return np.zeros(0, dtype=np.intp)
+        found = self.keys.get_indexer(_key_index(parts))
+        positions = np.full(len(found), -1, dtype=np.intp)
+        positions[found >= 0] = self.positions[found[found >= 0]]
+        return positions
+
+    def position(self, key):
+        '''Returns: the row position of one key, -1 when it is not in the table'''
+        return int(self.lookup([key])[0])
+
+    def take(self, keys, columns=None):
+        '''gathers the rows of many keys, like a left join on the key columns
+
+        Args:
+            keys: the keys, as for :func:`lookup`
+            columns (list): the columns to gather (default = all columns)
+        Returns:
+            DataFrame: one row per key, empty (NaN) for keys that are not in the table
+        '''
+
+        table = self.table if columns is None else self.table[columns]
+        return table.reset_index(drop=True).reindex(self.lookup(keys)).reset_index(drop=True)
+
+
+class BusNumbering(object):
+    def __init__(self, bus_numbers):
+        '''This data structure maps the sparse bus numbers of a case to dense
+        indexes 0..n-1, in the order of the bus table, and back.  Numbers up
+        to DIRECT_LOOKUP_LIMIT are mapped through a lookup array, larger ones
+        through a binary search.  When a number appears on several buses the
+        first one is used.
+
+        Args:
+            bus_numbers: the ibus column of a bus table
+        '''
+
+        self.external = np.asarray(bus_numbers, dtype=np.int64)
+        numbers, first = np.unique(self.external, return_index=True)
+        self.duplicates = len(self.external) - len(numbers)
+        self.sorted_numbers = numbers
+        self.sorted_dense = first.astype(np.int64)
+
+        self.lookup_array = None
+        if len(numbers) > 0 and numbers[0] >= 0 and numbers[-1] <= DIRECT_LOOKUP_LIMIT:
+            self.lookup_array = np.full(numbers[-1] + 1, -1, dtype=np.int64)
+            self.lookup_array[numbers] = self.sorted_dense
+
+    def __len__(self):
+        return len(self.external)
+
+    def __str__(self):
+        return 'numbering of {} buses'.format(len(self.external))
+
+    def to_dense(self, bus_numbers):
+        '''Returns: the dense index of each bus number, -1 for numbers that are not buses of the case'''
+        numbers = np.asarray(bus_numbers, dtype=np.int64)
+        if self.lookup_array is not None:
+            inside = (numbers >= 0) & (numbers < len(self.lookup_array))
+            dense = np.full(numbers.shape, -1, dtype=np.int64)
+            dense[inside] = self.lookup_array[numbers[inside]]
+            return dense
+        if len(self.sorted_numbers) == 0:
+            return np.full(numbers.shape, -1, dtype=np.int64)
+        positions = np.searchsorted(self.sorted_numbers, numbers)
+        positions = np.minimum(positions, len(self.sorted_numbers) - 1)
+        found = self.sorted_numbers[positions] == numbers
+        return np.where(found, self.sorted_dense[positions], -1)
+
+    def to_external(self, dense):
+        '''Returns: the bus number of each dense index, -1 for indexes that are not buses of the case, as :func:`to_dense` gives'''
+        dense = np.asarray(dense, dtype=np.int64)
+        inside = (dense >= 0) & (dense < len(self.external))
+        numbers = np.full(dense.shape, -1, dtype=np.int64)
+        numbers[inside] = self.external[dense[inside]]
+        return numbers
+
+    def table_buses(self, table, columns=BUS_ENDPOINT_COLUMNS):
+        '''renumbers the bus columns of a table, such as the ends of branches
+        or the buses of generators and loads
+
+        Args:
+            table (DataFrame): a table of a parsed case
+            columns (list): the bus columns to renumber, those missing from the table are skipped
+        Returns (dict):
+            the dense indexes of each column, keyed by column name
+        '''
+
+        return collections.OrderedDict((column, self.to_dense(table[column].to_numpy()))
+            for column in columns if column in table.columns)
+
+
+def case_memory_report(case):
+    '''reports the memory held by each column of a parsed case
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns:
+        DataFrame: one row per table column, and one per table index, with
+        the column's dtype and its deep bytes
+    '''
+
+    rows = []
+    for name, table in zip(case._fields, case):
+        usage = table.memory_usage(deep=True, index=True)
+        for column, size in usage.items():
+            dtype = table.index.dtype if column == 'Index' else table[column].dtype
+            rows.append((name, column, str(dtype), int(size)))
+    return pd.DataFrame(rows, columns=['table', 'column', 'dtype', 'bytes'])
+
+
+class TableSequence(object):
+    def __init__(self, tables):
+        '''This data structure presents several component tables as one
+        sequence of row views, for component lists that mix types such as
+        two and three winding transformers.
+
+        Args:
+            tables (list of ComponentTable): the tables, in sequence order
+        '''
+
+        self.tables = tables
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables)
+
+    def __iter__(self):
+        for table in self.tables:
+            for view in table:
+                yield view
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return list(self)[row]
+        if row < 0:
+            row += len(self)
+        for table in self.tables:
+            if 0 <= row < len(table):
+                return table[row]
+            row -= len(table)
+        raise IndexError('row is out of range')
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.tables == other.tables
+        return NotImplemented
+
+    def __ne__(self, other):
+        if isinstance(other, self.__class__):
+            return not self.__eq__(other)
+        return NotImplemented
+
+
+def component_tables(case):
+    '''builds a component table of each table of a parsed case
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns (dict):
+        the ComponentTable of each table, keyed by table name
+    '''
+
+    return collections.OrderedDict((name, ComponentTable.from_frame(component_class, getattr(case, name)))
+        for name, component_class in TABLE_COMPONENTS.items())
+
+
+def _check_precision(precision):
+    if precision in PRECISION_POLICIES:
+        return
+    if isinstance(precision, str) and precision.startswith('%') and precision[-1] in 'eEfFgG':
+        return
+    raise ValueError('unknown precision policy {}, the options are {} or a printf format such as \'%.6g\''.format(
+        precision, PRECISION_POLICIES))
+
+
+def format_floats(values, precision=None):
+    '''formats an array of floats under a precision policy
+
+    Args:
+        values (array): the floats
+        precision (str): one of PRECISION_POLICIES or a printf format
+    Returns:
+        array: an array of strings
+    '''
+
+    _check_precision(precision)
+    if precision is None:
+        return values.astype(str)
+    if precision != 'psse':
+        return np.char.mod(precision, values)
+
+    return np.where(values == 0, '0.0', np.char.mod('%.6g', values))
+
+
+def format_column(column, quoted=False, integer=False, precision=None):
+    '''formats the values of a column as pss/e text, numbers take their
+    shortest round-trip text, as str does for python floats, unless a
+    precision policy is given
+
+    Args:
+        column (Series): the values
+        quoted (bool): wrap the values in single quotes
+        integer (bool): write the whole values of a float column, such as
+            an integer column with missing values, without a fraction
+        precision (str): the precision policy of float columns, see
+            PRECISION_POLICIES (default = shortest round-trip text)
+    Returns:
+        array: an object array of strings
+    '''
+
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        column = column.astype(object)
+    values = column.to_numpy()
+    if values.dtype.kind == 'f':
+        text = format_floats(values, precision).astype(object)
+    else:
+        text = values.astype(str).astype(object)
+    if integer and values.dtype.kind == 'f':
+        whole = np.isfinite(values) & (values == np.round(values))
+        text[whole] = values[whole].astype(np.int64).astype(str)
+    if quoted:
+        text = '\'' + text + '\''
+    return text
+
+
+def apply_precision(case, precision):
+    '''rounds the float columns of a parsed case to the values that a
+    parse of the case written under a precision policy reads back.  Writing
+    the rounded case again gives the same values, so a written case
+    round-trips exactly after its first write.
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        precision (str): one of PRECISION_POLICIES or a printf format
+    Returns:
+        CaseTables: the tables with rounded float columns
+    '''
+
+    _check_precision(precision)
+    if precision is None:
+        return case
+
+    tables = {}
+    for name, table in zip(case._fields, case):
+        columns = [column for column in table.columns if table[column].dtype.kind == 'f']
+        if len(columns) > 0:
+            table = table.copy()
+            for column in columns:
+                text = format_column(table[column], integer=column in INTEGER_COLUMNS, precision=precision)
+                table[column] = text.astype(np.float64).astype(table[column].dtype)
+        tables[name] = table
+    return case._replace(**tables)
+
+
+def _join_columns(table, columns, precision):
+    line = None
+    for column in columns:
+        text = format_column(table[column], column in QUOTED_COLUMNS, column in INTEGER_COLUMNS, precision)
+        line = text if line is None else line + ', ' + text
+    return line
+
+
+def table_lines(table, name, precision=None):
+    '''formats the components of a parsed table as pss/e text, one column
+    at a time, with the same records and quoting as the to_psse methods of
+    the data structures
+
+    Args:
+        table (DataFrame): a table of a parsed case
+        name (str): the name of the table, such as 'bus'
+        precision (str): the precision policy of float columns, see
+            PRECISION_POLICIES (default = shortest round-trip text)
+    Returns:
+        array: an object array with the text of each component, the records
+        of a component are separated by newlines
+    '''
+
+    if len(table) == 0:
+        return np.zeros(0, dtype=object)
+
+    columns = list(table.columns)
+    optional = OPTIONAL_PAIRS.get(name, [])
+    if len(optional) > 0:
+        columns = columns[:columns.index(optional[0][0])]
+
+    starts = [columns.index(column) for column in RECORD_STARTS.get(name, [])]
+    bounds = [0] + starts + [len(columns)]
+    records = [_join_columns(table, columns[start:end], precision) for start, end in zip(bounds[:-1], bounds[1:])]
+
+    for n, b in optional:
+        if n not in table.columns:
+            break
+        given = (table[n].notna() & table[b].notna()).to_numpy()
+        pair = ', ' + format_column(table[n], integer=True, precision=precision) + \
+            ', ' + format_column(table[b], precision=precision)
+        records[-1] = records[-1] + np.where(given, pair, '').astype(object)
+
+    lines = records[0]
+    for record in records[1:]:
+        lines = lines + '\n' + record
+    return lines
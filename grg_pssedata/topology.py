@@ -0,0 +1,221 @@
+'''the bus-branch topology of a parsed psse case, as a compressed sparse row
+(CSR) adjacency of dense bus indexes'''
+
+import numpy as np
+import pandas as pd
+
+from grg_pssedata.tables import BusNumbering
+
+# the component tables that connect buses, the kind of an edge is its
+# position in this list
+EDGE_KINDS = ['acline', 'transformer2w', 'transformer3w', 'twotermdc', 'vscdc']
+
+# the windings of a three winding transformer that make up each of its three
+# edges, with the status values (see ThreeWindingTransformer) that leave the
+# edge in service
+TRANSFORMER3W_EDGES = [
+    ('ibus', 'jbus', 1, [1, 2, 3]),
+    ('jbus', 'kbus', 2, [1, 3, 4]),
+    ('ibus', 'kbus', 3, [1, 2, 4]),
+]
+
+
+def _edges(kind, rows, source, target, stat, rates):
+    return {
+        'kind': np.full(len(rows), EDGE_KINDS.index(kind) if kind is not None else -1, dtype=np.int8),
+        'row': np.asarray(rows, dtype=np.int64),
+        'source': np.asarray(source, dtype=np.int64),
+        'target': np.asarray(target, dtype=np.int64),
+        'stat': np.asarray(stat, dtype=np.int8),
+        'rate1': np.asarray(rates[0], dtype=np.float64),
+        'rate2': np.asarray(rates[1], dtype=np.float64),
+        'rate3': np.asarray(rates[2], dtype=np.float64),
+    }
+
+
+def case_edges(case):
+    '''lists the edges of a case, one per ac line, two winding transformer,
+    winding pair of a three winding transformer and dc link
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+    Returns (dict):
+        the edge arrays, kind, row (in the component table), source and
+        target (bus numbers), stat (1 when in service) and rate1-3
+    '''
+
+    edges = []
+
+    acline = case.acline
+    edges.append(_edges('acline', np.arange(len(acline)), acline['ibus'], acline['jbus'],
+        acline['stat'] != 0, [acline['rate1'], acline['rate2'], acline['rate3']]))
+
+    trans2w = case.transformer2w
+    edges.append(_edges('transformer2w', np.arange(len(trans2w)), trans2w['ibus'], trans2w['jbus'],
+        trans2w['stat'] != 0, [trans2w['wdg1rate1'], trans2w['wdg1rate2'], trans2w['wdg1rate3']]))
+
+    trans3w = case.transformer3w
+    for source, target, winding, in_service in TRANSFORMER3W_EDGES:
+        rates = [trans3w['wdg%drate%d' % (winding, rate)] for rate in (1, 2, 3)]
+        edges.append(_edges('transformer3w', np.arange(len(trans3w)), trans3w[source], trans3w[target],
+            trans3w['stat'].isin(in_service), rates))
+
+    # the real power of a two terminal line, setvl is in MW (mdc = 1) or amps (mdc = 2)
+    twotermdc = case.twotermdc
+    mdc = twotermdc['mdc'].to_numpy()
+    setvl = twotermdc['setvl'].to_numpy(dtype=np.float64)
+    pmw = np.abs(np.select([mdc == 1, mdc == 2], [setvl, setvl*twotermdc['vschd'].to_numpy(dtype=np.float64)/1000], 0.0))
+    edges.append(_edges('twotermdc', np.arange(len(twotermdc)), twotermdc['ipr'], twotermdc['ipi'],
+        mdc != 0, [pmw, pmw, pmw]))
+
+    vscdc = case.vscdc
+    smax = np.minimum(vscdc['smax1'].to_numpy(dtype=np.float64), vscdc['smax2'].to_numpy(dtype=np.float64))
+    edges.append(_edges('vscdc', np.arange(len(vscdc)), vscdc['ibus1'], vscdc['ibus2'],
+        vscdc['mdc'] != 0, [smax, smax, smax]))
+
+    return {name: np.concatenate([part[name] for part in edges]) for name in edges[0]}
+
+
+class BusAdjacency(object):
+    def __init__(self, numbering, edges):
+        '''This data structure is a CSR index of the edges that touch each
+        bus.  The edges of a bus are stored contiguously, so the neighbors
+        of many buses are gathered with array operations instead of masks
+        over a table of branches.  Edges whose ends are not buses of the
+        numbering are dropped.
+
+        Args:
+            numbering (BusNumbering): the dense indexes of the buses
+            edges (dict): edge arrays, as returned by :func:`case_edges`,
+                source and target hold bus numbers
+        '''
+
+        self.numbering = numbering
+        source = numbering.to_dense(edges['source'])
+        target = numbering.to_dense(edges['target'])
+        known = (source >= 0) & (target >= 0)
+        self.edges = {name: np.asarray(values)[known] for name, values in edges.items()}
+        self.edges['source'] = source[known]
+        self.edges['target'] = target[known]
+
+        # every edge is stored once from each end
+        ends = np.concatenate([self.edges['source'], self.edges['target']])
+        others = np.concatenate([self.edges['target'], self.edges['source']])
+        edge_ids = np.tile(np.arange(len(self.edges['source'])), 2)
+        order = np.argsort(ends, kind='stable')
+        self.indptr = np.zeros(len(numbering) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=len(numbering)), out=self.indptr[1:])
+        self.indices = others[order]
+        self.edge_ids = edge_ids[order]
+
+    @classmethod
+    def from_case(cls, case):
+        '''Returns: the adjacency of the ac lines, transformers and dc links of
+        a case, :func:`grg_pssedata.io.CaseTables.adjacency` keeps the one of
+        a case'''
+        return cls(case.numbering(), case_edges(case))
+
+    @classmethod
+    def from_branches(cls, branches, numbering=None):
+        '''builds the adjacency of a table of branches, such as the
+        allbranches table of :mod:`grg_pssedata.reduction`
+
+        Args:
+            branches (DataFrame): a table with ibus and jbus columns, and
+                optionally stat and rate1-3 columns
+            numbering (BusNumbering): the dense indexes of the buses
+                (default = the buses at the ends of the branches)
+        Returns:
+            BusAdjacency: the adjacency of the branches, their kind is -1
+        '''
+
+        source = branches['ibus'].to_numpy(dtype=np.int64)
+        target = branches['jbus'].to_numpy(dtype=np.int64)
+        if numbering is None:
+            numbering = BusNumbering(np.unique(np.concatenate([source, target])))
+
+        def column(name, default):
+            if name in branches.columns:
+                return branches[name].to_numpy(dtype=np.float64)
+            return np.full(len(branches), default, dtype=np.float64)
+
+        edges = _edges(None, np.arange(len(branches)), source, target,
+            column('stat', 1) != 0, [column('rate1', 0), column('rate2', 0), column('rate3', 0)])
+        return cls(numbering, edges)
+
+    def __len__(self):
+        return len(self.edges['source'])
+
+    def __str__(self):
+        return 'adjacency of {} buses and {} edges'.format(len(self.numbering), len(self))
+
+    def degree(self, in_service=False):
+        '''Returns: the number of edges at each bus, by dense index'''
+        if not in_service:
+            return np.diff(self.indptr)
+        on = self.edges['stat'] != 0
+        ends = np.concatenate([self.edges['source'][on], self.edges['target'][on]])
+        return np.bincount(ends, minlength=len(self.numbering))
+
+    def _slots(self, buses):
+        # the positions in indices and edge_ids of the edges of the buses
+        buses = np.asarray(buses, dtype=np.int64)
+        buses = buses[buses >= 0]
+        starts = self.indptr[buses]
+        counts = self.indptr[buses + 1] - starts
+        if counts.sum() == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    def incident_edges(self, buses, in_service=False, kinds=None):
+        '''finds the edges that touch any of the given buses
+
+        Args:
+            buses: dense bus indexes
+            in_service (bool): only return edges that are in service
+            kinds (list): only return edges of these kinds, see EDGE_KINDS
+        Returns:
+            array: the sorted ids of the edges
+        '''
+
+        edge_ids = np.unique(self.edge_ids[self._slots(buses)])
+        return edge_ids[self._select(edge_ids, in_service, kinds)]
+
+    def neighbors(self, buses, in_service=False, kinds=None):
+        '''finds the buses that share an edge with any of the given buses
+
+        Args:
+            buses: dense bus indexes
+            in_service (bool): only follow edges that are in service
+            kinds (list): only follow edges of these kinds, see EDGE_KINDS
+        Returns:
+            array: the sorted dense indexes of the neighbors
+        '''
+
+        slots = self._slots(buses)
+        slots = slots[self._select(self.edge_ids[slots], in_service, kinds)]
+        return np.unique(self.indices[slots])
+
+    def external_neighbors(self, bus_numbers, in_service=False, kinds=None):
+        '''Returns: the bus numbers of the neighbors of buses given by number'''
+        dense = self.numbering.to_dense(bus_numbers)
+        return self.numbering.to_external(self.neighbors(dense, in_service, kinds))
+
+    def _select(self, edge_ids, in_service, kinds):
+        selected = np.ones(len(edge_ids), dtype=bool)
+        if in_service:
+            selected &= self.edges['stat'][edge_ids] != 0
+        if kinds is not None:
+            codes = [EDGE_KINDS.index(kind) for kind in kinds]
+            selected &= np.isin(self.edges['kind'][edge_ids], codes)
+        return selected
+
+    def edge_frame(self, edge_ids=None):
+        '''Returns: a data frame of the edges, with the bus numbers of their ends'''
+        if edge_ids is None:
+            edge_ids = np.arange(len(self))
+        frame = pd.DataFrame({name: values[edge_ids] for name, values in self.edges.items()})
+        frame['kind'] = [EDGE_KINDS[kind] if kind >= 0 else None for kind in frame['kind']]
+        frame['ibus'] = self.numbering.to_external(frame.pop('source'))
+        frame['jbus'] = self.numbering.to_external(frame.pop('target'))
+        return frame
@@ -0,0 +1,184 @@
+'''checks of the tables of a parsed case against the pss/e data
+specification, declared per column and evaluated as array masks'''
+
+import collections
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from grg_pssedata.exception import PSSEDataWarning
+
+# a rule holds when every value of the fields is in [lb, ub], empty values
+# are not checked
+ColumnRule = collections.namedtuple('ColumnRule', ['section', 'fields', 'lb', 'ub', 'rule'])
+
+BUS_RANGE = (1, 999997)
+ID_RANGE = (1, 9999)
+
+OWNER_FIELDS = ['o1', 'o2', 'o3', 'o4']
+FRACTION_FIELDS = ['f1', 'f2', 'f3', 'f4']
+
+
+def _range(section, fields, lb, ub):
+    return ColumnRule(section, fields, lb, ub, 'range {} to {}'.format(lb, ub))
+
+
+def _boolean(section, fields):
+    return ColumnRule(section, fields, 0, 1, 'boolean')
+
+
+def _owners(section):
+    # only the first owner is required
+    return [
+        ColumnRule(section, OWNER_FIELDS[:1], ID_RANGE[0], ID_RANGE[1], 'owner'),
+        ColumnRule(section, OWNER_FIELDS[1:], 0, ID_RANGE[1], 'owner'),
+        ColumnRule(section, FRACTION_FIELDS, 0.0, 1.0, 'owner fraction'),
+    ]
+
+
+def _windings(section, windings):
+    rules = []
+    for winding in windings:
+        rules += [
+            _range(section, ['ang%d' % winding], -180.0, 180.0),
+            _range(section, ['cod%d' % winding], -5, 5),
+            _range(section, ['cont%d' % winding], 0, BUS_RANGE[1]),
+            _range(section, ['ntp%d' % winding], 2, 9999),
+            _range(section, ['tab%d' % winding], 0, float('Inf')),
+        ]
+    return rules
+
+
+def _transformer(section, windings):
+    return [
+        _range(section, ['stat'], 0, 4),
+        _range(section, ['ibus', 'jbus'], *BUS_RANGE),
+        _range(section, ['kbus'], 0, BUS_RANGE[1]),
+        _range(section, ['cw', 'cz'], 1, 3),
+        _range(section, ['cm'], 1, 2),
+    ] + _owners(section) + _windings(section, windings)
+
+
+# the rules of the validate methods of grg_pssedata.struct, except that a
+# regulated bus, controlled bus, correction table or secondary owner of 0
+# means none and that rmpct is a percentage, as in the pss/e defaults
+VALIDATION_RULES = [
+    _range('bus', ['ibus'], *BUS_RANGE),
+    _range('bus', ['area', 'zone', 'owner'], *ID_RANGE),
+
+    _boolean('load', ['stat']),
+    _range('load', ['ibus'], *BUS_RANGE),
+    _range('load', ['area', 'zone', 'owner'], *ID_RANGE),
+
+    _boolean('fixshunt', ['stat']),
+    _range('fixshunt', ['ibus'], *BUS_RANGE),
+
+    _boolean('swshunt', ['stat', 'adjm']),
+    _range('swshunt', ['ibus'], *BUS_RANGE),
+    _range('swshunt', ['modsw'], 0, 6),
+    _range('swshunt', ['swrem'], 0, BUS_RANGE[1]),
+    _range('swshunt', ['rmpct'], 0.0, 100.0),
+    _range('swshunt', ['n%d' % bank for bank in range(1, 9)], 0, 9),
+
+    _boolean('generator', ['stat']),
+    _range('generator', ['ibus'], *BUS_RANGE),
+    _range('generator', ['ireg'], 0, BUS_RANGE[1]),
+    _range('generator', ['wmod'], 0, 3),
+    _range('generator', ['wpf'], 0.0, 1.0),
+] + _owners('generator') + [
+    _boolean('acline', ['stat']),
+    _range('acline', ['ibus', 'jbus'], *BUS_RANGE),
+] + _owners('acline') + _transformer('transformer2w', [1]) + _transformer('transformer3w', [1, 2, 3]) + [
+    _range('area', ['iarea'], *ID_RANGE),
+    _range('zone', ['izone'], *ID_RANGE),
+    _range('owner', ['iowner'], *ID_RANGE),
+    _range('facts', ['owner'], *ID_RANGE),
+]
+
+VIOLATION_COLUMNS = ['section', 'row', 'field', 'value', 'rule']
+
+
+def _numbers(column):
+    # the values of a column as floats, and a mask of the values that are
+    # given but are not numbers
+    if column.dtype.kind in 'biuf':
+        return column.to_numpy(dtype=np.float64), np.zeros(len(column), dtype=bool)
+    values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64)
+    given = column.notna().to_numpy() & (column.astype(str).str.strip() != '').to_numpy()
+    return values, given & np.isnan(values)
+
+
+def check_rule(table, rule):
+    '''evaluates one rule over a table
+
+    Args:
+        table (DataFrame): the table of the rule's section
+        rule (ColumnRule): the rule
+    Returns (list):
+        a (field, positions, values, rule) tuple for each field with violations
+    '''
+
+    violations = []
+    for field in rule.fields:
+        if field not in table.columns:
+            continue
+        values, invalid = _numbers(table[field])
+        for mask, name in ((invalid, 'number'), ((values < rule.lb) | (values > rule.ub), rule.rule)):
+            positions = np.flatnonzero(mask)
+            if len(positions) > 0:
+                violations.append((field, positions, table[field].to_numpy()[positions], name))
+    return violations
+
+
+def validate_case(case, rules=VALIDATION_RULES):
+    '''checks the tables of a parsed case against the pss/e data specification
+
+    Args:
+        case (CaseTables): the tables of a parsed case
+        rules (list of ColumnRule): the column rules (default = VALIDATION_RULES)
+    Returns:
+        DataFrame: one row per violation, with the section, the row label,
+        the field, the value and the rule that it breaks
+    '''
+
+    sections, rows, fields, values, names = [], [], [], [], []
+
+    def add(section, row_labels, field, field_values, name):
+        sections.append(np.full(len(row_labels), section, dtype=object))
+        rows.append(np.asarray(row_labels, dtype=object))
+        fields.append(np.full(len(row_labels), field, dtype=object))
+        values.append(np.asarray(field_values, dtype=object))
+        names.append(np.full(len(row_labels), name, dtype=object))
+
+    header = getattr(case, 'header', None)
+    if header is not None:
+        if header.rev != 33:
+            add('case', [0], 'rev', [header.rev], 'version 33')
+        for field in ('record1', 'record2'):
+            if len(getattr(header, field)) > 60:
+                add('case', [0], field, [getattr(header, field)], 'at most 60 characters')
+        if header.ic not in (0, 1):
+            add('case', [0], 'ic', [header.ic], 'boolean')
+
+    for rule in rules:
+        table = getattr(case, rule.section)
+        for field, positions, field_values, name in check_rule(table, rule):
+            add(rule.section, table.index[positions], field, field_values, name)
+
+    ckt = case.acline['ckt'].astype(str).str.lstrip()
+    positions = np.flatnonzero(ckt.str.startswith('&').to_numpy())
+    add('acline', case.acline.index[positions], 'ckt', case.acline['ckt'].to_numpy()[positions], 'no & prefix')
+
+    if len(sections) == 0:
+        return pd.DataFrame(columns=VIOLATION_COLUMNS)
+    return pd.DataFrame(collections.OrderedDict(zip(VIOLATION_COLUMNS,
+        [np.concatenate(column) for column in (sections, rows, fields, values, names)])))
+
+
+def warn_violations(violations):
+    '''issues a PSSEDataWarning for each violation, in the style of the
+    validate methods of the data structures'''
+    for section, row, field, value, rule in violations.itertuples(index=False):
+        warnings.warn('the {} value {} on {} {} breaks the rule {}'.format(field, value, section, row, rule),
+            PSSEDataWarning)
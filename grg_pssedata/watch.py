@@ -0,0 +1,259 @@
+'''functions for keeping a directory of psse data files parsed'''
+
+import collections
+import hashlib
+import os
+import pickle
+import time
+
+from grg_pssedata.exception import PSSEDataParsingError
+from grg_pssedata.io import parse_psse_case_file
+
+WatchEvent = collections.namedtuple('WatchEvent', ['kind', 'path', 'case', 'tables', 'error'])
+
+CASE_ADDED = 'added'
+CASE_MODIFIED = 'modified'
+CASE_REMOVED = 'removed'
+CASE_ERROR = 'error'
+
+# the errors of a file that could not be parsed, such as a file that is
+# still being written
+PARSE_ERRORS = (PSSEDataParsingError, ValueError, IndexError)
+
+
+def file_digest(file_name, block_size=1<<20):
+    '''computes a digest of a file's contents
+
+    Args:
+        file_name(str): path to the file
+        block_size(int): number of bytes read at a time
+    Returns:
+        str: the hex digest of the file
+    '''
+
+    digest = hashlib.sha1()
+    with open(file_name, 'rb') as data_file:
+        for block in iter(lambda: data_file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def changed_tables(case_1, case_2):
+    '''compares two parsed cases table by table
+
+    Args:
+        case_1 (CaseTables): the first case, may be None
+        case_2 (CaseTables): the second case, may be None
+    Returns (list):
+        the names of the tables that differ in the two cases, preceded by
+        'header' when their headers differ
+    '''
+
+    if case_1 is None or case_2 is None:
+        case = case_1 if case_2 is None else case_2
+        return list(case._fields) if case is not None else []
+
+    header = ['header'] if case_1.header != case_2.header else []
+    return header + case_1.changed_tables(case_2)
+
+
+class CaseCache(object):
+    def __init__(self, snapshot_dir=None, dtypes=None):
+        '''This data structure keeps parsed psse cases in memory, keyed by
+        their path.  A file is only parsed again when its size, modification
+        time and contents have changed.  A file that fails to parse keeps
+        its last parsed case and is parsed again once its size or
+        modification time changes.
+
+        Args:
+            snapshot_dir (str): directory where a pickled snapshot of each
+                parsed case is kept, so that cases survive a restart without
+                being parsed again (optional)
+            dtypes (str): the dtype policy of the parsed tables, None or 'compact'
+        '''
+
+        self.snapshot_dir = snapshot_dir
+        self.dtypes = dtypes
+        self.cases = {}
+        self.signatures = {}
+        self.digests = {}
+        self.errors = {}
+
+        if self.snapshot_dir is not None and not os.path.isdir(self.snapshot_dir):
+            os.makedirs(self.snapshot_dir)
+
+    def __contains__(self, path):
+        return path in self.cases
+
+    def __len__(self):
+        return len(self.cases)
+
+    def snapshot_path(self, path):
+        '''Returns: the path of the snapshot file for the given case file'''
+        # named after the file and a digest of its absolute path, so files of
+        # the same name in different directories have their own snapshots
+        key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+        return os.path.join(self.snapshot_dir, '{}.{}.pkl'.format(os.path.basename(path), key))
+
+    def get(self, path):
+        '''Returns: the parsed case of the given file, refreshed if the file has changed'''
+        self.refresh(path)
+        return self.cases[path]
+
+    def refresh(self, path):
+        '''parses the given file again if it changed since it was last seen
+
+        Args:
+            path (str): path to a psse data file
+        Returns (tuple):
+            the previous case (or None) and the current case, these are the
+            same object when the file did not change
+        Raises:
+            one of PARSE_ERRORS when the file can not be parsed, the file
+            keeps its previous case
+        '''
+
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if path in self.errors and self.errors[path][0] == signature:
+            raise self.errors[path][1]
+        old_case = self.cases.get(path)
+        if old_case is not None and self.signatures.get(path) == signature:
+            return old_case, old_case
+
+        digest = file_digest(path)
+        self.errors.pop(path, None)
+        if old_case is not None and self.digests.get(path) == digest:
+            self.signatures[path] = signature
+            return old_case, old_case
+
+        case = self._load_snapshot(path, digest)
+        if case is None:
+            try:
+                case = parse_psse_case_file(path, self.dtypes)
+            except PARSE_ERRORS as error:
+                self.errors[path] = (signature, error)
+                raise
+            self._save_snapshot(path, digest, case)
+
+        self.signatures[path] = signature
+        self.cases[path] = case
+        self.digests[path] = digest
+        return old_case, case
+
+    def discard(self, path):
+        '''Returns: the case of a file that is no longer available, or None'''
+        self.signatures.pop(path, None)
+        self.digests.pop(path, None)
+        self.errors.pop(path, None)
+        if self.snapshot_dir is not None and os.path.isfile(self.snapshot_path(path)):
+            os.remove(self.snapshot_path(path))
+        return self.cases.pop(path, None)
+
+    def _load_snapshot(self, path, digest):
+        if self.snapshot_dir is None or not os.path.isfile(self.snapshot_path(path)):
+            return None
+        with open(self.snapshot_path(path), 'rb') as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+        if snapshot['digest'] != digest or snapshot.get('dtypes') != self.dtypes:
+            return None
+        return snapshot['case']
+
+    def _save_snapshot(self, path, digest, case):
+        if self.snapshot_dir is None:
+            return
+        # write then rename, so readers never see a partial snapshot
+        tmp_path = self.snapshot_path(path)+'.tmp'
+        with open(tmp_path, 'wb') as snapshot_file:
+            pickle.dump({'digest': digest, 'dtypes': self.dtypes, 'case': case}, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.snapshot_path(path))
+
+
+class CaseWatcher(object):
+    def __init__(self, directory, extension='.raw', snapshot_dir=None, dtypes=None):
+        '''This data structure polls a directory of psse data files and keeps
+        a parsed copy of each one.  Only files that changed since the last
+        poll are parsed again.  A file that fails to parse, such as one that
+        is still being written, gives an error event and keeps its last
+        parsed case until it changes again.
+
+        Args:
+            directory (str): the directory to watch
+            extension (str): the extension of the files to watch (default = '.raw')
+            snapshot_dir (str): directory for pickled snapshots of the parsed cases (optional)
+            dtypes (str): the dtype policy of the parsed tables, None or 'compact'
+        '''
+
+        self.directory = directory
+        self.extension = extension
+        self.cache = CaseCache(snapshot_dir, dtypes)
+
+    @property
+    def cases(self):
+        '''Returns: a dictionary of the parsed cases keyed by path'''
+        return self.cache.cases
+
+    def scan(self):
+        '''Returns: the sorted paths of the watched files currently in the directory'''
+        paths = []
+        for file_name in os.listdir(self.directory):
+            path = os.path.join(self.directory, file_name)
+            if file_name.endswith(self.extension) and os.path.isfile(path):
+                paths.append(path)
+        return sorted(paths)
+
+    def poll(self):
+        '''checks the directory once, parsing new and changed files
+
+        Returns (list of WatchEvent):
+            one event for each file that was added, modified or removed,
+            and one for each changed file that could not be parsed
+        '''
+
+        events = []
+        paths = self.scan()
+
+        for path in paths:
+            known = path in self.cache
+            failure = self.cache.errors.get(path)
+            try:
+                old_case, case = self.cache.refresh(path)
+            except FileNotFoundError:
+                continue # removed while polling, picked up on the next poll
+            except PARSE_ERRORS as error:
+                # a file that failed before and did not change is not reported again
+                if self.cache.errors.get(path) is not failure:
+                    events.append(WatchEvent(CASE_ERROR, path, self.cases.get(path), [], str(error)))
+                continue
+            if old_case is case:
+                continue
+            tables = changed_tables(old_case, case)
+            if not known:
+                events.append(WatchEvent(CASE_ADDED, path, case, tables, None))
+            elif len(tables) > 0:
+                events.append(WatchEvent(CASE_MODIFIED, path, case, tables, None))
+
+        for path in sorted((set(self.cases) | set(self.cache.errors)) - set(paths)):
+            case = self.cache.discard(path)
+            if case is not None:
+                events.append(WatchEvent(CASE_REMOVED, path, None, list(case._fields), None))
+
+        return events
+
+    def watch(self, interval=1.0, polls=None):
+        '''polls the directory repeatedly
+
+        Args:
+            interval (float): seconds between two polls
+            polls (int): the number of polls to make, forever if None
+        Yields (WatchEvent):
+            the events of each poll, as they are found
+        '''
+
+        count = 0
+        while polls is None or count < polls:
+            if count > 0:
+                time.sleep(interval)
+            for event in self.poll():
+                yield event
+            count += 1
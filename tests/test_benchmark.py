@@ -0,0 +1,84 @@
+import json, os, pytest, tracemalloc
+
+import grg_pssedata
+import grg_pssedata.benchmark
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    with open(input_data, 'r') as psse_file:
+        text = psse_file.read()
+    times = grg_pssedata.benchmark.roundtrip_times(text)
+
+    sections = [section for section, stage, lines, size, seconds in times if stage == 'tokenize']
+    assert sections == list(grg_pssedata.benchmark.PARSE_SECTIONS)
+    lines = sum(lines for section, stage, lines, size, seconds in times if stage == 'tokenize')
+    assert 3 + lines <= len(text.split('\n'))
+    for section, stage, lines, size, seconds in times:
+        assert seconds >= 0
+
+
+class TestBenchmark:
+    def setup_method(self, _):
+        self.file_name = test_path+'/data/correct/powermodels/case14.raw'
+        self.case = grg_pssedata.io.parse_psse_case_file(self.file_name)
+
+    def test_001(self):
+        timings = []
+        grg_pssedata.io.parse_psse_case_file(self.file_name, timings=timings)
+        assert([timing.section for timing in timings[:3]] == ['case data', 'bus', 'load'])
+        assert(timings[-1].section == 'encoding')
+        assert(all(timing.seconds >= 0 for timing in timings))
+
+    def test_002(self):
+        with open(self.file_name, 'r') as psse_file:
+            lines = psse_file.read().split('\n')
+        ranges = grg_pssedata.benchmark.section_ranges(lines)
+        assert(ranges['bus'] == (3, 18))
+        assert(lines[ranges['bus'][1] - 1].startswith('0 '))
+        assert(ranges['load'][0] == ranges['bus'][1])
+
+    def test_003(self):
+        scaled = grg_pssedata.benchmark.scale_case(self.case, 3)
+        assert(len(scaled.bus) == 42)
+        assert(len(scaled.acline) == 3*len(self.case.acline))
+        assert(list(scaled.bus['ibus'][14:16]) == [15, 16])
+        assert(scaled.bus['ibus'].is_unique)
+        assert(scaled.acline['jbus'].isin(scaled.bus['ibus']).all())
+        assert((scaled.transformer2w['kbus'] == 0).all())
+        assert(scaled.area.equals(self.case.area))
+        with pytest.raises(ValueError):
+            grg_pssedata.benchmark.scale_case(self.case, 100000)
+
+    def test_004(self, tmpdir):
+        file_name = str(tmpdir.join('results.json'))
+        parser = grg_pssedata.benchmark.build_cli_parser()
+        args = parser.parse_args([self.file_name, '--scale', '1', '2', '--repeat', '2', '--output', file_name])
+        results = grg_pssedata.benchmark.main(args)
+        assert(list(results.columns) == grg_pssedata.benchmark.ROUNDTRIP_COLUMNS)
+        assert(list(results['case'].unique()) == ['case14.raw', 'case14.rawx2'])
+        bus = results[(results['section'] == 'bus') & (results['stage'] == 'parse')]
+        assert(list(bus['lines']) == [15, 29])
+        with open(file_name) as json_file:
+            records = json.load(json_file)
+        assert(len(records) == len(results))
+        assert(set(records[0]) == set(grg_pssedata.benchmark.ROUNDTRIP_COLUMNS))
+
+    def test_005(self):
+        component_class, indexed, line = grg_pssedata.benchmark.SAMPLE_LINES[0]
+        arguments, comment = grg_pssedata.io.parse_line(line)
+        arguments = [0] + arguments if indexed else arguments
+        memory, seconds = grg_pssedata.benchmark.measure(component_class, arguments, 10)
+        assert(memory > 0)
+        assert(not tracemalloc.is_tracing())
+
+        tracemalloc.start()
+        try:
+            grg_pssedata.benchmark.measure(component_class, arguments, 10)
+            assert(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
@@ -88,4 +88,4 @@ class TestParsing:
         self.case_1 = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/parser_test_a.raw')
 
     def test_001(self):
-        assert(len(self.case_1.buses) == 2)
+        assert(len(self.case_1.bus) == 2)
@@ -0,0 +1,43 @@
+import os, pytest
+
+import grg_pssedata
+
+from grg_pssedata.struct import Bus
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    psse_case = grg_pssedata.io.frames_to_case(case)
+    tables = grg_pssedata.io.case_to_frames(psse_case)
+
+    assert tables == case
+    assert tables.header == case.header
+    assert len(psse_case.buses) == len(case.bus)
+    assert len(psse_case.transformers) == len(case.transformer2w) + len(case.transformer3w)
+
+
+class TestConvert:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        psse_case = grg_pssedata.io.frames_to_case(self.case)
+        assert(psse_case.sbase == 100.0)
+        assert(psse_case.buses[0].i == 1)
+        assert(psse_case.to_psse().split('\n')[-1] == 'Q')
+        assert(grg_pssedata.io.CaseTables(*self.case).header == grg_pssedata.io.DEFAULT_HEADER)
+        assert(self.case._replace(bus=self.case.bus).header == self.case.header)
+
+    def test_002(self):
+        psse_case = grg_pssedata.io.frames_to_case(self.case)
+        psse_case.buses = [Bus(*bus.__df__()) for bus in psse_case.buses]
+        psse_case.transformers = list(psse_case.transformers)
+        tables = grg_pssedata.io.case_to_frames(psse_case)
+        assert(tables.bus.equals(self.case.bus))
+        assert(len(tables.transformer2w) == 3)
+        assert(len(tables.transformer3w) == 0)
@@ -10,7 +10,7 @@ from test_common import warning_files
 @pytest.mark.parametrize('input_data', correct_files)
 def test_001(input_data):
     case = grg_pssedata.io.parse_psse_case_file(input_data)
-    psse_data = case.to_psse()
+    psse_data = grg_pssedata.io.frames_to_case(case).to_psse()
     case_2 = grg_pssedata.io.parse_psse_case_str(psse_data)
     diff_count = grg_pssedata.cmd.diff(case, case_2)
 
@@ -22,7 +22,7 @@ def test_001(input_data):
 @pytest.mark.parametrize('input_data', warning_files)
 def test_002(input_data):
     case = grg_pssedata.io.parse_psse_case_file(input_data)
-    psse_data = case.to_psse()
+    psse_data = grg_pssedata.io.frames_to_case(case).to_psse()
     case_2 = grg_pssedata.io.parse_psse_case_str(psse_data)
     diff_count = grg_pssedata.cmd.diff(case, case_2)
 
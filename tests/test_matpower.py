@@ -0,0 +1,56 @@
+import os, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.matpower
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    mpc = grg_pssedata.matpower.case_matpower(case)
+
+    assert mpc.bus.shape == (len(case.bus) + len(case.transformer3w), len(grg_pssedata.matpower.BUS_COLUMNS))
+    assert len(mpc.branch) == len(case.acline) + len(case.transformer2w) + 3*len(case.transformer3w)
+    assert len(mpc.dcline) == len(case.twotermdc) + len(case.vscdc)
+    for matrix in mpc[1:]:
+        assert np.isfinite(matrix).all()
+
+
+class TestMatpower:
+    def test_001(self):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+        mpc = grg_pssedata.matpower.case_matpower(case)
+        assert(mpc.base_mva == 100.0)
+        assert(list(mpc.bus[1, :4]) == [2, 2, 21.7, 12.7])
+        assert(mpc.bus[8, 5] == 19.0)
+        assert(list(mpc.branch[-3, [0, 1, 8]]) == [4, 7, 0.978])
+
+    def test_002(self):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/three_winding_test.raw')
+        mpc = grg_pssedata.matpower.case_matpower(case)
+        assert(mpc.bus[-1, 0] == 1004)
+        assert(mpc.bus[-1, 8] == -5.0)
+        assert(list(mpc.branch[:, 1]) == [1004, 1004, 1004])
+        assert(np.allclose(mpc.branch[:, 3], [0.05, 0.15, 0.15]))
+
+    def test_003(self, tmpdir):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/two-terminal-hvdc_test.raw')
+        file_name = str(tmpdir.join('hvdc.m'))
+        grg_pssedata.matpower.write_matpower(case, file_name)
+        with open(file_name) as mfile:
+            lines = mfile.read().split('\n')
+        assert(lines[0] == 'function mpc = hvdc')
+        assert('mpc.dcline = [' in lines)
+        assert(lines[lines.index('mpc.bus = [') + 1] == '\t1001\t1\t0.0\t0.0\t0\t0\t101\t1.1\t0\t87\t201\t1.1\t0.9;')
+
+    def test_004(self):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+        trans2w = case.transformer2w.copy()
+        trans2w.loc[0, 'jbus'] = 99
+        with pytest.raises(ValueError, match='transformer2w jbus refers to bus 99'):
+            grg_pssedata.matpower.case_matpower(case._replace(transformer2w=trans2w))
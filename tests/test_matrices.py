@@ -0,0 +1,89 @@
+import os, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.matrices
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    matrices = grg_pssedata.matrices.network_matrices(case)
+
+    buses = len(case.bus) + len(case.transformer3w)
+    branches = len(matrices.branch_buses)
+    assert len(matrices.bus_numbers) == buses
+    assert matrices.incidence.shape == (branches, buses)
+    assert matrices.yf.shape == (branches, buses)
+    assert matrices.ybus.shape == (buses, buses)
+    assert (matrices.incidence.toarray().sum(axis=1) == 0).all()
+
+    # Ybus is Cf' Yf + Ct' Yt plus the bus shunts on the diagonal
+    incidence = matrices.incidence.toarray()
+    ybus = np.dot((incidence > 0).T, matrices.yf.toarray()) + np.dot((incidence < 0).T, matrices.yt.toarray())
+    difference = matrices.ybus.toarray() - ybus
+    assert np.allclose(difference - np.diag(np.diag(difference)), 0)
+
+
+class TestMatrices:
+    def setup_method(self, _):
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        matrices = grg_pssedata.matrices.network_matrices(self.case)
+        ybus = matrices.ybus.toarray()
+        assert(list(matrices.bus_numbers) == list(range(1, 15)))
+        assert(len(matrices.ybus) == 54)
+        assert(np.allclose(ybus, ybus.T))
+        assert(np.isclose(ybus[0, 1], -1/(0.01938 + 0.05917j)))
+        incidence = matrices.incidence.toarray()
+        branches = np.dot((incidence > 0).T, matrices.yf.toarray()) + np.dot((incidence < 0).T, matrices.yt.toarray())
+        assert(np.isclose(ybus[8, 8] - branches[8, 8], 0.19j))
+
+    def test_002(self):
+        kept, eliminated = grg_pssedata.matrices.bus_partition(np.array([5, 1, 9, 3]), [3, 5, 7])
+        assert(list(kept) == [0, 3])
+        assert(list(eliminated) == [1, 2])
+
+    def test_003(self):
+        matrix = grg_pssedata.matrices.CSRMatrix.from_coo([2, 0, 2, 0], [1, 2, 1, 0], [1.0, 2.0, 3.0, 4.0], (3, 3))
+        assert(list(matrix.indptr) == [0, 2, 2, 3])
+        assert(list(matrix.indices) == [0, 2, 1])
+        assert(list(matrix.data) == [4.0, 2.0, 4.0])
+        assert(np.array_equal(matrix.toarray(), [[4, 0, 2], [0, 0, 0], [0, 4, 0]]))
+
+    def test_004(self, tmpdir):
+        directory = str(tmpdir.join('matrices'))
+        matrices = grg_pssedata.matrices.export_matrices(self.case, [1, 2, 3, 99], directory)
+        assert(sorted(os.listdir(directory)) == ['buses.mtx', 'buses.npz', 'eliminated.mtx', 'incidence.mtx',
+            'incidence.npz', 'retained.mtx', 'ybus.mtx', 'ybus.npz', 'yf.mtx', 'yf.npz', 'yt.mtx', 'yt.npz'])
+        with open(os.path.join(directory, 'retained.mtx')) as mtx_file:
+            assert(mtx_file.read() == '%%MatrixMarket matrix array integer general\n3 1\n1\n2\n3\n')
+        with open(os.path.join(directory, 'ybus.mtx')) as mtx_file:
+            lines = mtx_file.read().split('\n')
+        assert(lines[0] == '%%MatrixMarket matrix coordinate complex general')
+        assert(lines[1] == '14 14 54')
+        with np.load(os.path.join(directory, 'buses.npz')) as buses:
+            assert(list(buses['retained']) == [0, 1, 2])
+            assert(len(buses['eliminated']) == 11)
+            assert(np.array_equal(buses['branch_buses'], matrices.branch_buses))
+
+    def test_005(self, tmpdir):
+        sparse = pytest.importorskip('scipy.sparse')
+        scipy_io = pytest.importorskip('scipy.io')
+        directory = str(tmpdir.join('matrices'))
+        matrices = grg_pssedata.matrices.export_matrices(self.case, [1, 2, 3], directory)
+        for name in ('incidence', 'yf', 'yt', 'ybus'):
+            dense = getattr(matrices, name).toarray()
+            assert(np.allclose(sparse.load_npz(os.path.join(directory, name + '.npz')).toarray(), dense))
+            assert(np.allclose(scipy_io.mmread(os.path.join(directory, name + '.mtx')).toarray(), dense))
+
+    def test_006(self):
+        acline = self.case.acline.copy()
+        acline.loc[0, 'jbus'] = 99
+        with pytest.raises(ValueError, match='from bus 1 to bus 99 refers to bus 99'):
+            grg_pssedata.matrices.network_matrices(self.case._replace(acline=acline))
@@ -0,0 +1,48 @@
+import io, json, os, pytest
+
+import grg_pssedata
+import grg_pssedata.powermodels
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    output = io.StringIO()
+    grg_pssedata.powermodels.write_powermodels(case, output, chunk_rows=2)
+    network = json.loads(output.getvalue())
+
+    assert network['per_unit'] == True
+    assert len(network['bus']) == len(case.bus) + len(case.transformer3w)
+    assert len(network['load']) == len(case.load)
+    assert len(network['shunt']) == len(case.fixshunt) + len(case.swshunt)
+    assert len(network['dcline']) == len(case.twotermdc) + len(case.vscdc)
+
+
+class TestPowerModels:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        output = io.StringIO()
+        grg_pssedata.powermodels.write_powermodels(self.case, output)
+        network = json.loads(output.getvalue())
+        assert(network['baseMVA'] == 100.0)
+        assert(network['source_version'] == '33')
+        assert(network['bus']['2']['bus_i'] == 2)
+        assert(network['load']['1'] == {'index': 1, 'load_bus': 2, 'pd': 0.217, 'qd': 0.127, 'status': 1})
+        assert(network['shunt']['1']['bs'] == 0.19)
+        assert(network['branch']['18']['transformer'] == True)
+        assert(network['branch']['18']['tap'] == 0.978)
+        assert(network['branch']['1']['tap'] == 1.0)
+
+    def test_002(self):
+        outputs = []
+        for chunk_rows in (1, 3, 10000):
+            output = io.StringIO()
+            grg_pssedata.powermodels.write_powermodels(self.case, output, chunk_rows=chunk_rows)
+            outputs.append(output.getvalue())
+        assert(outputs[0] == outputs[1] == outputs[2])
@@ -0,0 +1,90 @@
+import os, pytest
+
+import grg_pssedata
+import grg_pssedata.reduction
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestStageGraph:
+    def setup_method(self, _):
+        """Parse a network file and collect the reduction inputs"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+        self.sources = grg_pssedata.reduction.reduction_sources(self.case, [1], caplim=-1, kvlim=0, conlim=1, gencapthd=0, pois=[])
+
+    def test_001(self):
+        graph = grg_pssedata.reduction.build_reduction_graph()
+        results = graph.run(self.sources)
+        assert(len(graph.computed) == len(graph.stages))
+        assert(len(results['retbus']) > 0)
+        assert(set(results['retbus']) <= set(results['retainedbuses']))
+
+        graph.run(self.sources)
+        assert(len(graph.computed) == 0)
+
+    def test_002(self):
+        graph = grg_pssedata.reduction.build_reduction_graph()
+        results = graph.run(self.sources)
+        self.sources['conlim'] = 100
+        changed = graph.run(self.sources)
+        assert(graph.computed == ['border_buses', 'retbus', 'retainedbuses'])
+        assert(len(changed['retbus']) == 0)
+        assert(changed['allbranches'] is results['allbranches'])
+
+    def test_003(self):
+        graph = grg_pssedata.reduction.build_reduction_graph()
+        graph.run(self.sources, ['buscapc'])
+        assert('retbus' not in graph.computed)
+        assert('buscapc' in graph.computed)
+
+    def test_004(self, tmpdir):
+        cache_file = str(tmpdir.join('stages.pkl'))
+        grg_pssedata.reduction.build_reduction_graph(cache_file).run(self.sources)
+        assert(os.path.isfile(cache_file))
+
+        graph = grg_pssedata.reduction.build_reduction_graph(cache_file)
+        graph.run(self.sources)
+        assert(len(graph.computed) == 0)
+
+    def test_005(self):
+        bus = self.case.bus.copy()
+        grg_pssedata.reduction.build_reduction_graph().run(self.sources)
+        assert(self.case.bus.equals(bus))
+
+    def test_006(self):
+        stages = [
+            grg_pssedata.reduction.Stage('a', lambda b: b, ['b']),
+            grg_pssedata.reduction.Stage('b', lambda a: a, ['a']),
+        ]
+        with pytest.raises(ValueError):
+            grg_pssedata.reduction.StageGraph(stages)
+
+    def test_007(self):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/three_winding_test.raw')
+        trans3w = case.transformer3w[["ibus", "jbus", "kbus", "ckt", "cw", "cz", "name", "stat", "vecgrp",
+            "r1_2", "x1_2", "sbase1_2", "r2_3", "x2_3", "sbase2_3", "r3_1", "x3_1", "sbase3_1",
+            "wdg1rate1", "wdg1rate2", "wdg1rate3", "wdg2rate1", "wdg2rate2", "wdg2rate3",
+            "wdg3rate1", "wdg3rate2", "wdg3rate3"]]
+        for stat, pairs in ((1, 3), (2, 2), (3, 2), (4, 2)):
+            windings = grg_pssedata.reduction.fix_trans3w(trans3w.assign(stat=stat))
+            assert(len(windings) == pairs)
+        windings = grg_pssedata.reduction.fix_trans3w(trans3w.assign(stat=4))
+        ibus, jbus, kbus = trans3w.iloc[0][['ibus', 'jbus', 'kbus']]
+        assert(list(zip(windings['ibus'], windings['jbus'])) == [(jbus, kbus), (ibus, kbus)])
+
+    def test_008(self, tmpdir):
+        cache_file = str(tmpdir.join('stages.pkl'))
+        graph = grg_pssedata.reduction.StageGraph([grg_pssedata.reduction.Stage('s', lambda x: x+1, ['x'])], cache_file)
+        assert(graph.run({'x': 1}) == {'s': 2})
+        graph = grg_pssedata.reduction.StageGraph([grg_pssedata.reduction.Stage('s', lambda x: x+100, ['x'])], cache_file)
+        assert(graph.run({'x': 1}) == {'s': 101})
+        assert(graph.computed == ['s'])
+
+    def test_009(self):
+        graph = grg_pssedata.reduction.build_reduction_graph()
+        graph.run(self.sources, ['buses'])
+        assert(set(self.case.__dict__['_fingerprints']) == set(['bus']))
+        load = self.case.load.copy()
+        load.loc[0, 'pl'] = 1.0
+        graph.run(dict(self.sources, case=self.case._replace(load=load)), ['buses'])
+        assert(graph.computed == [])
+
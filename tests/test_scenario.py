@@ -0,0 +1,61 @@
+import os, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.scenario
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestScenarioOverlay:
+    def setup_method(self, _):
+        """Parse a base network file"""
+        self.base = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+        self.load = self.base.load.copy()
+
+    def test_001(self):
+        scenario = grg_pssedata.scenario.ScenarioOverlay(self.base)
+        assert(scenario.table('load') is self.base.load)
+        scenario.scale('load', 'pl', 1.5)
+        load = scenario.table('load')
+        assert(np.allclose(load['pl'], self.load['pl']*1.5))
+        assert(self.base.load.equals(self.load))
+        assert(scenario.delta_count() == len(self.load))
+
+    def test_002(self):
+        scenario = grg_pssedata.scenario.ScenarioOverlay(self.base)
+        scenario.outage('acline', [0, 3])
+        scenario.outage('bus', [13])
+        case = scenario.case()
+        assert(list(case.acline['stat'][[0, 1, 3]]) == [0, 1, 0])
+        assert(case.bus['ide'][13] == 4)
+        assert(case.generator is self.base.generator)
+        assert(scenario.changed_tables() == ['bus', 'acline'])
+
+    def test_003(self):
+        scenario = grg_pssedata.scenario.ScenarioOverlay(self.base)
+        scenario.set('generator', 'pg', [1], 10)
+        table = scenario.table('generator')
+        assert(np.shares_memory(table['qg'].to_numpy(), self.base.generator['qg'].to_numpy()))
+        assert(not np.shares_memory(table['pg'].to_numpy(), self.base.generator['pg'].to_numpy()))
+        assert(scenario.value('generator', 'pg', 1) == 10)
+        assert(scenario.value('generator', 'pg', 0) == self.base.generator['pg'][0])
+
+    def test_004(self):
+        scenario = grg_pssedata.scenario.ScenarioOverlay(self.base)
+        scenario.set('load', 'pl', [0], 1.0)
+        derived = scenario.derive()
+        derived.set('load', 'pl', [0], 2.0)
+        assert(scenario.table('load')['pl'][0] == 1.0)
+        assert(derived.table('load')['pl'][0] == 2.0)
+        derived.clear('load')
+        assert(derived.table('load') is self.base.load)
+
+    def test_005(self):
+        scenario = grg_pssedata.scenario.ScenarioOverlay(self.base)
+        with pytest.raises(ValueError):
+            scenario.set('load', 'pl', [100], 1.0)
+        with pytest.raises(ValueError):
+            scenario.set('load', 'unknown', [0], 1.0)
+        with pytest.raises(ValueError):
+            scenario.outage('area', [0])
@@ -0,0 +1,113 @@
+import os, threading, pytest
+
+import grg_pssedata
+import grg_pssedata.server
+
+from grg_pssedata.exception import PSSEDataServerError
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestCaseServer:
+    def setup_method(self, _):
+        """Start a case server on a unix socket"""
+        self.case_5 = test_path+'/data/correct/powermodels/case5.raw'
+        self.case_14 = test_path+'/data/correct/powermodels/case14.raw'
+
+    def start(self, address):
+        server = grg_pssedata.server.build_server(address)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return server
+
+    def stop(self, server):
+        server.shutdown()
+        server.server_close()
+
+    def test_001(self, tmpdir):
+        server = self.start(str(tmpdir.join('cases.sock')))
+        with grg_pssedata.server.CaseClient(server.server_address) as client:
+            counts = client.load(self.case_14)
+            assert(counts['bus'] == 14)
+            assert(client.cases() == [os.path.abspath(self.case_14)])
+
+            bus = client.table(self.case_14, 'bus')
+            assert(list(bus['ibus']) == list(range(1, 15)))
+            bus = client.table(self.case_14, 'bus', columns=['ibus', 'baskv'])
+            assert(list(bus.columns) == ['ibus', 'baskv'])
+        self.stop(server)
+
+    def test_002(self, tmpdir):
+        server = self.start(str(tmpdir.join('cases.sock')))
+        with grg_pssedata.server.CaseClient(server.server_address) as client:
+            rows = client.lookup(self.case_14, 'acline', ibus=1, jbus=2)
+            assert(len(rows) == 1)
+            assert(rows['jbus'][0] == 2)
+            assert(len(client.lookup(self.case_14, 'bus', ibus=100)) == 0)
+            rows = client.lookup(self.case_14, 'acline', ibus=1, jbus=2, ckt='1')
+            assert(len(rows) == 1)
+            assert(rows['ckt'][0].strip() == '1')
+            assert(len(client.lookup(self.case_14, 'acline', ibus=1, jbus=2, ckt='2')) == 0)
+            assert(list(client.lookup(self.case_14, 'bus', ibus=3)['ibus']) == [3])
+            assert(len(client.lookup(self.case_14, 'acline', ibus=2)) == 3)
+        self.stop(server)
+
+    def test_003(self, tmpdir):
+        server = self.start(str(tmpdir.join('cases.sock')))
+        with grg_pssedata.server.CaseClient(server.server_address) as client:
+            tables = client.diff(self.case_5, self.case_14)
+            assert(tables['bus'] == [5, 14])
+            assert(client.diff(self.case_14, self.case_14) == {})
+            with open(self.case_14) as case_file:
+                lines = case_file.read().split('\n')
+            lines[0] = lines[0].replace('100.00', '200.00')
+            case_200 = str(tmpdir.join('case14.raw'))
+            with open(case_200, 'w') as case_file:
+                case_file.write('\n'.join(lines))
+            tables = client.diff(self.case_14, case_200)
+            assert(list(tables) == ['header'])
+            assert([sbase for _, sbase, *_ in tables['header']] == [100.0, 200.0])
+            assert(client.unload(self.case_5))
+            assert(not client.unload(self.case_5))
+        self.stop(server)
+
+    def test_004(self, tmpdir):
+        server = self.start(str(tmpdir.join('cases.sock')))
+        with grg_pssedata.server.CaseClient(server.server_address) as client:
+            with pytest.raises(PSSEDataServerError):
+                client.request('unknown')
+            with pytest.raises(PSSEDataServerError):
+                client.table(str(tmpdir.join('missing.raw')), 'bus')
+            assert(client.load(self.case_5)['bus'] == 5)
+            for table in ('_replace', 'header', 'index'):
+                with pytest.raises(PSSEDataServerError, match='unknown table'):
+                    client.table(self.case_5, table)
+                with pytest.raises(PSSEDataServerError, match='unknown table'):
+                    client.lookup(self.case_5, table, ibus=1)
+            with pytest.raises(PSSEDataServerError, match='unknown columns'):
+                client.lookup(self.case_5, 'bus', bus=1)
+        self.stop(server)
+
+    def test_005(self):
+        server = self.start(0)
+        with grg_pssedata.server.CaseClient(server.server_address[1]) as client:
+            assert(client.load(self.case_5)['generator'] == 5)
+        self.stop(server)
+
+    def test_006(self, tmpdir):
+        with open(self.case_14) as case_file:
+            lines = case_file.read().split('\n')
+        load = [line for line in lines if line.startswith("    2,'1 ',")][0]
+        lines.insert(lines.index(load) + 1, load.replace('21.700', '30.000'))
+        file_name = str(tmpdir.join('case14.raw'))
+        with open(file_name, 'w') as case_file:
+            case_file.write('\n'.join(lines))
+
+        server = self.start(str(tmpdir.join('cases.sock')))
+        with grg_pssedata.server.CaseClient(server.server_address) as client:
+            rows = client.lookup(file_name, 'load', ibus=2, loadid='1')
+            assert(list(rows['pl']) == [21.7, 30.0])
+            assert(list(client.lookup(file_name, 'load', ibus=2)['pl']) == [21.7, 30.0])
+            assert(len(client.lookup(file_name, 'load', ibus=3, loadid='1')) == 1)
+        self.stop(server)
+
@@ -0,0 +1,47 @@
+import os, pickle, multiprocessing, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.shared
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+def bus_voltage_sum(descriptor):
+    with grg_pssedata.shared.attach_case(descriptor) as case:
+        return float(case['bus']['baskv'].sum())
+
+class TestSharedCase:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        with grg_pssedata.shared.publish_case(self.case) as shared:
+            descriptor = pickle.loads(pickle.dumps(shared.descriptor))
+            attached = grg_pssedata.shared.attach_case(descriptor)
+            assert(np.array_equal(attached['bus']['ibus'], self.case.bus['ibus'].to_numpy()))
+            assert(np.array_equal(attached['acline']['rate1'], self.case.acline['rate1'].to_numpy()))
+            assert('name' not in attached['bus'])
+            attached.close()
+
+    def test_002(self):
+        with grg_pssedata.shared.publish_case(self.case) as shared:
+            with grg_pssedata.shared.attach_case(shared.descriptor) as attached:
+                with pytest.raises(ValueError):
+                    attached['bus']['baskv'][0] = 0.0
+
+    def test_003(self):
+        with grg_pssedata.shared.publish_case(self.case) as shared:
+            with grg_pssedata.shared.attach_case(shared.descriptor) as attached:
+                table = attached.table('generator')
+                assert(list(table.columns) == grg_pssedata.shared.numeric_columns(self.case.generator))
+                assert(table['pg'].equals(self.case.generator['pg']))
+                del table
+
+    def test_004(self):
+        context = multiprocessing.get_context('fork')
+        with grg_pssedata.shared.publish_case(self.case) as shared:
+            with context.Pool(2) as pool:
+                sums = pool.map(bus_voltage_sum, [shared.descriptor]*4)
+        assert(sums == [self.case.bus['baskv'].sum()]*4)
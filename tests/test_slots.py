@@ -0,0 +1,45 @@
+import pickle, pytest
+
+import grg_pssedata
+import grg_pssedata.benchmark
+
+from grg_pssedata.io import parse_line
+from grg_pssedata.struct import Bus
+from grg_pssedata.struct import MultiSectionLineGrouping
+
+class TestSlots:
+    def setup_method(self, _):
+        """Build components from their pss/e records"""
+        self.bus_line = parse_line(grg_pssedata.benchmark.SAMPLE_LINES[0][2])[0]
+
+    def test_001(self):
+        bus = Bus(*self.bus_line)
+        assert(not hasattr(bus, '__dict__'))
+        with pytest.raises(AttributeError):
+            bus.unknown = 1
+
+    def test_002(self):
+        bus_1 = Bus(*self.bus_line)
+        bus_2 = Bus(*self.bus_line)
+        assert(bus_1 == bus_2)
+        bus_2.vm = 1.0
+        assert(bus_1 != bus_2)
+        assert(str(bus_1) == str(Bus(*self.bus_line)))
+        assert(bus_1.to_psse() == Bus(*self.bus_line).to_psse())
+
+    def test_003(self):
+        bus = Bus(*self.bus_line)
+        assert(pickle.loads(pickle.dumps(bus)) == bus)
+
+    def test_004(self):
+        grouping_1 = MultiSectionLineGrouping(0, 1, 2, "'&1'", 1, 3, 4)
+        grouping_2 = MultiSectionLineGrouping(0, 1, 2, "'&1'", 1, 3, 4)
+        assert(grouping_1 == grouping_2)
+        assert(grouping_1.__df__() == [1, 2, '&1', 1, 3, 4])
+        assert(grouping_1 != MultiSectionLineGrouping(0, 1, 2, "'&1'", 1, 3))
+
+    def test_005(self):
+        results = grg_pssedata.benchmark.slots_benchmark(100)
+        assert(len(results) == len(grg_pssedata.benchmark.SAMPLE_LINES))
+        for name, slot_bytes, slot_seconds, dict_bytes, dict_seconds in results:
+            assert(slot_bytes < dict_bytes)
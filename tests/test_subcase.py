@@ -0,0 +1,67 @@
+import io, os, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.cmd
+import grg_pssedata.subcase
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    buses = list(case.bus['ibus'][:2])
+    subcase = grg_pssedata.subcase.extract_subcase(case, buses=buses)
+
+    assert list(subcase.bus['ibus']) == buses
+    assert subcase.load['ibus'].isin(buses).all()
+    assert subcase.acline['ibus'].isin(buses).all()
+    assert subcase.acline['jbus'].isin(buses).all()
+
+    output = io.StringIO()
+    grg_pssedata.io.write_psse(subcase, output)
+    reparsed = grg_pssedata.io.parse_psse_case_str(output.getvalue())
+    assert len(reparsed.bus) == len(buses)
+    # empty tables compare equal whatever dtypes they were built with
+    assert all(len(getattr(subcase, name)) > 0 for name in reparsed.changed_tables(subcase))
+    output_2 = io.StringIO()
+    grg_pssedata.io.write_psse(reparsed, output_2)
+    assert output_2.getvalue() == output.getvalue()
+
+
+class TestSubcase:
+    def setup_method(self, _):
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case73.raw')
+
+    def test_001(self):
+        subcase = grg_pssedata.subcase.extract_subcase(self.case, areas=[2])
+        assert(len(subcase.bus) == 24)
+        assert((subcase.bus['area'] == 2).all())
+        assert(len(subcase.generator) == 33)
+        assert(len(subcase.acline) == 33)
+        assert(len(subcase.transformer2w) == 5)
+        assert(list(subcase.area['iarea']) == [2])
+        assert(list(subcase.bus.index) == list(range(24)))
+        assert(subcase.header == self.case.header)
+
+    def test_002(self):
+        mask = grg_pssedata.subcase.selected_buses(self.case, areas=[1], buses=[201, 301])
+        assert(mask.sum() == 26)
+        assert(not grg_pssedata.subcase.selected_buses(self.case).any())
+
+    def test_003(self):
+        case = self.case._replace(generator=self.case.generator.assign(ireg=301))
+        subcase = grg_pssedata.subcase.extract_subcase(case, areas=[1, 2])
+        assert((subcase.generator['ireg'] == 0).all())
+        assert(len(subcase.validate()) == 0)
+
+    def test_004(self, tmpdir):
+        file_name = str(tmpdir.join('area3.raw'))
+        args = grg_pssedata.cmd.build_cmd_parser().parse_args(['extract',
+            test_path+'/data/correct/powermodels/case73.raw', file_name, '--areas', '3'])
+        subcase = grg_pssedata.cmd.main(args)
+        assert(len(subcase.bus) == 25)
+        assert(grg_pssedata.io.parse_psse_case_file(file_name) == subcase)
@@ -0,0 +1,305 @@
+import os, pickle, pytest, tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import grg_pssedata
+import grg_pssedata.cmd
+import grg_pssedata.tables
+
+from grg_pssedata.io import parse_line
+from grg_pssedata.struct import Bus
+from grg_pssedata.struct import Case
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestComponentTable:
+    def setup_method(self, _):
+        """Parse a network file and build its component tables"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+        self.tables = grg_pssedata.tables.component_tables(self.case)
+
+    def test_001(self):
+        buses = self.tables['bus']
+        assert(len(buses) == 14)
+        assert(buses[0].i == 1)
+        assert(buses[-1].i == 14)
+        assert(isinstance(buses[0].basekv, float))
+        assert(isinstance(buses[0].ide, int))
+        assert(buses[0].name == self.case.bus['name'][0])
+        assert([bus.i for bus in buses[2:4]] == [3, 4])
+        with pytest.raises(IndexError):
+            buses[14]
+
+    def test_002(self):
+        line = "    1,'Bus 1     HV', 138.0000,3,   1,   1,   1,1.05999994,   0.000000, 1.06000, 0.94000, 1.10000, 0.90000"
+        bus = Bus(*parse_line(line)[0])
+        view = self.tables['bus'][0]
+        assert(view == bus)
+        assert(bus == view)
+        assert(view.to_psse() == bus.to_psse())
+        assert(str(view) == str(bus))
+        assert(view.__df__() == bus.__df__())
+
+    def test_003(self):
+        buses = self.tables['bus']
+        buses[0].vm = 1.5
+        assert(buses.column('vm')[0] == 1.5)
+        assert(not hasattr(buses[0], '__dict__'))
+
+    def test_004(self):
+        transformers = self.tables['transformer2w']
+        assert(len(transformers) == 3)
+        transformer = transformers[0]
+        assert(transformer.p1.i == self.case.transformer2w['ibus'][0])
+        assert(transformer.w1.index == 1)
+        assert(transformer.w2.index == 2)
+        assert(transformer.w2.nomv == self.case.transformer2w['nomv2'][0])
+        assert(len(transformer.to_psse().split('\n')) == 4)
+
+    def test_005(self):
+        buses = self.tables['bus']
+        components = [Bus(*bus.__df__()) for bus in buses]
+        table = grg_pssedata.tables.ComponentTable.from_components(Bus, components)
+        assert(table == buses)
+        assert(table.to_frame(self.case.bus.columns).equals(self.case.bus))
+
+    def test_006(self):
+        t = self.tables
+        transformers = grg_pssedata.tables.TableSequence([t['transformer2w'], t['transformer3w']])
+        case = Case(0, 100.0, 33, 0, 0, 60.0, 'record 1', 'record 2',
+            t['bus'], t['load'], t['fixshunt'], t['generator'], t['acline'], transformers,
+            t['area'], t['twotermdc'], t['vscdc'], [], [], [], t['zone'], [], t['owner'],
+            t['facts'], t['swshunt'], [], [])
+        assert(case.buses[3].basekv == self.case.bus['baskv'][3])
+        assert(len(case.transformers) == 3)
+        lines = case.to_psse().split('\n')
+        assert(lines[3].strip() == t['bus'][0].to_psse())
+        assert(lines[-1] == 'Q')
+
+class TestCompactDtypes:
+    def setup_method(self, _):
+        """Parse a network file with both dtype policies"""
+        self.file_name = test_path+'/data/correct/powermodels/frankenstein_70.raw'
+        self.case = grg_pssedata.io.parse_psse_case_file(self.file_name)
+        self.compact = grg_pssedata.io.parse_psse_case_file(self.file_name, dtypes='compact')
+
+    def test_001(self):
+        bus = self.compact.bus
+        assert(bus['ibus'].dtype == np.int32)
+        assert(bus['ide'].dtype == np.int8)
+        assert(bus['name'].dtype == 'category')
+        assert(self.compact.acline['ckt'].dtype == 'category')
+        assert(self.compact.generator['stat'].dtype == np.int8)
+        assert(self.compact.transformer2w['cw'].dtype == np.int8)
+
+    def test_002(self):
+        for table, compact in zip(self.case, self.compact):
+            for column in table.columns:
+                if pd.api.types.is_numeric_dtype(table[column].dtype):
+                    values = compact[column].to_numpy()
+                    if values.dtype == np.float32:
+                        values = values.astype(str).astype(float)
+                    assert(np.array_equal(table[column].to_numpy(dtype=float), values.astype(float), equal_nan=True))
+                else:
+                    assert(list(table[column]) == list(compact[column]))
+
+    def test_003(self):
+        savings = grg_pssedata.tables.memory_savings(self.case, self.compact)
+        assert(list(savings['table']) == list(self.case._fields))
+        assert((savings['compact_bytes'] <= savings['bytes']).all())
+        assert(savings['saved'][0] > 0.0)
+
+    def test_004(self):
+        column = pd.Series([1.06, 1.05999994])
+        assert(grg_pssedata.tables.compact_column('vm', column).dtype == np.float64)
+        assert(grg_pssedata.tables.compact_column('vm', column, rtol=1e-6).dtype == np.float32)
+        assert(grg_pssedata.tables.compact_column('vm', pd.Series([1.06, -4.98])).dtype == np.float32)
+        column = pd.Series([1, 100000])
+        assert(grg_pssedata.tables.compact_column('stat', column).dtype == np.int32)
+        with pytest.raises(ValueError):
+            grg_pssedata.io.parse_psse_case_file(self.file_name, dtypes='small')
+
+class TestStringDictionary:
+    def setup_method(self, _):
+        """Name the network files to parse"""
+        self.case_14 = test_path+'/data/correct/powermodels/case14.raw'
+        self.case_24 = test_path+'/data/correct/powermodels/case24.raw'
+
+    def test_001(self):
+        strings = grg_pssedata.tables.StringDictionary(['a'])
+        codes = strings.encode(['b', 'a', 'b', None])
+        assert(codes.dtype == np.int32)
+        assert(list(codes) == [1, 0, 1, -1])
+        assert(list(strings.decode(codes)) == ['b', 'a', 'b', None])
+        assert(len(strings) == 2)
+
+    def test_002(self):
+        strings = grg_pssedata.tables.StringDictionary()
+        case = grg_pssedata.io.parse_psse_case_file(self.case_14)
+        encoded = grg_pssedata.io.parse_psse_case_file(self.case_14, strings=strings)
+        assert(encoded.bus['name'].dtype == np.int32)
+        assert(encoded.acline['ckt'].dtype == np.int32)
+        assert(list(strings.decode(encoded.bus['name'])) == list(case.bus['name']))
+        assert(encoded.bus['baskv'].equals(case.bus['baskv']))
+
+    def test_003(self):
+        strings = grg_pssedata.tables.StringDictionary()
+        case_14 = grg_pssedata.io.parse_psse_case_file(self.case_14, strings=strings)
+        size = len(strings)
+        case_14_again = grg_pssedata.io.parse_psse_case_file(self.case_14, strings=strings)
+        assert(len(strings) == size)
+        assert(case_14.load['loadid'].equals(case_14_again.load['loadid']))
+
+        case_24 = grg_pssedata.io.parse_psse_case_file(self.case_24, strings=strings, dtypes='compact')
+        assert(case_24.load['loadid'][0] == case_14.load['loadid'][0])
+
+    def test_004(self):
+        name_1 = grg_pssedata.struct.unquote_string("'" + 'Bus' + ' 1' + "'")
+        name_2 = grg_pssedata.struct.unquote_string("'Bus 1'")
+        assert(name_1 is name_2)
+
+class TestMemoryReport:
+    def setup_method(self, _):
+        """Name a network file to parse"""
+        self.file_name = test_path+'/data/correct/powermodels/case14.raw'
+
+    def test_001(self):
+        case = grg_pssedata.io.parse_psse_case_file(self.file_name)
+        report = grg_pssedata.tables.case_memory_report(case)
+        bus = report[report['table'] == 'bus']
+        assert(list(bus['column']) == ['Index'] + list(case.bus.columns))
+        assert(bus['bytes'].sum() == grg_pssedata.tables.table_memory(case.bus))
+        assert(report['bytes'].sum() == sum(grg_pssedata.tables.table_memory(table) for table in case))
+
+    def test_002(self):
+        allocations = []
+        grg_pssedata.io.parse_psse_case_file(self.file_name, memory=allocations)
+        sections = [allocation.section for allocation in allocations]
+        assert(sections[:6] == ['case data', 'bus', 'load', 'fixed shunt', 'generator', 'branch'])
+        assert(sections[-1] == 'encoding')
+        assert(all(allocation.peak >= allocation.current for allocation in allocations))
+        assert(allocations[1].current > 0)
+        assert(not tracemalloc.is_tracing())
+
+    def test_003(self):
+        with open(self.file_name) as case_file:
+            text = case_file.read()
+        with pytest.raises(grg_pssedata.exception.PSSEDataParsingError):
+            grg_pssedata.io.parse_psse_case_str(text[:300], memory=[])
+        assert(not tracemalloc.is_tracing())
+
+class TestFingerprints:
+    def setup_method(self, _):
+        """Parse two copies of a network file"""
+        self.file_name = test_path+'/data/correct/powermodels/case14.raw'
+        self.case_1 = grg_pssedata.io.parse_psse_case_file(self.file_name)
+        self.case_2 = grg_pssedata.io.parse_psse_case_file(self.file_name)
+
+    def test_001(self):
+        assert(self.case_1.fingerprints() == self.case_2.fingerprints())
+        assert(self.case_1 == self.case_2)
+        assert(self.case_1.fingerprint('bus') is self.case_1.fingerprint('bus'))
+
+    def test_002(self):
+        load = self.case_2.load.copy()
+        load.loc[2, 'pl'] = 1.0
+        case_2 = self.case_2._replace(load=load)
+        assert(self.case_1 != case_2)
+        assert(self.case_1.changed_tables(case_2) == ['load'])
+        assert(grg_pssedata.cmd.diff(self.case_1, case_2) == 1)
+        assert(not grg_pssedata.cmd.eq(self.case_1, case_2))
+
+    def test_003(self):
+        compact = grg_pssedata.io.parse_psse_case_file(self.file_name, dtypes='compact')
+        assert(compact.fingerprint('bus') != self.case_1.fingerprint('bus'))
+        bus = self.case_1.bus.copy()
+        bus.index = bus.index + 1
+        assert(grg_pssedata.tables.table_fingerprint(bus) != self.case_1.fingerprint('bus'))
+        assert(pickle.loads(pickle.dumps(self.case_1)) == self.case_1)
+
+    def test_004(self):
+        empty = self.case_1.bus[self.case_1.bus['ibus'] < 0]
+        parsed = pd.DataFrame(data=[], columns=list(self.case_1.bus.columns))
+        assert(grg_pssedata.tables.table_fingerprint(empty) == grg_pssedata.tables.table_fingerprint(parsed))
+        assert(grg_pssedata.tables.table_fingerprint(empty) != grg_pssedata.tables.table_fingerprint(parsed[['ibus']]))
+
+    def test_005(self):
+        with open(self.file_name) as case_file:
+            lines = case_file.read().split('\n')
+        lines[0] = lines[0].replace('100.00', '200.00')
+        case_2 = grg_pssedata.io.parse_psse_case_str('\n'.join(lines))
+        assert(self.case_1 != case_2)
+        assert(self.case_1.changed_tables(case_2) == [])
+        fingerprints_1, fingerprints_2 = self.case_1.fingerprints(), case_2.fingerprints()
+        assert([name for name in fingerprints_1 if fingerprints_1[name] != fingerprints_2[name]] == ['header'])
+        case_3 = self.case_2._replace()
+        case_3.__dict__['_header'] = self.case_2.header._replace(record1='other')
+        assert(self.case_2 != case_3)
+        assert(grg_pssedata.watch.changed_tables(self.case_2, case_3) == ['header'])
+
+class TestKeyIndex:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        assert(self.case.index('bus') is self.case.index('bus'))
+        assert(self.case.index('bus').position(14) == 13)
+        assert(list(self.case.lookup('bus', [3, 99, 1])) == [2, -1, 0])
+        assert(list(self.case.lookup('bus', self.case.load['ibus'])) == list(self.case.bus.index[self.case.bus['ibus'].isin(self.case.load['ibus'])]))
+
+    def test_002(self):
+        acline = self.case.acline
+        assert(list(self.case.lookup('acline', [(1, 5, '1'), (1, 2, '1 '), (1, 2, '2')])) == [1, 0, -1])
+        assert(list(self.case.lookup('acline', acline)) == list(range(len(acline))))
+        assert((1, 5, '1') in self.case.index('acline'))
+        assert(list(self.case.lookup('transformer3w', [(1, 2, 3, '1')])) == [-1])
+
+    def test_003(self):
+        compact = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw', dtypes='compact')
+        keys = list(zip(self.case.generator['ibus'], self.case.generator['machid']))
+        assert(list(compact.lookup('generator', keys)) == list(range(len(keys))))
+        rows = compact.index('bus').take([2, 100], ['baskv'])
+        assert(rows['baskv'][0] == compact.bus['baskv'][1])
+        assert(np.isnan(rows['baskv'][1]))
+
+    def test_004(self):
+        self.case.index('bus')
+        self.case.fingerprint('bus')
+        case = pickle.loads(pickle.dumps(self.case))
+        assert('_indexes' not in case.__dict__)
+        assert(case.fingerprint('bus') == self.case.fingerprint('bus'))
+        table = pd.DataFrame({'ibus': [1, 2, 1]})
+        assert(grg_pssedata.tables.KeyIndex(table, ['ibus']).duplicates == 1)
+
+class TestBusNumbering:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+
+    def test_001(self):
+        numbering = self.case.numbering()
+        assert(numbering is self.case.numbering())
+        assert(len(numbering) == len(self.case.bus))
+        dense = numbering.to_dense(self.case.bus['ibus'])
+        assert(list(dense) == list(range(len(self.case.bus))))
+        assert(list(numbering.to_external(dense)) == list(self.case.bus['ibus']))
+
+    def test_002(self):
+        numbering = self.case.numbering()
+        ends = numbering.table_buses(self.case.acline)
+        assert(list(ends) == ['ibus', 'jbus'])
+        assert((ends['ibus'] >= 0).all() and (ends['jbus'] >= 0).all())
+        assert(list(numbering.to_external(ends['jbus'])) == list(self.case.acline['jbus']))
+        assert((numbering.table_buses(self.case.transformer2w)['kbus'] == -1).all())
+        assert(list(numbering.to_dense([0, -3, 999997])) == [-1, -1, -1])
+        assert(list(numbering.to_external([-1, len(numbering), 0])) == [-1, -1, self.case.bus['ibus'][0]])
+
+    def test_003(self):
+        numbering = grg_pssedata.tables.BusNumbering([5000000, 10, 7, 10])
+        assert(numbering.lookup_array is None)
+        assert(numbering.duplicates == 1)
+        assert(list(numbering.to_dense([7, 5000000, 8, 10])) == [2, 0, -1, 1])
+        assert(list(grg_pssedata.tables.BusNumbering([]).to_dense([1])) == [-1])
+        assert(list(grg_pssedata.tables.BusNumbering([]).to_external([-1, 0])) == [-1, -1])
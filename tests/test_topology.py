@@ -0,0 +1,63 @@
+import os, pickle, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.reduction
+import grg_pssedata.topology
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestBusAdjacency:
+    def setup_method(self, _):
+        """Parse a network file and build its adjacency"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        self.adjacency = grg_pssedata.topology.BusAdjacency.from_case(self.case)
+
+    def test_001(self):
+        case = self.case
+        assert(len(self.adjacency) == len(case.acline) + len(case.transformer2w) + 3*len(case.transformer3w) + len(case.twotermdc) + len(case.vscdc))
+        assert(self.adjacency.degree().sum() == 2*len(self.adjacency))
+        assert(self.adjacency.indptr[-1] == 2*len(self.adjacency))
+
+    def test_002(self):
+        acline = self.case.acline
+        bus = acline['ibus'][0]
+        neighbors = self.adjacency.external_neighbors([bus], kinds=['acline'])
+        expected = set(acline.loc[acline['ibus'] == bus, 'jbus']) | set(acline.loc[acline['jbus'] == bus, 'ibus'])
+        assert(set(neighbors) == expected)
+
+    def test_003(self):
+        dense = self.case.numbering().to_dense([self.case.bus['ibus'][0]])
+        edges = self.adjacency.edge_frame(self.adjacency.incident_edges(dense))
+        bus = self.case.bus['ibus'][0]
+        assert(((edges['ibus'] == bus) | (edges['jbus'] == bus)).all())
+        assert(set(edges['kind']) <= set(grg_pssedata.topology.EDGE_KINDS))
+        assert(len(self.adjacency.incident_edges([-1])) == 0)
+
+    def test_004(self):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/three_winding_test.raw')
+        transformer = case.transformer3w.copy()
+        transformer.loc[0, 'stat'] = 2
+        adjacency = grg_pssedata.topology.BusAdjacency.from_case(case._replace(transformer3w=transformer))
+        frame = adjacency.edge_frame()
+        assert(list(frame['stat']) == [1, 0, 1])
+        assert(list(adjacency.degree(in_service=True)) == [2, 1, 1])
+        assert(list(adjacency.neighbors([1], in_service=True)) == [0])
+
+    def test_005(self):
+        adjacency = self.case.adjacency()
+        assert(adjacency is self.case.adjacency())
+        assert(np.array_equal(adjacency.indptr, self.adjacency.indptr))
+        assert(np.array_equal(adjacency.indices, self.adjacency.indices))
+        case = pickle.loads(pickle.dumps(self.case))
+        assert('_adjacency' not in case.__dict__)
+
+        graph = grg_pssedata.reduction.build_reduction_graph()
+        results = graph.run(grg_pssedata.reduction.reduction_sources(self.case, [1]), ['adjacency', 'allbrancheson', 'buson'])
+        assert(results['adjacency'] is adjacency)
+        branches = grg_pssedata.topology.BusAdjacency.from_branches(results['allbrancheson'])
+        for bus in self.case.bus['ibus'][:20]:
+            neighbors = grg_pssedata.reduction.connected_neighbors(adjacency, [bus], results['buson'])
+            assert(list(neighbors) == list(branches.external_neighbors([bus])))
+
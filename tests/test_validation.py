@@ -0,0 +1,51 @@
+import os, pytest, warnings
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.validation
+
+from grg_pssedata.struct import TransformerWinding
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestValidation:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        violations = self.case.validate()
+        assert(list(violations.columns) == grg_pssedata.validation.VIOLATION_COLUMNS)
+        assert(len(violations) == 0)
+
+    def test_002(self):
+        bus = self.case.bus.copy()
+        bus.loc[3, 'area'] = 0
+        bus.loc[5, 'ibus'] = 1000000
+        acline = self.case.acline.copy()
+        acline.loc[2, 'f1'] = 1.5
+        acline.loc[4, 'ckt'] = '&1'
+        violations = self.case._replace(bus=bus, acline=acline).validate()
+        rows = set(zip(violations['section'], violations['row'], violations['field']))
+        assert(rows == set([('bus', 3, 'area'), ('bus', 5, 'ibus'), ('acline', 2, 'f1'), ('acline', 4, 'ckt')]))
+        assert(set(violations['rule']) == set(['range 1 to 9999', 'range 1 to 999997', 'owner fraction', 'no & prefix']))
+
+    def test_003(self):
+        generator = self.case.generator.copy()
+        generator['stat'] = generator['stat'].astype(object)
+        generator.loc[0, 'stat'] = 'x'
+        violations = self.case._replace(generator=generator).validate()
+        assert(list(violations['rule']) == ['number'])
+        with pytest.warns(grg_pssedata.exception.PSSEDataWarning):
+            grg_pssedata.validation.warn_violations(violations)
+
+    def test_004(self):
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/warning/powermodels/parser_test_c.raw')
+        violations = case.validate()
+        assert(list(violations['field']) == ['rev'])
+
+    def test_005(self):
+        winding = TransformerWinding(1, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, 0, 1.1, 0.9, 1.1, 0.9, 33, 0, 0.0, 0.0, 0.0)
+        with pytest.warns(grg_pssedata.exception.PSSEDataWarning):
+            winding.validate(0)
@@ -0,0 +1,135 @@
+import os, shutil, pytest
+
+import grg_pssedata
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+class TestWatcher:
+    def setup_method(self, _):
+        """Copy two network files into a watched directory"""
+        self.case_5 = test_path+'/data/correct/powermodels/case5.raw'
+        self.case_14 = test_path+'/data/correct/powermodels/case14.raw'
+
+    def test_001(self, tmpdir):
+        shutil.copy(self.case_5, str(tmpdir.join('a.raw')))
+        watcher = grg_pssedata.watch.CaseWatcher(str(tmpdir))
+        events = watcher.poll()
+        assert(len(events) == 1)
+        assert(events[0].kind == grg_pssedata.watch.CASE_ADDED)
+        assert(len(watcher.poll()) == 0)
+
+    def test_002(self, tmpdir):
+        path = str(tmpdir.join('a.raw'))
+        shutil.copy(self.case_5, path)
+        watcher = grg_pssedata.watch.CaseWatcher(str(tmpdir))
+        watcher.poll()
+        shutil.copy(self.case_14, path)
+        os.utime(path, ns=(0, 0))
+        events = watcher.poll()
+        assert(len(events) == 1)
+        assert(events[0].kind == grg_pssedata.watch.CASE_MODIFIED)
+        assert('bus' in events[0].tables)
+        assert(len(events[0].case.bus) == 14)
+
+    def test_003(self, tmpdir):
+        path = str(tmpdir.join('a.raw'))
+        shutil.copy(self.case_5, path)
+        watcher = grg_pssedata.watch.CaseWatcher(str(tmpdir))
+        watcher.poll()
+        os.remove(path)
+        events = watcher.poll()
+        assert(len(events) == 1)
+        assert(events[0].kind == grg_pssedata.watch.CASE_REMOVED)
+        assert(len(watcher.cases) == 0)
+
+    def test_004(self, tmpdir):
+        shutil.copy(self.case_5, str(tmpdir.join('a.raw')))
+        snapshots = str(tmpdir.join('snapshots'))
+        case = grg_pssedata.watch.CaseWatcher(str(tmpdir), snapshot_dir=snapshots).poll()[0].case
+        assert([name.startswith('a.raw.') for name in os.listdir(snapshots)] == [True])
+
+        events = grg_pssedata.watch.CaseWatcher(str(tmpdir), snapshot_dir=snapshots).poll()
+        assert(len(events) == 1)
+        assert(events[0].case.bus.equals(case.bus))
+
+    def test_006(self, tmpdir):
+        path = str(tmpdir.join('a.raw'))
+        shutil.copy(self.case_14, path)
+        watcher = grg_pssedata.watch.CaseWatcher(str(tmpdir))
+        watcher.poll()
+        with open(self.case_14) as case_file:
+            lines = case_file.read().split('\n')
+        lines[0] = lines[0].replace('100.00', '200.00')
+        with open(path, 'w') as case_file:
+            case_file.write('\n'.join(lines))
+        os.utime(path, ns=(0, 0))
+        events = watcher.poll()
+        assert(len(events) == 1)
+        assert(events[0].kind == grg_pssedata.watch.CASE_MODIFIED)
+        assert(events[0].tables == ['header'])
+        assert(events[0].case.header.sbase == 200.0)
+
+    def test_cli_001(self, tmpdir):
+        shutil.copy(self.case_5, str(tmpdir.join('a.raw')))
+        shutil.copy(self.case_14, str(tmpdir.join('b.raw')))
+        parser = grg_pssedata.cmd.build_cmd_parser()
+        args = parser.parse_args(['watch', str(tmpdir), '--polls', '2', '--interval', '0'])
+        count = grg_pssedata.cmd.main(args)
+        assert(count == 2)
+
+    def test_005(self, tmpdir):
+        shutil.copy(self.case_5, str(tmpdir.join('a.raw')))
+        snapshots = str(tmpdir.join('snapshots'))
+        grg_pssedata.watch.CaseWatcher(str(tmpdir), snapshot_dir=snapshots).poll()
+
+        case = grg_pssedata.watch.CaseWatcher(str(tmpdir), snapshot_dir=snapshots, dtypes='compact').poll()[0].case
+        assert(case.bus['ibus'].dtype == 'int32')
+
+    def test_007(self, tmpdir):
+        shutil.copy(self.case_5, str(tmpdir.join('a.raw')))
+        path = str(tmpdir.join('b.raw'))
+        with open(self.case_14) as case_file:
+            text = case_file.read()
+        with open(path, 'w') as case_file:
+            case_file.write(text[:300])
+        watcher = grg_pssedata.watch.CaseWatcher(str(tmpdir))
+        events = watcher.poll()
+        assert([event.kind for event in events] == [grg_pssedata.watch.CASE_ADDED, grg_pssedata.watch.CASE_ERROR])
+        assert(events[1].path == path)
+        assert(events[1].case is None)
+        assert('bus' in events[1].error)
+        assert(len(watcher.poll()) == 0)
+
+        with open(path, 'w') as case_file:
+            case_file.write(text)
+        os.utime(path, ns=(0, 0))
+        events = watcher.poll()
+        assert(len(events) == 1)
+        assert(events[0].kind == grg_pssedata.watch.CASE_ADDED)
+        assert(len(events[0].case.bus) == 14)
+
+        with open(path, 'w') as case_file:
+            case_file.write(text[:300])
+        events = watcher.poll()
+        assert(len(events) == 1)
+        assert(events[0].kind == grg_pssedata.watch.CASE_ERROR)
+        assert(len(events[0].case.bus) == 14)
+        assert(len(watcher.cases[path].bus) == 14)
+
+    def test_008(self, tmpdir):
+        snapshots = str(tmpdir.join('snapshots'))
+        cache = grg_pssedata.watch.CaseCache(snapshots)
+        paths = []
+        for directory, case_file in (('a', self.case_5), ('b', self.case_14)):
+            os.mkdir(str(tmpdir.join(directory)))
+            paths.append(str(tmpdir.join(directory, 'x.raw')))
+            shutil.copy(case_file, paths[-1])
+            cache.refresh(paths[-1])
+        assert(cache.snapshot_path(paths[0]) != cache.snapshot_path(paths[1]))
+        assert(len(os.listdir(snapshots)) == 2)
+
+        cache.discard(paths[0])
+        assert(os.listdir(snapshots) == [os.path.basename(cache.snapshot_path(paths[1]))])
+        case = grg_pssedata.watch.CaseCache(snapshots).get(paths[1])
+        assert(len(case.bus) == 14)
+
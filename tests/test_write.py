@@ -0,0 +1,115 @@
+import io, os, pytest
+
+import numpy as np
+
+import grg_pssedata
+import grg_pssedata.scenario
+
+from test_common import correct_files
+
+test_path = os.path.dirname(os.path.realpath(__file__))
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_001(input_data):
+    psse_case = grg_pssedata.io.frames_to_case(grg_pssedata.io.parse_psse_case_file(input_data))
+    output = io.StringIO()
+    grg_pssedata.io.write_psse(psse_case, output, chunk_rows=2)
+
+    assert output.getvalue() == psse_case.to_psse()
+
+
+@pytest.mark.parametrize('input_data', correct_files)
+def test_002(input_data):
+    case = grg_pssedata.io.parse_psse_case_file(input_data)
+    output = io.StringIO()
+    grg_pssedata.io.write_psse(case, output, chunk_rows=2)
+
+    assert grg_pssedata.io.parse_psse_case_str(output.getvalue()) == case
+
+
+class TestWrite:
+    def setup_method(self, _):
+        """Parse a network file"""
+        self.case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/powermodels/case14.raw')
+
+    def test_001(self):
+        writes = []
+        class Output(object):
+            def write(self, text):
+                writes.append(text)
+        grg_pssedata.io.write_psse(self.case, Output(), chunk_rows=5)
+        assert(len(writes) == 37)
+        assert(writes[1].count('\n') == 5)
+        assert(''.join(writes) == grg_pssedata.io.frames_to_case(self.case).to_psse())
+
+    def test_002(self, tmpdir):
+        file_name = str(tmpdir.join('case14.raw'))
+        with open(file_name, 'w') as output:
+            grg_pssedata.io.write_psse(self.case, output)
+        case = grg_pssedata.io.parse_psse_case_file(file_name)
+        assert(case == self.case)
+
+    def test_003(self):
+        psse_case = grg_pssedata.io.frames_to_case(self.case)
+        lines = grg_pssedata.tables.table_lines(self.case.transformer2w, 'transformer2w')
+        assert(list(lines) == [transformer.to_psse() for transformer in psse_case.transformers])
+        lines = grg_pssedata.tables.table_lines(self.case.swshunt, 'swshunt')
+        assert(lines[0] == psse_case.switched_shunts[0].to_psse())
+        assert(lines[0].endswith("'        ', 19.0, 1, 19.0"))
+
+    def test_004(self):
+        values = np.array([0.012345678, 1.23456789, 123.456789, -0.5, np.nan])
+        assert(list(grg_pssedata.tables.format_floats(values, '%.6g')) == ['0.0123457', '1.23457', '123.457', '-0.5', 'nan'])
+        assert(list(grg_pssedata.tables.format_floats(values, 'psse')) == ['0.0123457', '1.23457', '123.457', '-0.5', 'nan'])
+        values = np.array([0.0, -0.0, 100.0, 1.5e-07, 2.5e+07, 1234567.0])
+        assert(list(grg_pssedata.tables.format_floats(values, 'psse')) == ['0.0', '0.0', '100', '1.5e-07', '2.5e+07', '1.23457e+06'])
+        case = grg_pssedata.io.parse_psse_case_file(test_path+'/data/correct/WECC240_M21_psse33_v01b.raw')
+        sizes = {}
+        for precision in (None, '%.6g', 'psse'):
+            output = io.StringIO()
+            grg_pssedata.io.write_psse(case, output, precision=precision)
+            sizes[precision] = len(output.getvalue())
+        assert(sizes['psse'] < 0.95*sizes[None])
+        assert(sizes['psse'] < 1.1*sizes['%.6g'])
+        with pytest.raises(ValueError):
+            grg_pssedata.tables.format_floats(values, 'short')
+
+    @pytest.mark.parametrize('precision', ['%.6g', 'psse'])
+    def test_005(self, precision):
+        output = io.StringIO()
+        grg_pssedata.io.write_psse(self.case, output, precision=precision)
+        case = grg_pssedata.io.parse_psse_case_str(output.getvalue())
+        assert(case == grg_pssedata.tables.apply_precision(self.case, precision))
+
+        rewritten = io.StringIO()
+        grg_pssedata.io.write_psse(case, rewritten, precision=precision)
+        assert(rewritten.getvalue() == output.getvalue())
+
+    def test_006(self):
+        psse_case = grg_pssedata.io.frames_to_case(self.case)
+        with pytest.raises(ValueError):
+            grg_pssedata.io.write_psse(psse_case, io.StringIO(), precision='%.6g')
+
+    @pytest.mark.parametrize('workers', [None, 2])
+    def test_007(self, tmpdir, workers):
+        scenarios = []
+        for factor in (1.1, 1.2, 1.3):
+            scenario = grg_pssedata.scenario.ScenarioOverlay(self.case)
+            scenario.scale('load', 'pl', factor)
+            scenarios.append(scenario)
+        scenarios[2].outage('acline', [0, 1])
+        cases = scenarios + [self.case]
+        paths = [str(tmpdir.join('case14_{}.raw'.format(i))) for i in range(len(cases))]
+
+        assert(grg_pssedata.io.write_many(cases, paths, workers=workers) == paths)
+        for case, path in zip(cases, paths):
+            if isinstance(case, grg_pssedata.scenario.ScenarioOverlay):
+                case = case.case()
+            output = io.StringIO()
+            grg_pssedata.io.write_psse(case, output)
+            with open(path) as written:
+                assert(written.read() == output.getvalue())
+
+    def test_008(self, tmpdir):
+        with pytest.raises(ValueError):
+            grg_pssedata.io.write_many([self.case], [])